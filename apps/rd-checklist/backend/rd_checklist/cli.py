@@ -45,6 +45,12 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Force overwrite (but never overwrites owned_count)",
     )
+    imp.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only import sets whose content changed since the last import "
+        "(per the scraper's manifest.json)",
+    )
 
     args = parser.parse_args(argv)
     setup_logging(args.verbose)
@@ -67,9 +73,13 @@ def main(argv: list[str] | None = None) -> None:
 
         db = SessionLocal()
         try:
-            stats = import_scraper_data(db, scraper_dir, force=args.force)
+            stats = import_scraper_data(
+                db, scraper_dir, force=args.force, changed_only=args.changed_only
+            )
             print(f"\nImport complete:")
             print(f"  Sets:     {stats['sets_imported']}")
+            if stats["sets_skipped"]:
+                print(f"  Unchanged (skipped): {stats['sets_skipped']}")
             print(f"  Cards:    {stats['cards_imported']}")
             print(f"  Variants: {stats['variants_created']}")
         finally:
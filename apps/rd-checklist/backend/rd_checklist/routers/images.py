@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
 
@@ -11,6 +11,7 @@ from ..models import CardModel, CardVariantModel
 from ..schemas import CardVariantOut
 from ..utils import parse_rarity_key
 from ..services.image_service import (
+    IMAGE_SIZE_PATTERN,
     delete_user_image,
     fetch_konami_image,
     get_image_path,
@@ -20,11 +21,18 @@ from ..services.image_service import (
 
 router = APIRouter(prefix="/api/images", tags=["images"])
 
+# Smaller copy the scraper downloaded alongside each card image (e.g. "thumb")
+_SIZE_QUERY = Query(
+    None,
+    pattern=IMAGE_SIZE_PATTERN,
+    description="Image size downloaded by the scraper, e.g. thumb (default: full size)",
+)
+
 
 @router.get("/{set_id}/{filename}")
-def serve_image(set_id: str, filename: str):
+def serve_image(set_id: str, filename: str, size: str | None = _SIZE_QUERY):
     """Serve a card image from scraper data."""
-    path = get_image_path(set_id, filename)
+    path = get_image_path(set_id, filename, size)
     if not path:
         raise HTTPException(status_code=404, detail="Image not found")
     return FileResponse(path, media_type="image/jpeg")
@@ -34,12 +42,14 @@ def serve_image(set_id: str, filename: str):
 def serve_card_image(
     card_id: str,
     rarity: str,
+    size: str | None = _SIZE_QUERY,
     db: Session = Depends(get_db),
 ):
     """Serve the image for a specific card variant.
 
     rarity is a rarity key: "SR" for normal, "SR-alt" for alternate art.
-    Checks user uploads first, falls back to scraper image.
+    Checks user uploads first, falls back to scraper image. ``size`` picks
+    a smaller scraper image (user uploads have one size only).
     """
     actual_rarity, is_alt = parse_rarity_key(rarity)
     variant = (
@@ -63,7 +73,7 @@ def serve_card_image(
         if len(parts) >= 3:
             set_id = parts[0]
             filename = parts[-1]
-            path = get_image_path(set_id, filename)
+            path = get_image_path(set_id, filename, size)
             if path:
                 return FileResponse(path, media_type="image/jpeg")
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import json
+import logging
 import re
 from pathlib import Path
 
@@ -9,6 +11,19 @@ import httpx
 
 from ..config import SCRAPER_DATA_DIR, USER_IMAGES_DIR
 
+logger = logging.getLogger(__name__)
+
+# Image inventory written by the scraper (rd_card_scraper/inventory.py): JSON
+# Lines, one {"path", "size", "sha256", ...} per image or {"path", "removed": true};
+# the last line per path wins.
+SCRAPER_IMAGE_INVENTORY_FILE = "image_inventory.jsonl"
+
+# Image sizes are subdirectory names: only letters, digits, "_" and "-"
+IMAGE_SIZE_PATTERN = r"^[a-z0-9_-]+$"
+
+# ((mtime_ns, size) of the inventory file, inventoried relative paths)
+_inventory_cache: tuple[tuple[int, int], frozenset[str]] | None = None
+
 # Rarity name mapping: app rarity → Konami CDN filename suffix (empty string = no suffix)
 # Rarities not listed here (e.g. erroneous "N"/"NR" entries) return None from .get(),
 # causing build_konami_image_url to return None and triggering the Rush DB fallback.
@@ -25,18 +40,67 @@ _KONAMI_RARITY_MAP: dict[str, str] = {
 
 
 def get_image_path(
-    set_id: str, filename: str
+    set_id: str, filename: str, size: str | None = None
 ) -> Path | None:
     """Get the filesystem path for a scraper card image.
 
-    Looks in: {SCRAPER_DATA_DIR}/{set_id}/images/{filename}
+    Looks in: {SCRAPER_DATA_DIR}/{set_id}/images/{filename}, or for a
+    ``size`` the scraper also downloaded (e.g. "thumb") in
+    {set_id}/images/{size}/{filename}, falling back to the full image when
+    that size is missing. The scraper's image inventory is checked first,
+    but an image is only returned if its file is still on disk.
     """
-    path = SCRAPER_DATA_DIR / set_id / "images" / filename
-    if path.exists() and path.is_file():
+    if size:
+        path = _scraper_image(f"{set_id}/images/{size}/{filename}")
+        if path:
+            return path
+    return _scraper_image(f"{set_id}/images/{filename}")
+
+
+def _scraper_image(relative_path: str) -> Path | None:
+    path = SCRAPER_DATA_DIR / relative_path
+    # An inventory line can outlive its file (deleted or moved since)
+    if relative_path in _inventoried_images() and path.exists():
+        return path
+    if path.is_file():
         return path
     return None
 
 
+def _inventoried_images() -> frozenset[str]:
+    """Relative paths in the scraper's image inventory, re-read when it changes."""
+    global _inventory_cache
+    inventory = SCRAPER_DATA_DIR / SCRAPER_IMAGE_INVENTORY_FILE
+    try:
+        stat = inventory.stat()
+    except FileNotFoundError:
+        return frozenset()
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _inventory_cache is not None and _inventory_cache[0] == key:
+        return _inventory_cache[1]
+
+    paths: set[str] = set()
+    try:
+        with inventory.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if entry.get("removed"):
+                        paths.discard(entry["path"])
+                    else:
+                        paths.add(entry["path"])
+                except (ValueError, KeyError):
+                    continue  # a crash mid-append can leave a partial last line
+    except OSError as e:
+        logger.warning(f"Ignoring unreadable {inventory}: {e}")
+        return frozenset()
+    _inventory_cache = (key, frozenset(paths))
+    return _inventory_cache[1]
+
+
 def get_user_image_path(card_id: str, rarity: str) -> Path | None:
     """Get the filesystem path for a user-uploaded image."""
     filename = _make_upload_filename(card_id, rarity)
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import gzip
 import json
 import logging
 from pathlib import Path
+from typing import Iterator
 
 from sqlalchemy.orm import Session
 
+from ..config import DATA_DIR
 from ..models import CardModel, CardOverrideModel, CardSetModel, CardSetOverrideModel, CardVariantModel, CardVariantOverrideModel
 
 logger = logging.getLogger(__name__)
@@ -37,6 +40,20 @@ _SET_PREFIX_TO_PRODUCT_TYPE: dict[str, str] = {
 }
 
 
+# Compact catalog of all sets written by the scraper (rd_card_scraper/catalog.py):
+# gzip JSON Lines, a header with set_ids + card_fields, then one set per line
+# with its cards as rows against card_fields.
+SCRAPER_CATALOG_FILE = "catalog.jsonl.gz"
+_CATALOG_FORMAT = "rd-card-catalog"
+_CATALOG_VERSION = 1
+
+# Per-set manifest written by the scraper (SetManifest in rd_card_scraper/models.py):
+# {"sets": {set_id: {"content_hash", "card_count", "image_count", "changed_at"}}}
+SCRAPER_MANIFEST_FILE = "manifest.json"
+# Scraper manifest entries of the sets as they were last imported
+IMPORTED_MANIFEST_PATH = DATA_DIR / "imported_manifest.json"
+
+
 def _derive_product_type(set_id: str) -> str:
     """Derive product type from set_id prefix.
 
@@ -54,6 +71,7 @@ def import_scraper_data(
     db: Session,
     scraper_data_dir: Path,
     force: bool = False,
+    changed_only: bool = False,
 ) -> dict:
     """Import all card sets from scraper JSON files into the database.
 
@@ -61,11 +79,14 @@ def import_scraper_data(
         db: SQLAlchemy session.
         scraper_data_dir: Path to the scraper's data/ directory.
         force: If True, overwrite all card/set fields (but never owned_count).
+        changed_only: Skip sets whose content hash in the scraper's
+            manifest.json is unchanged since they were last imported.
+            Ignored with ``force``.
 
     Returns:
         Summary dict with counts.
     """
-    stats = {"sets_imported": 0, "cards_imported": 0, "variants_created": 0}
+    stats = {"sets_imported": 0, "sets_skipped": 0, "cards_imported": 0, "variants_created": 0}
 
     json_files = sorted(scraper_data_dir.glob("*/cards.json"))
     if not json_files:
@@ -74,17 +95,32 @@ def import_scraper_data(
 
     logger.info(f"Found {len(json_files)} card set JSON files")
 
-    for json_file in json_files:
+    manifest = _read_manifest(scraper_data_dir / SCRAPER_MANIFEST_FILE)
+    imported = _read_manifest(IMPORTED_MANIFEST_PATH)
+    wanted = None
+    if changed_only and not force:
+        wanted = _changed_set_ids(
+            db, json_files, manifest, imported, scraper_data_dir / SCRAPER_MANIFEST_FILE
+        )
+        stats["sets_skipped"] = len(json_files) - len(wanted)
+        logger.info(f"{len(wanted)} sets changed since the last import")
+
+    for source, data in _iter_scraper_sets(scraper_data_dir, json_files, wanted):
         try:
-            data = json.loads(json_file.read_text(encoding="utf-8"))
+            if isinstance(data, Exception):
+                raise data
             _import_one_set(db, data, force)
             stats["sets_imported"] += 1
             stats["cards_imported"] += len(data.get("cards", []))
+            if data["set_id"] in manifest:
+                imported[data["set_id"]] = manifest[data["set_id"]]
         except Exception as e:
-            logger.error(f"Error importing {json_file}: {e}")
+            logger.error(f"Error importing {source}: {e}")
             continue
 
     db.commit()
+    if manifest:
+        _write_manifest(IMPORTED_MANIFEST_PATH, imported)
 
     # Count total variants
     stats["variants_created"] = db.query(CardVariantModel).count()
@@ -95,6 +131,115 @@ def import_scraper_data(
     return stats
 
 
+def _read_manifest(path: Path) -> dict[str, dict]:
+    """Per-set entries of a manifest file, or {} if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("sets", {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable {path}: {e}")
+        return {}
+
+
+def _write_manifest(path: Path, sets: dict[str, dict]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"sets": dict(sorted(sets.items()))}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    tmp.replace(path)
+
+
+def _changed_set_ids(
+    db: Session,
+    json_files: list[Path],
+    manifest: dict[str, dict],
+    imported: dict[str, dict],
+    manifest_path: Path,
+) -> set[str]:
+    """Set IDs to import: new or changed per the manifest, or missing from the DB.
+
+    Sets without a manifest entry, or whose cards.json is newer than the
+    manifest (a scraper run that stopped before saving it), are always
+    imported.
+    """
+    try:
+        manifest_mtime = manifest_path.stat().st_mtime
+    except FileNotFoundError:
+        manifest_mtime = 0.0
+    in_db = {set_id for (set_id,) in db.query(CardSetModel.set_id)}
+    wanted = set()
+    for json_file in json_files:
+        set_id = json_file.parent.name
+        entry = manifest.get(set_id)
+        last = imported.get(set_id)
+        if (
+            entry is None
+            or last is None
+            or last.get("content_hash") != entry.get("content_hash")
+            or set_id not in in_db
+            or json_file.stat().st_mtime > manifest_mtime
+        ):
+            wanted.add(set_id)
+    return wanted
+
+
+def _iter_scraper_sets(
+    scraper_data_dir: Path,
+    json_files: list[Path],
+    wanted: set[str] | None = None,
+) -> Iterator[tuple[str, dict | Exception]]:
+    """Yield (source, set data) for every scraped set, or only ``wanted`` ones.
+
+    Streams the scraper's catalog when it is current (see
+    ``_catalog_is_current``); otherwise reads the cards.json files. A file
+    that fails to parse yields its exception instead of data.
+    """
+    catalog = scraper_data_dir / SCRAPER_CATALOG_FILE
+    if _catalog_is_current(catalog, json_files):
+        logger.info(f"Reading {SCRAPER_CATALOG_FILE}")
+        with gzip.open(catalog, "rb") as f:
+            card_fields = json.loads(f.readline())["card_fields"]
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if wanted is not None and data["set_id"] not in wanted:
+                    continue
+                data["cards"] = [dict(zip(card_fields, row)) for row in data["cards"]]
+                yield f"{SCRAPER_CATALOG_FILE}:{data['set_id']}", data
+        return
+
+    for json_file in json_files:
+        if wanted is not None and json_file.parent.name not in wanted:
+            continue
+        try:
+            yield str(json_file), json.loads(json_file.read_text(encoding="utf-8"))
+        except Exception as e:
+            yield str(json_file), e
+
+
+def _catalog_is_current(catalog: Path, json_files: list[Path]) -> bool:
+    """Whether the catalog lists exactly these sets and no cards.json is newer."""
+    try:
+        built = catalog.stat().st_mtime
+        with gzip.open(catalog, "rb") as f:
+            header = json.loads(f.readline() or b"{}")
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable {catalog}: {e}")
+        return False
+    return (
+        header.get("format") == _CATALOG_FORMAT
+        and header.get("version") == _CATALOG_VERSION
+        and header.get("set_ids") == [p.parent.name for p in json_files]
+        and "card_fields" in header
+        and all(p.stat().st_mtime <= built for p in json_files)
+    )
+
+
 def _import_one_set(db: Session, data: dict, force: bool) -> None:
     """Import a single card set from parsed JSON data.
 
@@ -38,8 +38,10 @@ export async function searchCards(params: {
   return data
 }
 
-export function getCardImageUrl(cardId: string, rarity: string): string {
-  return `/api/images/card/${cardId}/${rarity}`
+// size: a smaller copy downloaded by the scraper (e.g. 'thumb'); omitted = full size
+export function getCardImageUrl(cardId: string, rarity: string, size?: string): string {
+  const base = `/api/images/card/${cardId}/${rarity}`
+  return size ? `${base}?size=${size}` : base
 }
 
 export async function uploadCardImage(
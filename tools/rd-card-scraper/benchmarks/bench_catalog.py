@@ -0,0 +1,260 @@
+"""In-memory catalog benchmark: the card model's load, save and footprint.
+
+Usage (from tools/rd-card-scraper):
+
+    uv run python benchmarks/bench_catalog.py                # 300 sets
+    uv run python benchmarks/bench_catalog.py --sets 1000 --repeat 10
+    uv run python benchmarks/bench_catalog.py --data-dir data  # a real scraped data dir
+    uv run python benchmarks/bench_catalog.py --json out.json
+
+Holds a whole catalog in memory with the current models (``__slots__``
+Card / CardSet with interned categorical strings, field-by-field
+``to_dict``) and with the previous plain-dataclass model (``asdict``
+serializer, one string object per value per card), reproduced below as
+``PlainCard`` / ``PlainCardSet``.
+
+By default the catalog is the golden parser output (golden/*.json)
+repeated under distinct set IDs up to ``--sets`` sets, written as
+``cards.json`` files plus ``catalog.jsonl.gz`` in a temp directory.
+Both models must serialize every set to identical JSON or the run fails
+(exit 1) before any number is reported.
+
+For each model it reports the best of ``--repeat`` runs of:
+
+    load json     CardSet.from_dict over every cards.json
+    load catalog  rows of catalog.jsonl.gz (CardSet.load_all's fast path)
+    to_json       serializing every set
+    save          CardSet.save of every set into an empty directory
+
+and, measured separately with tracemalloc, the memory retained by the
+loaded catalog and the peak while loading it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))  # run without installing the package
+
+from rd_card_scraper.catalog import (  # noqa: E402
+    CATALOG_FILE,
+    build_catalog,
+    iter_catalog_rows,
+    set_files,
+)
+from rd_card_scraper.models import CARD_FIELDS, Card, CardSet  # noqa: E402
+
+GOLDEN_DIR = BENCH_DIR / "golden"
+
+
+@dataclass
+class PlainCard:
+    """The card model before slots and interning, for comparison."""
+
+    card_id: str
+    rarity: str
+    name_jp: str
+    name_zh: str
+    card_type: str
+    attribute: Optional[str] = None
+    monster_type: Optional[str] = None
+    level: Optional[int] = None
+    atk: Optional[str] = None
+    defense: Optional[str] = None
+    summon_condition: Optional[str] = None
+    condition: Optional[str] = None
+    effect: Optional[str] = None
+    continuous_effect: Optional[str] = None
+    image_url: Optional[str] = None
+    image_file: Optional[str] = None
+    image_files: Optional[dict] = None
+    is_legend: bool = False
+
+    def to_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+@dataclass
+class PlainCardSet:
+    set_id: str
+    set_name_jp: str
+    set_name_zh: str
+    product_type: str
+    release_date: Optional[str] = None
+    post_url: str = ""
+    total_cards: int = 0
+    rarity_distribution: dict = field(default_factory=dict)
+    cards: list[PlainCard] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["cards"] = [c.to_dict() for c in self.cards]
+        return d
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    save = CardSet.save  # same file handling, only the serializer differs
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PlainCardSet:
+        cards = [PlainCard(**c) for c in data.get("cards", [])]
+        cs = cls(**{k: v for k, v in data.items() if k != "cards"})
+        cs.cards = cards
+        return cs
+
+
+MODELS = {"plain": (PlainCardSet, PlainCard), "compact": (CardSet, Card)}
+
+
+def write_data_dir(data_dir: Path, n_sets: int) -> None:
+    """Write golden sets under distinct IDs as cards.json files plus the catalog."""
+    golden = [
+        cs
+        for path in sorted(GOLDEN_DIR.glob("*.json"))
+        for cs in json.loads(path.read_text(encoding="utf-8"))
+    ]
+    for i in range(n_sets):
+        data = dict(golden[i % len(golden)])
+        data["set_id"] = f"{data['set_id']}-{i:04d}"
+        CardSet.from_dict(data).save(data_dir)
+    build_catalog(data_dir, CARD_FIELDS)
+
+
+def load_json(data_dir: Path, model: str) -> list:
+    set_cls, _ = MODELS[model]
+    return [
+        set_cls.from_dict(json.loads(p.read_text(encoding="utf-8")))
+        for p in set_files(data_dir)
+    ]
+
+
+def load_catalog(data_dir: Path, model: str) -> list:
+    set_cls, card_cls = MODELS[model]
+    loaded = []
+    for set_data, card_fields, rows in iter_catalog_rows(data_dir / CATALOG_FILE):
+        cs = set_cls(**set_data)
+        if card_fields == CARD_FIELDS:
+            cs.cards = [card_cls(*row) for row in rows]
+        else:
+            cs.cards = [card_cls(**dict(zip(card_fields, row))) for row in rows]
+        loaded.append(cs)
+    return loaded
+
+
+def best_of(repeat: int, fn: Callable[[], object], setup: Callable[[], None] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_memory(load: Callable[[], list]) -> tuple[int, int]:
+    """(bytes retained by the loaded catalog, peak bytes while loading)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        sets = load()
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        del sets
+        return retained - base, peak - base
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the in-memory card catalog model")
+    ap.add_argument("--sets", type=int, default=300, help="Sets in the synthetic catalog (default: 300)")
+    ap.add_argument("--data-dir", type=Path, metavar="DIR", help="Benchmark a scraped data dir instead")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (default: 5)")
+    ap.add_argument("--json", type=Path, metavar="PATH", help="Also write results as JSON")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="rd-catalog-bench-") as tmp:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = Path(tmp) / "data"
+            write_data_dir(data_dir, args.sets)
+        elif not (data_dir / CATALOG_FILE).exists():
+            print(f"{data_dir / CATALOG_FILE} not found (run rd-scrape catalog first)")
+            return 1
+
+        loaded = {model: load_json(data_dir, model) for model in MODELS}
+        n_sets = len(loaded["compact"])
+        n_cards = sum(len(cs.cards) for cs in loaded["compact"])
+        print(f"Catalog: {n_sets} sets, {n_cards} cards")
+
+        mismatches = [
+            plain.set_id
+            for plain, compact in zip(loaded["plain"], loaded["compact"])
+            if plain.to_json() != compact.to_json()
+        ]
+        if mismatches:
+            print(f"FAILED: {len(mismatches)} sets serialize differently, e.g. {mismatches[0]}")
+            return 1
+
+        save_dir = Path(tmp) / "save"
+
+        def clear_save_dir() -> None:
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+        results: dict[str, dict] = {}
+        for model, sets in loaded.items():
+            retained, peak = measure_memory(lambda: load_json(data_dir, model))
+            results[model] = {
+                "load_json_s": best_of(args.repeat, lambda: load_json(data_dir, model)),
+                "load_catalog_s": best_of(args.repeat, lambda: load_catalog(data_dir, model)),
+                "to_json_s": best_of(args.repeat, lambda: [cs.to_json() for cs in sets]),
+                "save_s": best_of(
+                    args.repeat, lambda: [cs.save(save_dir) for cs in sets], clear_save_dir
+                ),
+                "retained_bytes": retained,
+                "peak_bytes": peak,
+            }
+        clear_save_dir()
+
+    metrics = (
+        ("load json", "load_json_s", "ms"),
+        ("load catalog", "load_catalog_s", "ms"),
+        ("to_json", "to_json_s", "ms"),
+        ("save", "save_s", "ms"),
+        ("retained", "retained_bytes", "MiB"),
+        ("load peak", "peak_bytes", "MiB"),
+    )
+    print(f"\n{'':<13} {'plain':>10} {'compact':>10} {'ratio':>7}")
+    for label, key, unit in metrics:
+        plain, compact = results["plain"][key], results["compact"][key]
+        scale = 1000 if unit == "ms" else 1 / 2**20
+        print(
+            f"{label:<13} {plain * scale:>7.1f} {unit:<3}{compact * scale:>6.1f} {unit:<3}"
+            f"{plain / compact if compact else float('nan'):>6.2f}x"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"sets": n_sets, "cards": n_cards, "models": results}, indent=2),
+            encoding="utf-8",
+        )
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
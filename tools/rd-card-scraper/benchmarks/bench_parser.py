@@ -0,0 +1,267 @@
+"""Parser benchmark over the checked-in post corpus.
+
+Usage (from tools/rd-card-scraper):
+
+    uv run python benchmarks/bench_parser.py                 # verify + benchmark
+    uv run python benchmarks/bench_parser.py --repeat 20
+    uv run python benchmarks/bench_parser.py --json out.json # machine-readable result
+    uv run python benchmarks/bench_parser.py --update-golden # after an intended change
+    uv run python benchmarks/bench_parser.py --backend bs4   # one backend only
+
+corpus/*.html holds one representative post per markup era (KP01 span/br,
+KP09 divs, KP23 JPS + linked images, compact SD stats, a multi-deck post,
+multi-line leaf text, deeply nested wrappers); corpus/urls.json maps each
+file to the post URL it is parsed as, which matters for MULTI_DECK_URLS.
+
+Every post is first parsed and compared with golden/<name>.json. Any
+mismatch fails the run (exit 1) before timings are reported, so a faster
+parser only counts if its output is unchanged. By default every parser
+backend (see parser.PARSER_BACKENDS) is checked and timed, followed by the
+speedup of each over the bs4 baseline.
+
+Peak memory comes from tracemalloc, which sees Python objects but not
+libxml2's own allocations, so it understates the lxml backend's tree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))  # run without installing the package
+
+from rd_card_scraper import parser  # noqa: E402
+
+CORPUS_DIR = BENCH_DIR / "corpus"
+GOLDEN_DIR = BENCH_DIR / "golden"
+
+# Parser internals timed individually (inclusive of nested calls)
+PROFILED_FUNCTIONS = ("_flatten_to_chunks", "_extract_cards_from_body", "_parse_card_details")
+
+
+def load_corpus() -> list[tuple[str, str, str]]:
+    """Return (name, url, html) for every corpus post, sorted by name."""
+    urls = json.loads((CORPUS_DIR / "urls.json").read_text(encoding="utf-8"))
+    return [
+        (name, urls[name], (CORPUS_DIR / f"{name}.html").read_text(encoding="utf-8"))
+        for name in sorted(urls)
+    ]
+
+
+def parse(html: str, url: str, backend: str) -> list:
+    return parser.parse_post_multi(parser.PostDocument(html, backend=backend), url)
+
+
+def check_golden(corpus: list[tuple[str, str, str]], backend: str, update: bool) -> bool:
+    """Compare parser output with the golden files. Returns True if all match."""
+    GOLDEN_DIR.mkdir(exist_ok=True)
+    ok = True
+    for name, url, html in corpus:
+        result = [cs.to_dict() for cs in parse(html, url, backend)]
+        golden_file = GOLDEN_DIR / f"{name}.json"
+        if update:
+            golden_file.write_text(
+                json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+            )
+            print(f"  wrote {golden_file.relative_to(BENCH_DIR)}")
+            continue
+        if not golden_file.exists():
+            print(f"  MISSING  {name}: no golden file (run with --update-golden)")
+            ok = False
+            continue
+        expected = json.loads(golden_file.read_text(encoding="utf-8"))
+        if result != expected:
+            print(f"  MISMATCH {name}: {_first_difference(expected, result)}")
+            ok = False
+    return ok
+
+
+def _first_difference(expected: list[dict], actual: list[dict]) -> str:
+    if len(expected) != len(actual):
+        return f"{len(actual)} card sets, expected {len(expected)}"
+    for exp_set, act_set in zip(expected, actual):
+        for key in exp_set.keys() | act_set.keys():
+            if key != "cards" and exp_set.get(key) != act_set.get(key):
+                return f"{exp_set['set_id']}.{key}: {act_set.get(key)!r} != {exp_set.get(key)!r}"
+        exp_cards, act_cards = exp_set["cards"], act_set["cards"]
+        if len(exp_cards) != len(act_cards):
+            return f"{exp_set['set_id']}: {len(act_cards)} cards, expected {len(exp_cards)}"
+        for exp, act in zip(exp_cards, act_cards):
+            if exp != act:
+                key = next(k for k in exp.keys() | act.keys() if exp.get(k) != act.get(k))
+                return f"{exp['card_id']}.{key}: {act.get(key)!r} != {exp.get(key)!r}"
+    return "output differs"
+
+
+def measure_throughput(corpus: list[tuple[str, str, str]], backend: str, repeat: int) -> dict:
+    per_post: dict[str, float] = {name: 0.0 for name, _, _ in corpus}
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, url, html in corpus:
+            t0 = time.perf_counter()
+            sets = parse(html, url, backend)
+            per_post[name] += time.perf_counter() - t0
+            cards += sum(len(cs.cards) for cs in sets)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "posts_per_sec": repeat * len(corpus) / elapsed,
+        "cards_per_sec": cards / elapsed,
+        "ms_per_post": {name: t / repeat * 1000 for name, t in per_post.items()},
+    }
+
+
+def measure_functions(corpus: list[tuple[str, str, str]], backend: str, repeat: int) -> dict:
+    """Time the PROFILED_FUNCTIONS by temporarily wrapping them in the module."""
+    totals = {fn: [0, 0.0] for fn in PROFILED_FUNCTIONS}  # calls, seconds
+    originals = {fn: getattr(parser, fn) for fn in PROFILED_FUNCTIONS}
+
+    def timed(fn_name, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                entry = totals[fn_name]
+                entry[0] += 1
+                entry[1] += time.perf_counter() - t0
+        return wrapper
+
+    for fn_name, fn in originals.items():
+        setattr(parser, fn_name, timed(fn_name, fn))
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _name, url, html in corpus:
+                parse(html, url, backend)
+        elapsed = time.perf_counter() - start
+    finally:
+        for fn_name, fn in originals.items():
+            setattr(parser, fn_name, fn)
+
+    return {
+        fn_name: {
+            "calls": calls,
+            "seconds": seconds,
+            "us_per_call": seconds / calls * 1e6 if calls else 0.0,
+            "share": seconds / elapsed if elapsed else 0.0,
+        }
+        for fn_name, (calls, seconds) in totals.items()
+    }
+
+
+def measure_memory(corpus: list[tuple[str, str, str]], backend: str) -> dict[str, int]:
+    """Peak traced allocation (bytes) while parsing each post."""
+    peaks: dict[str, int] = {}
+    tracemalloc.start()
+    try:
+        for name, url, html in corpus:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            sets = parse(html, url, backend)
+            peaks[name] = tracemalloc.get_traced_memory()[1] - base
+            del sets
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def run_backend(corpus: list[tuple[str, str, str]], backend: str, repeat: int) -> dict:
+    throughput = measure_throughput(corpus, backend, repeat)
+    functions = measure_functions(corpus, backend, repeat)
+    memory = measure_memory(corpus, backend)
+    card_counts = {
+        name: sum(len(cs.cards) for cs in parse(html, url, backend))
+        for name, url, html in corpus
+    }
+
+    print(f"\n[{backend}] Throughput ({repeat} passes, {throughput['seconds']:.2f}s)")
+    print(f"  {throughput['posts_per_sec']:.1f} posts/sec")
+    print(f"  {throughput['cards_per_sec']:.0f} cards/sec")
+
+    print(f"\n  {'post':<24} {'cards':>5} {'ms/post':>9} {'peak KiB':>9}")
+    for name, _url, _html in corpus:
+        print(
+            f"  {name:<24} {card_counts[name]:>5} "
+            f"{throughput['ms_per_post'][name]:>9.2f} {memory[name] / 1024:>9.0f}"
+        )
+
+    print(f"\n[{backend}] Functions (inclusive time)")
+    print(f"  {'function':<26} {'calls':>7} {'total s':>9} {'us/call':>9} {'share':>6}")
+    for fn_name, stats in functions.items():
+        print(
+            f"  {fn_name:<26} {stats['calls']:>7} {stats['seconds']:>9.3f} "
+            f"{stats['us_per_call']:>9.1f} {stats['share']:>6.0%}"
+        )
+
+    return {
+        "throughput": throughput,
+        "functions": functions,
+        "peak_memory_bytes": memory,
+        "cards": card_counts,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the Rush Duel post parser")
+    ap.add_argument("--repeat", type=int, default=5, help="Passes over the corpus (default: 5)")
+    ap.add_argument(
+        "--backend", choices=[*parser.PARSER_BACKENDS, "all"], default="all",
+        help="Parser backend to check and time (default: all)",
+    )
+    ap.add_argument("--json", type=Path, metavar="PATH", help="Also write results as JSON")
+    ap.add_argument(
+        "--update-golden", action="store_true",
+        help=f"Rewrite golden/*.json with the {parser.DEFAULT_BACKEND} backend and exit",
+    )
+    args = ap.parse_args(argv)
+
+    corpus = load_corpus()
+
+    if args.update_golden:
+        print(f"Updating golden files ({len(corpus)} posts, {parser.DEFAULT_BACKEND})")
+        check_golden(corpus, parser.DEFAULT_BACKEND, update=True)
+        return 0
+
+    backends = parser.PARSER_BACKENDS if args.backend == "all" else (args.backend,)
+    for backend in backends:
+        print(f"[{backend}] Golden check ({len(corpus)} posts)")
+        if not check_golden(corpus, backend, update=False):
+            print(f"FAILED: {backend} parser output differs from golden files")
+            return 1
+        print("  all posts match")
+
+    results = {backend: run_backend(corpus, backend, args.repeat) for backend in backends}
+
+    if "bs4" in results and len(results) > 1:
+        base = results["bs4"]
+        print("\nSpeedup over bs4")
+        for backend, result in results.items():
+            if backend == "bs4":
+                continue
+            overall = result["throughput"]["posts_per_sec"] / base["throughput"]["posts_per_sec"]
+            flatten = (
+                base["functions"]["_flatten_to_chunks"]["seconds"]
+                / result["functions"]["_flatten_to_chunks"]["seconds"]
+            )
+            print(f"  {backend}: {overall:.2f}x posts/sec, {flatten:.2f}x _flatten_to_chunks")
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"repeat": args.repeat, "backends": results}, indent=2),
+            encoding="utf-8",
+        )
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""End-to-end scraper benchmark against a local replay server.
+
+Usage (from tools/rd-card-scraper):
+
+    uv run python benchmarks/bench_scraper.py                      # corpus recording
+    uv run python benchmarks/bench_scraper.py --latency-ms 150 --error-rate 0.05
+    uv run python benchmarks/bench_scraper.py --workers 1 --image-workers 1
+    uv run python benchmarks/bench_scraper.py --image-sizes thumb=400
+    uv run python benchmarks/bench_scraper.py --recording data     # a real data dir
+    uv run python benchmarks/bench_scraper.py --json out.json
+
+No request leaves the machine. By default the recording is built from the
+parser corpus (corpus/*.html, with urls.json as their post URLs): a feed
+page listing every post and a synthetic image of realistic size for each
+card image URL, in the primary size and each ``--image-sizes`` size.
+``--recording`` replays a data directory from a real run instead (its snapshots/ and image_store/, see rd_card_scraper/replay.py).
+
+Each phase runs a fresh RushDuelScraper (as a new ``rd-scrape`` process
+would) on the same output directory, so later phases see the state the
+earlier ones left:
+
+    scrape-all   cold: every post and image is fetched
+    revalidate   scrape-all again: conditional requests, 304s
+    update       incremental: the feed's update times skip unchanged posts
+    check        the same check without scraping
+
+and the run report of each (rd_card_scraper/metrics.py) is summarised.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))  # run without installing the package
+
+from rd_card_scraper import parser  # noqa: E402
+from rd_card_scraper.discovery import BLOG_BASE, FEED_PAGE_SIZE  # noqa: E402
+from rd_card_scraper.downloader import parse_image_sizes  # noqa: E402
+from rd_card_scraper.imagestore import IMAGE_STORE_DIR, ImageStore  # noqa: E402
+from rd_card_scraper.replay import ReplayServer  # noqa: E402
+from rd_card_scraper.scraper import RushDuelScraper  # noqa: E402
+from rd_card_scraper.snapshots import SNAPSHOT_DIR, SnapshotStore  # noqa: E402
+
+CORPUS_DIR = BENCH_DIR / "corpus"
+FEED_URL = (
+    f"{BLOG_BASE}/feeds/posts/summary?orderby=updated"
+    f"&start-index=1&max-results={FEED_PAGE_SIZE}"
+)
+FEED_UPDATED = "2025-01-01T00:00:00.000+08:00"
+IMAGE_SIZE_RANGE = (30_000, 90_000)  # bytes per synthetic primary card image
+CARD_ASPECT = 59 / 86  # width / height of a card
+
+PHASES = ("scrape-all", "revalidate", "update", "check")
+
+
+def synthetic_jpeg(rng: random.Random, long_edge: int, size: int) -> bytes:
+    """A baseline JPEG of about ``size`` bytes and a card's dimensions.
+
+    Only the structure is real (SOI, JFIF APP0, SOF0, SOS, EOI); the scan
+    is random bytes, 0xFF-stuffed. That is enough for the inventory's
+    format sniffing (inventory.image_info), so verify-images accepts it.
+    """
+    height, width = long_edge, round(long_edge * CARD_ASPECT)
+    components = b"".join(bytes([i, 0x11, 0]) for i in (1, 2, 3))
+    app0 = b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    sof0 = struct.pack(">BHHB", 8, height, width, 3) + components
+    sos = bytes([3, 1, 0x00, 2, 0x11, 3, 0x11, 0, 63, 0])
+    scan = rng.randbytes(size).replace(b"\xff", b"\xff\x00")
+    return (
+        b"\xff\xd8"
+        + b"\xff\xe0" + struct.pack(">H", len(app0) + 2) + app0
+        + b"\xff\xc0" + struct.pack(">H", len(sof0) + 2) + sof0
+        + b"\xff\xda" + struct.pack(">H", len(sos) + 2) + sos
+        + scan
+        + b"\xff\xd9"
+    )
+
+
+def build_corpus_recording(recording_dir: Path, sizes: dict[str, int]) -> dict:
+    """Record the corpus posts, a feed listing them and one image per card image URL."""
+    urls = json.loads((CORPUS_DIR / "urls.json").read_text(encoding="utf-8"))
+    snapshots = SnapshotStore(recording_dir / SNAPSHOT_DIR)
+    images = ImageStore(recording_dir / IMAGE_STORE_DIR)
+
+    entries = []
+    image_urls: dict[str, int] = {}  # URL → long edge in px
+    for name in sorted(urls):
+        url = urls[name]
+        html = (CORPUS_DIR / f"{name}.html").read_text(encoding="utf-8")
+        snapshots.put(url, html.encode("utf-8"), "post")
+        for card_set in parser.parse_post_multi(parser.PostDocument(html), url):
+            for card in card_set.cards:
+                if card.image_url:
+                    image_urls[card.image_url] = parser.IMAGE_SIZE
+                    for px in sizes.values():
+                        sized = parser.resize_image_url(card.image_url, px)
+                        if sized:
+                            image_urls[sized] = px
+        entries.append(
+            f"<entry><title>[卡表資料] Rush Duel {name}</title>"
+            f"<updated>{FEED_UPDATED}</updated>"
+            f'<link rel="alternate" type="text/html" href="{url}"/></entry>'
+        )
+    feed = (
+        "<?xml version='1.0' encoding='UTF-8'?>"
+        '<feed xmlns="http://www.w3.org/2005/Atom">' + "".join(entries) + "</feed>"
+    )
+    snapshots.put(FEED_URL, feed.encode("utf-8"), "feed")
+
+    tmp = recording_dir / "image.tmp"
+    for image_url, px in sorted(image_urls.items()):
+        rng = random.Random(image_url)
+        # JPEG size grows with the pixel count
+        size = int(rng.randint(*IMAGE_SIZE_RANGE) * (px / parser.IMAGE_SIZE) ** 2)
+        tmp.write_bytes(synthetic_jpeg(rng, px, size))
+        images.adopt(tmp, image_url)
+        tmp.unlink()
+    return {"posts": len(urls), "images": len(image_urls)}
+
+
+def run_phase(phase: str, data_dir: Path, base_url: str, args: argparse.Namespace) -> dict:
+    scraper = RushDuelScraper(
+        data_dir=data_dir,
+        workers=args.workers,
+        max_rps=args.max_rps,
+        image_workers=args.image_workers,
+        image_rps=args.image_rps,
+        image_sizes=args.image_sizes,
+        base_url=base_url,
+    )
+    start = time.perf_counter()
+    if phase in ("scrape-all", "revalidate"):
+        stats = scraper.scrape_all()
+    elif phase == "update":
+        stats = scraper.update()
+    else:
+        scraper.check_updates()
+        stats = dict(scraper.check_stats)
+    wall = time.perf_counter() - start
+    report = scraper.last_report
+    posts_host = next(iter(report["request_rates"].get("posts", {}).values()), {})
+    return {
+        "wall_s": wall,
+        "requests": report["counters"].get("http_requests", 0),
+        "not_modified": report["counters"].get("http_not_modified", 0),
+        "retries": report["counters"].get("http_retries", 0),
+        "images": report["counters"].get("images_downloaded", 0),
+        "parse_ms_per_post": report["rates"].get("parse_ms_per_post"),
+        "achieved_rps": posts_host.get("achieved_rps"),
+        "stats": stats,
+        "report": report,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark scrape-all / update / check offline")
+    ap.add_argument(
+        "--recording", type=Path, metavar="DIR",
+        help="Data directory to replay (default: build one from the parser corpus)",
+    )
+    ap.add_argument("--latency-ms", type=float, default=50.0, help="Per-response latency (default: 50)")
+    ap.add_argument("--jitter-ms", type=float, default=20.0, help="Extra random latency (default: 20)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Injected 503/429 fraction (default: 0)")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed for the server (default: 0)")
+    ap.add_argument("--workers", type=int, default=4, help="Concurrent post fetches (default: 4)")
+    ap.add_argument("--max-rps", type=float, default=50.0, help="Post request ceiling (default: 50)")
+    ap.add_argument("--image-workers", type=int, default=4, help="Parallel image downloads (default: 4)")
+    ap.add_argument("--image-rps", type=float, default=100.0, help="Image request ceiling (default: 100)")
+    ap.add_argument(
+        "--image-sizes", type=parse_image_sizes, default={}, metavar="SPEC",
+        help="Extra image sizes, as for rd-scrape (default: none)",
+    )
+    ap.add_argument("--json", type=Path, metavar="PATH", help="Also write results as JSON")
+    ap.add_argument("-v", "--verbose", action="store_true", help="Show the scraper's log")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="rd-bench-") as tmp:
+        recording = args.recording
+        if recording is None:
+            recording = Path(tmp) / "recording"
+            counts = build_corpus_recording(recording, args.image_sizes)
+            print(f"Recorded corpus: {counts['posts']} posts, {counts['images']} images")
+        data_dir = Path(tmp) / "data"
+
+        with ReplayServer(
+            recording,
+            BLOG_BASE,
+            port=0,
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        ) as server:
+            print(
+                f"Replaying at {server.url} (latency {args.latency_ms:g}+{args.jitter_ms:g} ms, "
+                f"error rate {args.error_rate:g}; workers {args.workers}, "
+                f"image workers {args.image_workers})"
+            )
+            results = {}
+            for phase in PHASES:
+                results[phase] = run_phase(phase, data_dir, server.url, args)
+            server_stats = dict(server.stats)
+
+    print(
+        f"\n{'phase':<11} {'wall s':>7} {'requests':>8} {'304':>5} {'retries':>7} "
+        f"{'images':>6} {'parse ms/post':>13} {'req/s':>6}"
+    )
+    for phase, result in results.items():
+        parse_ms, rps = result["parse_ms_per_post"], result["achieved_rps"]
+        print(
+            f"{phase:<11} {result['wall_s']:>7.2f} {result['requests']:>8g} "
+            f"{result['not_modified']:>5g} {result['retries']:>7g} {result['images']:>6g} "
+            f"{f'{parse_ms:.1f}' if parse_ms is not None else '-':>13} "
+            f"{f'{rps:.1f}' if rps is not None else '-':>6}"
+        )
+    print(
+        f"\nServer: {server_stats['requests']} requests, {server_stats['ok']} ok, "
+        f"{server_stats['not_modified']} not modified, {server_stats['not_found']} not found, "
+        f"{server_stats['errors']} injected errors"
+    )
+
+    errors = results["scrape-all"]["stats"]["errors"]
+    if errors:
+        print(f"FAILED: {errors} posts could not be scraped")
+        return 1
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"options": {k: str(v) for k, v in vars(args).items()},
+                        "server": server_stats, "phases": results}, indent=2),
+            encoding="utf-8",
+        )
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""One compact, compressed catalog of every scraped set.
+
+``{data_dir}/catalog.jsonl.gz`` holds the same data as all ``*/cards.json``
+files together: gzip-compressed JSON Lines, a header line followed by one
+line per set in set_id order. Cards are stored as rows against the card
+field names in the header, which parses much faster than one object per
+card (the same trick as the scrape state snapshot)::
+
+    {"format": "rd-card-catalog", "version": 1, "set_ids": ["B01", ...],
+     "card_fields": ["card_id", "rarity", ...]}
+    {"set_id": "B01", "set_name_jp": ..., "cards": [["RD/B01-JP001", "UR", ...], ...]}
+    ...
+
+The reader yields one set at a time, so memory stays bounded. The catalog
+is rebuilt from ``cards.json`` at the end of each run that changed a set
+and written atomically. ``cards.json`` remain the source of truth: a
+catalog older than any of them, or listing a different set of sets, is
+ignored.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = "catalog.jsonl.gz"
+CATALOG_FORMAT = "rd-card-catalog"
+CATALOG_VERSION = 1
+
+
+def set_files(data_dir: Path) -> list[Path]:
+    """Every ``<set_id>/cards.json`` under ``data_dir``, in set_id order."""
+    return sorted(data_dir.glob("*/cards.json"))
+
+
+def write_catalog(path: Path, card_sets: Iterable[dict], card_fields: Iterable[str]) -> int:
+    """Atomically write set dicts (``CardSet.to_dict()`` shape) as a catalog.
+
+    Card rows follow ``card_fields`` (normally ``models.CARD_FIELDS``), with
+    any other keys found in the cards appended. Returns the number of sets.
+    """
+    card_sets = list(card_sets)
+    card_fields = list(dict.fromkeys([
+        *card_fields,
+        *(key for cs in card_sets for card in cs.get("cards", []) for key in card),
+    ]))
+    header = {
+        "format": CATALOG_FORMAT,
+        "version": CATALOG_VERSION,
+        "set_ids": [cs["set_id"] for cs in card_sets],
+        "card_fields": card_fields,
+    }
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as gz:
+            gz.write(dumps(header))
+            for cs in card_sets:
+                line = dict(cs)
+                line["cards"] = [
+                    [card.get(key) for key in card_fields] for card in cs.get("cards", [])
+                ]
+                gz.write(dumps(line))
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    return len(card_sets)
+
+
+def build_catalog(data_dir: Path, card_fields: Iterable[str]) -> int:
+    """Rebuild the catalog from every ``cards.json``. Returns the number of sets."""
+    card_sets = [
+        json.loads(data_file.read_text(encoding="utf-8"))
+        for data_file in set_files(data_dir)
+    ]
+    count = write_catalog(data_dir / CATALOG_FILE, card_sets, card_fields)
+    logger.info(f"Wrote {CATALOG_FILE} ({count} sets)")
+    return count
+
+
+def _read_header(f) -> dict:
+    header = json.loads(f.readline() or "{}")
+    if header.get("format") != CATALOG_FORMAT or header.get("version") != CATALOG_VERSION:
+        raise ValueError(f"Not a version {CATALOG_VERSION} card catalog")
+    return header
+
+
+def iter_catalog_rows(path: Path) -> Iterator[tuple[dict, list[str], list[list]]]:
+    """Yield (set fields, card field names, card rows) one set at a time."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        card_fields = _read_header(f)["card_fields"]
+        for line in f:
+            if not line.strip():
+                continue
+            set_data = json.loads(line)
+            rows = set_data.pop("cards")
+            yield set_data, card_fields, rows
+
+
+def iter_catalog(path: Path) -> Iterator[dict]:
+    """Yield set dicts in the ``cards.json`` shape one at a time."""
+    for set_data, card_fields, rows in iter_catalog_rows(path):
+        # Card.to_dict() leaves out None values; so does this
+        set_data["cards"] = [
+            {k: v for k, v in zip(card_fields, row) if v is not None} for row in rows
+        ]
+        yield set_data
+
+
+def catalog_is_current(data_dir: Path) -> bool:
+    """Whether the catalog matches the ``cards.json`` files on disk.
+
+    Only stats the set files and reads the catalog header: the catalog must
+    list exactly the sets present, and no ``cards.json`` may be newer.
+    """
+    path = data_dir / CATALOG_FILE
+    try:
+        built = path.stat().st_mtime
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            set_ids = _read_header(f)["set_ids"]
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring unreadable {CATALOG_FILE}: {e}")
+        return False
+    files = set_files(data_dir)
+    return (
+        set_ids == [p.parent.name for p in files]
+        and all(p.stat().st_mtime <= built for p in files)
+    )
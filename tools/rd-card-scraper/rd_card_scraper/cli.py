@@ -5,10 +5,34 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
+import subprocess
 import sys
 from pathlib import Path
 
-from .scraper import RushDuelScraper
+from .catalog import CATALOG_FILE, build_catalog
+from .discovery import DEFAULT_DISCOVERY_SOURCE, DISCOVERY_SOURCES
+from .downloader import DEFAULT_IMAGE_RPS, DEFAULT_IMAGE_SIZES, parse_image_sizes
+from .inventory import DEFAULT_VERIFY_WORKERS
+from .metrics import format_history, format_report, read_run_history
+from .models import CARD_FIELDS
+from .parser import DEFAULT_BACKEND, PARSER_BACKENDS
+from .replay import DEFAULT_REPLAY_PORT, ReplayServer
+from .scraper import (
+    DEFAULT_MAX_RPS,
+    DEFAULT_WATCH_INTERVAL,
+    LAST_CHANGED_FILE,
+    RushDuelScraper,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _image_sizes(spec: str) -> dict[str, int]:
+    try:
+        return parse_image_sizes(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -45,6 +69,37 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Force re-scrape even if content hasn't changed",
     )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of parallel image downloads (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--image-rps",
+        type=float,
+        default=DEFAULT_IMAGE_RPS,
+        metavar="RATE",
+        help=f"Per-host ceiling for the adaptive image request rate "
+             f"(default: {DEFAULT_IMAGE_RPS})",
+    )
+    parser.add_argument(
+        "--image-sizes",
+        type=_image_sizes,
+        default=DEFAULT_IMAGE_SIZES,
+        metavar="SPEC",
+        help="Extra image sizes to fetch besides the 800 px image, as NAME=PIXELS,... "
+             "or 'none', e.g. thumb=400 for the checklist grid (default: "
+             + (",".join(f"{k}={v}" for k, v in DEFAULT_IMAGE_SIZES.items()) or "none") + ")",
+    )
+    parser.add_argument(
+        "--parser-backend",
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_BACKEND,
+        help=f"HTML tree used to parse posts (default: {DEFAULT_BACKEND}; "
+             f"bs4 is the slower BeautifulSoup fallback)",
+    )
     parser.add_argument(
         "--since",
         type=int,
@@ -52,21 +107,135 @@ def main(argv: list[str] | None = None) -> None:
         metavar="YEAR",
         help="Only discover posts from this year onwards (default: 2020)",
     )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        metavar="URL",
+        help="Send all requests to this server instead of the live sites, e.g. "
+             "a replay server (card images go to URL/_host/<host>/...)",
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=DISCOVERY_SOURCES,
+        default=DEFAULT_DISCOVERY_SOURCE,
+        help=f"Where to discover posts from (default: {DEFAULT_DISCOVERY_SOURCE}; "
+             f"the feed falls back to listing pages if it cannot be read)",
+    )
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Discovery candidates verified concurrently (default: 1, sequential)",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
+    # Options shared by the commands that scrape many posts
+    concurrency = argparse.ArgumentParser(add_help=False)
+    concurrency.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of concurrent post fetches (default: 1, sequential)",
+    )
+    concurrency.add_argument(
+        "--max-rps",
+        type=float,
+        default=DEFAULT_MAX_RPS,
+        metavar="RATE",
+        help=f"Per-host ceiling for the adaptive request rate; --workers > 1 "
+             f"starts at it (default: {DEFAULT_MAX_RPS})",
+    )
+    concurrency.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint (no rediscovery)",
+    )
+
     # scrape-all: full scrape
     subparsers.add_parser(
         "scrape-all",
+        parents=[concurrency],
         help="Scrape all discovered Rush Duel card list posts",
     )
 
     # update: incremental update
     subparsers.add_parser(
         "update",
+        parents=[concurrency],
         help="Only scrape new or changed posts (incremental)",
     )
 
+    # watch: incremental updates on a schedule in one long-running process
+    watch_parser = subparsers.add_parser(
+        "watch",
+        parents=[concurrency],
+        help="Run incremental updates on a schedule, keeping state warm in memory",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        metavar="SECONDS",
+        help=f"Seconds between the starts of two updates (default: {DEFAULT_WATCH_INTERVAL:g})",
+    )
+    watch_parser.add_argument(
+        "--runs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Stop after N updates (default: run until interrupted)",
+    )
+    watch_parser.add_argument(
+        "--on-change",
+        metavar="COMMAND",
+        help=f"Shell command run after an update that changed sets; gets "
+             f"RD_CHANGED_SETS, RD_REMOVED_SETS, RD_DELTA_FILE and "
+             f"RD_LAST_CHANGED_FILE ({LAST_CHANGED_FILE}) in its environment",
+    )
+
+    # replay: serve the recorded pages and images of --data-dir
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Serve the pages and images recorded in --data-dir for offline runs",
+    )
+    replay_parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    replay_parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_REPLAY_PORT,
+        help=f"Port to listen on (default: {DEFAULT_REPLAY_PORT})",
+    )
+    replay_parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        metavar="MS",
+        help="Delay added to every response (default: 0)",
+    )
+    replay_parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0.0,
+        metavar="MS",
+        help="Extra random delay of up to MS per response (default: 0)",
+    )
+    replay_parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        metavar="P",
+        help="Fraction of requests answered with 503 or 429 + Retry-After (default: 0)",
+    )
+    replay_parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for jitter and error injection",
+    )
+
     # scrape-url: scrape a specific URL
     url_parser = subparsers.add_parser(
         "scrape-url",
@@ -86,6 +255,85 @@ def main(argv: list[str] | None = None) -> None:
         help="Check for new or updated posts without scraping",
     )
 
+    # reparse: rebuild cards.json from local HTML snapshots
+    reparse_parser = subparsers.add_parser(
+        "reparse",
+        help="Rebuild all cards.json from stored HTML snapshots (no network)",
+    )
+    reparse_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse posts in N worker processes (0 = one per CPU, default: 1)",
+    )
+    reparse_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the per-set diff; do not write cards.json or state",
+    )
+
+    # images: download missing images for already scraped sets
+    images_parser = subparsers.add_parser(
+        "images",
+        help="Download missing card images for scraped sets",
+    )
+    images_parser.add_argument(
+        "set_ids",
+        nargs="*",
+        metavar="SET_ID",
+        help="Only these sets (default: all scraped sets)",
+    )
+
+    # verify-images: find and re-download broken images
+    verify_parser = subparsers.add_parser(
+        "verify-images",
+        help="Check images for missing/truncated/corrupt files and re-download them",
+    )
+    verify_parser.add_argument(
+        "set_ids",
+        nargs="*",
+        metavar="SET_ID",
+        help="Only these sets (default: all scraped sets)",
+    )
+    verify_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_VERIFY_WORKERS,
+        metavar="N",
+        help=f"Images checked in parallel (default: {DEFAULT_VERIFY_WORKERS})",
+    )
+    verify_parser.add_argument(
+        "--no-repair",
+        action="store_true",
+        help="Only report broken images; do not delete or re-download them",
+    )
+
+    # catalog: rebuild catalog.jsonl.gz from every cards.json
+    subparsers.add_parser(
+        "catalog",
+        help="Rebuild the compact catalog of all sets (catalog.jsonl.gz)",
+    )
+
+    # compact-state: fold the state journal into scrape_state.json
+    subparsers.add_parser(
+        "compact-state",
+        help="Fold the scrape state journal into scrape_state.json",
+    )
+
+    # runs: compare the timing of recent runs
+    runs_parser = subparsers.add_parser(
+        "runs",
+        help="Show stage timings of recent runs (from run_history.jsonl)",
+    )
+    runs_parser.add_argument(
+        "-n",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of most recent runs to show (default: 10)",
+    )
+
     # summary: show current data summary
     subparsers.add_parser(
         "summary",
@@ -100,7 +348,10 @@ def main(argv: list[str] | None = None) -> None:
         sys.exit(1)
 
     # Build optional kwargs for discovery
-    discover_kwargs: dict = {}
+    discover_kwargs: dict = {
+        "source": args.discovery,
+        "verify_workers": args.verify_workers,
+    }
     if args.since is not None:
         discover_kwargs["since_year"] = args.since
 
@@ -108,32 +359,92 @@ def main(argv: list[str] | None = None) -> None:
         data_dir=args.data_dir,
         download_images_flag=not args.no_images,
         force=args.force,
+        workers=getattr(args, "workers", 1),
+        max_rps=getattr(args, "max_rps", DEFAULT_MAX_RPS),
+        image_workers=args.image_workers,
+        image_rps=args.image_rps,
+        image_sizes=args.image_sizes,
+        parser_backend=args.parser_backend,
+        base_url=args.base_url,
     )
 
     if args.command == "scrape-all":
-        stats = scraper.scrape_all(**discover_kwargs)
+        stats = scraper.scrape_all(resume=args.resume, **discover_kwargs)
         print(f"\nScrape complete:")
         print(f"  Discovered: {stats['discovered']} posts")
+        if stats["resumed"]:
+            print(f"  Resumed:    {stats['resumed']} posts already done before the interruption")
         print(f"  Scraped:    {stats['scraped']} posts")
         print(f"  Skipped:    {stats['skipped']} (unchanged)")
+        print(f"  Not modified (304): {stats['not_modified']}")
         print(f"  Errors:     {stats['errors']}")
 
     elif args.command == "update":
-        stats = scraper.update(**discover_kwargs)
+        stats = scraper.update(resume=args.resume, **discover_kwargs)
         print(f"\nUpdate complete:")
         print(f"  Discovered: {stats['discovered']} posts")
+        if stats["resumed"]:
+            print(f"  Resumed:    {stats['resumed']} posts already done before the interruption")
         print(f"  New:        {stats['new']} posts")
         print(f"  Updated:    {stats['updated']} posts")
         print(f"  Unchanged:  {stats['unchanged']} posts")
+        print(f"  Not modified (304): {stats['not_modified']}")
+        print(f"  Not updated since last scrape (feed): {stats['lastmod_skipped']}")
         print(f"  Errors:     {stats['errors']}")
 
+    elif args.command == "watch":
+        def run_change_hook(changed: dict) -> None:
+            _run_change_hook(args.on_change, changed, args.data_dir)
+
+        print(f"\nWatching for updates every {args.interval:g}s (Ctrl-C to stop)...")
+        try:
+            runs = scraper.watch(
+                interval=args.interval,
+                runs=args.runs,
+                on_change=run_change_hook if args.on_change else None,
+                resume=args.resume,
+                **discover_kwargs,
+            )
+        except KeyboardInterrupt:
+            print("\nWatch stopped (an interrupted update can be continued with --resume).")
+        else:
+            print(f"\nWatch finished after {runs} updates.")
+
+    elif args.command == "replay":
+        from .discovery import BLOG_BASE
+        server = ReplayServer(
+            args.data_dir,
+            BLOG_BASE,
+            host=args.host,
+            port=args.port,
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        print(
+            f"\nReplaying {len(server.snapshots.urls())} pages from {args.data_dir} "
+            f"at {server.url} (Ctrl-C to stop)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+        print(
+            f"\nServed {server.stats['requests']} requests: {server.stats['ok']} ok, "
+            f"{server.stats['not_modified']} not modified, {server.stats['not_found']} not found, "
+            f"{server.stats['errors']} injected errors"
+        )
+
     elif args.command == "scrape-url":
-        result = scraper.scrape_post(args.url)
+        result = scraper.scrape_url(args.url)
         print(f"\nResult: {result}")
 
     elif args.command == "discover":
         from .discovery import discover_rd_posts
-        posts = discover_rd_posts(**discover_kwargs)
+        posts = discover_rd_posts(session=scraper.session, **discover_kwargs)
         print(f"\nDiscovered {len(posts)} Rush Duel card list posts:")
         for p in sorted(posts, key=lambda x: x["url"]):
             title = p["title"][:60] if p["title"] else "(no title)"
@@ -141,6 +452,12 @@ def main(argv: list[str] | None = None) -> None:
 
     elif args.command == "check":
         updates = scraper.check_updates(**discover_kwargs)
+        check_stats = scraper.check_stats
+        print(
+            f"\nChecked {check_stats['checked']} known posts, "
+            f"{check_stats['not_modified']} resolved by 304 (not modified), "
+            f"{check_stats['lastmod_skipped']} not updated since last scrape (feed)."
+        )
         if updates:
             print(f"\n{len(updates)} posts need updating:")
             for url in updates:
@@ -148,6 +465,66 @@ def main(argv: list[str] | None = None) -> None:
         else:
             print("\nAll posts are up to date.")
 
+    elif args.command == "reparse":
+        stats = scraper.reparse(jobs=args.jobs, dry_run=args.dry_run)
+        if stats["diffs"]:
+            print("\nChanged sets:")
+            for set_diff in stats["diffs"]:
+                for line in set_diff.lines():
+                    print(f"  {line}")
+        print(f"\nReparse complete{' (dry run, nothing written)' if args.dry_run else ''}:")
+        print(f"  Posts:      {stats['posts']}")
+        print(f"  Reparsed:   {stats['reparsed']} posts ({stats['cards']} cards)")
+        print(f"  Changed:    {stats['changed']} sets ({stats['unchanged']} unchanged)")
+        print(f"  Missing:    {stats['missing']} (no snapshot)")
+        print(f"  Errors:     {stats['errors']}")
+
+    elif args.command == "images":
+        stats = scraper.download_all_images(args.set_ids or None)
+        print(f"\nImage download complete:")
+        print(f"  Sets:       {stats['sets']}")
+        print(f"  Downloaded: {stats['downloaded']} images")
+        if stats["missing_sets"]:
+            print(f"  Missing:    {stats['missing_sets']} sets (no cards.json)")
+        print(f"  Errors:     {stats['errors']}")
+
+    elif args.command == "verify-images":
+        stats = scraper.verify_images(
+            args.set_ids or None, workers=args.jobs, repair=not args.no_repair
+        )
+        if stats["broken"]:
+            print("\nBroken images:")
+            for rel_path, reason in stats["broken"].items():
+                print(f"  {rel_path}: {reason}")
+        print(f"\nImage verification complete:")
+        print(f"  Checked:    {stats['checked']} images")
+        print(f"  Broken:     {len(stats['broken'])}")
+        if not args.no_repair:
+            print(f"  Repaired:   {stats['repaired']}")
+            if stats["removed"]:
+                print(f"  Removed:    {stats['removed']} (no card refers to them)")
+            print(f"  Failed:     {stats['failed']}")
+
+    elif args.command == "catalog":
+        count = build_catalog(args.data_dir, CARD_FIELDS)
+        print(f"\nWrote {args.data_dir / CATALOG_FILE} ({count} sets)")
+
+    elif args.command == "compact-state":
+        journal_records = scraper.compact_state()
+        print(
+            f"\nCompacted {journal_records} journal records into "
+            f"{len(scraper.state.posts)} post states."
+        )
+
+    elif args.command == "runs":
+        reports = read_run_history(args.data_dir)[-args.n:]
+        if not reports:
+            print("\nNo runs recorded yet.")
+        else:
+            print()
+            for line in format_history(reports):
+                print(line)
+
     elif args.command == "summary":
         s = scraper.summary()
         print(f"\nData summary:")
@@ -159,5 +536,32 @@ def main(argv: list[str] | None = None) -> None:
                 print(f"    {set_id}: {info['cards']} cards - {info['title']}")
 
 
+    if scraper.last_delta is not None:
+        print(f"\nCard-level changes written to {scraper.last_delta}")
+
+    if scraper.last_report is not None:
+        print()
+        for line in format_report(scraper.last_report):
+            print(line)
+
+
+def _run_change_hook(command: str, changed: dict, data_dir: Path) -> None:
+    """Run the --on-change shell command for one update's changes."""
+    env = {
+        **os.environ,
+        "RD_CHANGED_SETS": ",".join(changed["sets"]),
+        "RD_REMOVED_SETS": ",".join(changed["removed_sets"]),
+        "RD_DELTA_FILE": str(data_dir / changed["delta"]),
+        "RD_LAST_CHANGED_FILE": str(data_dir / LAST_CHANGED_FILE),
+    }
+    try:
+        result = subprocess.run(command, shell=True, env=env)
+    except OSError as e:
+        logger.error(f"Could not run --on-change hook: {e}")
+        return
+    if result.returncode != 0:
+        logger.warning(f"--on-change hook exited with status {result.returncode}")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,197 @@
+"""Card-level differences between two versions of a card set.
+
+Runs that change sets also write a delta file,
+``{data_dir}/deltas/<UTC time, to the microsecond>-<command>.json``, with
+what changed card by card since the start of the run::
+
+    {"command": "update", "started_at": ..., "finished_at": ...,
+     "sets": {"KP01": {"is_new": false,
+                       "previous_hash": ..., "content_hash": ...,
+                       "added": {card_id: {"hash": ..., "card": {...}}},
+                       "removed": {card_id: {"previous_hash": ...}},
+                       "modified": {card_id: {"fields": [...],
+                                              "previous_hash": ..., "hash": ...,
+                                              "card": {...}}},
+                       "set_fields": {field: new value}}},
+     "removed_sets": [...]}
+
+Card hashes are ``canonical_hash()`` of the card dict, as in
+``Card.content_hash()``, so a consumer can check it holds the previous
+version of a card before applying the new one. Cards are keyed by card_id;
+should a set list a card_id more than once, the repeats are keyed
+``<card_id>#2``, ``<card_id>#3``, ... in order, so none is lost.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .models import CardSet, canonical_hash, write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+DELTA_DIR = "deltas"
+DUPLICATE_SEP = "#"  # <card_id>#<n>: the n-th card with the same card_id
+
+
+@dataclass
+class SetDiff:
+    """What changed in one set between an old and a new parse.
+
+    ``changed`` maps card_id → names of the fields that differ, and
+    ``set_fields`` lists changed set-level fields (release date, names, ...).
+    """
+
+    set_id: str
+    is_new: bool = False
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: dict[str, list[str]] = field(default_factory=dict)
+    set_fields: list[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.is_new or self.added or self.removed or self.changed or self.set_fields)
+
+    def summary(self) -> str:
+        if self.is_new:
+            return f"{self.set_id}: new set ({len(self.added)} cards)"
+        parts = [f"+{len(self.added)} -{len(self.removed)} ~{len(self.changed)} cards"]
+        if self.set_fields:
+            parts.append(f"set fields: {', '.join(self.set_fields)}")
+        return f"{self.set_id}: {'; '.join(parts)}"
+
+    def lines(self) -> list[str]:
+        """Human-readable report, one card per line."""
+        out = [self.summary()]
+        if self.is_new:
+            return out
+        out += [f"  + {card_id}" for card_id in self.added]
+        out += [f"  - {card_id}" for card_id in self.removed]
+        out += [
+            f"  ~ {card_id}: {', '.join(fields)}"
+            for card_id, fields in self.changed.items()
+        ]
+        return out
+
+
+def diff_card_sets(old: Optional[CardSet], new: CardSet) -> SetDiff:
+    """Compare two versions of a set card by card (keyed by card_id)."""
+    diff = SetDiff(set_id=new.set_id)
+    new_dict = new.to_dict()
+    new_cards = _cards_by_id(new_dict["cards"])
+    duplicates = [card_id for card_id in new_cards if DUPLICATE_SEP in card_id]
+    if duplicates:
+        logger.warning(
+            f"{new.set_id} lists a card_id more than once; "
+            f"diffing the repeats as {', '.join(duplicates)}"
+        )
+
+    if old is None:
+        diff.is_new = True
+        diff.added = list(new_cards)
+        return diff
+
+    old_dict = old.to_dict()
+    old_cards = _cards_by_id(old_dict["cards"])
+
+    diff.added = [card_id for card_id in new_cards if card_id not in old_cards]
+    diff.removed = [card_id for card_id in old_cards if card_id not in new_cards]
+    for card_id, new_card in new_cards.items():
+        old_card = old_cards.get(card_id)
+        if old_card is None or old_card == new_card:
+            continue
+        diff.changed[card_id] = _changed_keys(old_card, new_card)
+
+    old_dict.pop("cards")
+    new_dict.pop("cards")
+    diff.set_fields = _changed_keys(old_dict, new_dict)
+    return diff
+
+
+def set_delta(old: Optional[CardSet], new: CardSet) -> Optional[dict]:
+    """The delta-file entry for one set, or None if no card or field changed."""
+    set_diff = diff_card_sets(old, new)
+    if set_diff.is_empty:
+        return None
+    new_dict = new.to_dict()
+    new_cards = _cards_by_id(new_dict["cards"])
+    old_dict = old.to_dict() if old is not None else {"cards": []}
+    old_cards = _cards_by_id(old_dict["cards"])
+    return {
+        "is_new": set_diff.is_new,
+        "previous_hash": canonical_hash(old_dict) if old is not None else None,
+        "content_hash": canonical_hash(new_dict),
+        "added": {
+            card_id: {"hash": canonical_hash(new_cards[card_id]), "card": new_cards[card_id]}
+            for card_id in set_diff.added
+        },
+        "removed": {
+            card_id: {"previous_hash": canonical_hash(old_cards[card_id])}
+            for card_id in set_diff.removed
+        },
+        "modified": {
+            card_id: {
+                "fields": fields,
+                "previous_hash": canonical_hash(old_cards[card_id]),
+                "hash": canonical_hash(new_cards[card_id]),
+                "card": new_cards[card_id],
+            }
+            for card_id, fields in set_diff.changed.items()
+        },
+        "set_fields": {name: new_dict.get(name) for name in set_diff.set_fields},
+    }
+
+
+def write_delta(
+    data_dir: Path,
+    command: str,
+    started_at: str,
+    finished_at: str,
+    sets: dict[str, dict],
+    removed_sets: list[str],
+) -> Path:
+    """Write one run's delta file under ``deltas/``. Returns its path.
+
+    Names sort by start time; a name already taken gets a ``-2``, ``-3``,
+    ... suffix rather than overwriting another run's delta.
+    """
+    delta_dir = data_dir / DELTA_DIR
+    delta_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromisoformat(started_at).strftime("%Y%m%dT%H%M%S.%fZ")
+    name = f"{stamp}-{command or 'run'}"
+    path = delta_dir / f"{name}.json"
+    n = 1
+    while path.exists():
+        n += 1
+        path = delta_dir / f"{name}-{n}.json"
+    delta = {
+        "command": command,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "sets": dict(sorted(sets.items())),
+        "removed_sets": sorted(removed_sets),
+    }
+    write_text_atomic(path, json.dumps(delta, ensure_ascii=False, indent=2) + "\n")
+    return path
+
+
+def _cards_by_id(cards: list[dict]) -> dict[str, dict]:
+    """Cards keyed by card_id, repeats as ``<card_id>#<n>`` (see module docstring)."""
+    by_id: dict[str, dict] = {}
+    seen: dict[str, int] = {}
+    for card in cards:
+        card_id = card["card_id"]
+        seen[card_id] = n = seen.get(card_id, 0) + 1
+        by_id[card_id if n == 1 else f"{card_id}{DUPLICATE_SEP}{n}"] = card
+    return by_id
+
+
+def _changed_keys(old: dict, new: dict) -> list[str]:
+    keys = list(new) + [k for k in old if k not in new]
+    return [k for k in keys if old.get(k) != new.get(k)]
@@ -1,8 +1,8 @@
-"""Discover Rush Duel card list posts from blog listing pages.
+"""Discover Rush Duel card list posts from the blog feed or listing pages.
 
 Strategy: "title first, content fallback"
 
-1. Crawl blog listing pages (paginated, ~20 posts/page) to collect post
+1. Read the blog's post feed (or crawl listing pages) to collect post
    URLs and titles — no individual page fetches needed for most posts.
 2. Title-based fast filter: titles containing [卡表資料] + Rush Duel / RD/
    keywords are accepted immediately as card lists.
@@ -17,19 +17,41 @@ The cutoff is based on the pagination cursor (``updated-max``), not on
 individual post URL years, because Blogger sorts by last-update time
 which can differ from the URL publication date.
 
+Sources: by default posts are read from the blog's Atom post feed
+(``source="feed"``), which lists 150 posts per request together with their
+last-update time, instead of crawling 20-post listing pages. The listing
+crawl remains available (``source="listing"``) and is used automatically
+when the feed cannot be read. Feed posts carry an ``updated`` timestamp,
+which lets the scraper skip posts not modified since they were last scraped.
+
 Incremental optimisation: when known_urls is provided (e.g. from scrape
-state), listing crawl stops early once a full page of already-known posts
-is encountered.
+state), the crawl stops early once a full page of already-known posts
+is encountered. When a listing cache is provided, feed and listing pages
+are revalidated with If-None-Match / If-Modified-Since and a 304 replays
+the cached posts instead of downloading and parsing the page again.
+Likewise a verdict cache remembers each Phase 4 verification, so a post is
+only verified again once it has changed.
 """
 
 from __future__ import annotations
 
 import re
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from .downloader import mount_connection_pool
+from .httpcache import conditional_headers, is_not_modified, response_validators
+from .keywords import ATTRIBUTES, CARD_TYPE_MATCHER, KeywordMatcher
+from .metrics import RunMetrics
+from .parser import CARD_ID_RE, PostDocument
+from .ratelimit import AdaptiveRateLimiter
+from .replay import RoutedSession
+from .snapshots import SnapshotStore
 
 logger = logging.getLogger(__name__)
 
@@ -82,13 +104,38 @@ EXCLUDE_URL_PATTERNS = [
     r"jump-festa.*pr",          # Jump Festa promo (mixed OCG/RD)
 ]
 
+# Each keyword family compiled once, so a title or URL is scanned once
+_EXCLUDE_TITLE_SET = frozenset(EXCLUDE_TITLE_KEYWORDS)
+_RD_TITLE_SET = frozenset(RD_TITLE_KEYWORDS)
+_TITLE_MATCHER = KeywordMatcher(
+    [*EXCLUDE_TITLE_KEYWORDS, CARD_LIST_TITLE_TAG, *RD_TITLE_KEYWORDS]
+)
+_RD_URL_MATCHER = KeywordMatcher(RD_URL_MARKERS)
+_EXCLUDE_URL_RE = re.compile("|".join(f"(?:{p})" for p in EXCLUDE_URL_PATTERNS))
+
+# Compact inline stats: (中文名)[x數量] 屬性 N星
+_COMPACT_STATS_HINT_RE = re.compile(
+    r"[（(][^\)）]+[）)]\s*(?:x\d+)?\s*(?:" + "|".join(ATTRIBUTES) + r")\s*\d+[星☆]"
+)
+
 # ---------- Rate limits ----------
-LISTING_PAGE_DELAY = 1.5   # seconds between listing page requests
-VERIFY_DELAY = 1.5         # seconds between individual post verify fetches
+LISTING_PAGE_DELAY = 1.5   # initial seconds between blog requests; adapts (ratelimit.py)
+DISCOVERY_MAX_RPS = 2.0    # per-host request ceiling; concurrent verification starts here
 
 # Blogger caps at ~20 posts per listing page
 LISTING_PAGE_SIZE = 20
 
+# ---------- Post feed ----------
+
+# Where posts are discovered from; "listing" is also the fallback for "feed"
+DISCOVERY_SOURCES = ("feed", "listing")
+DEFAULT_DISCOVERY_SOURCE = "feed"
+
+# Blogger serves at most 150 entries per feed request
+FEED_PAGE_SIZE = 150
+
+_ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+
 # Regex to extract year from pagination cursor (updated-max=YYYY-...)
 _PAGINATION_YEAR_RE = re.compile(r"updated-max=(\d{4})-")
 
@@ -111,79 +158,166 @@ def _is_rd_card_list_by_title(title: str) -> bool | None:
         False — definitely NOT an RD card list (reject immediately)
         None  — can't tell from title alone (needs further check)
     """
-    for kw in EXCLUDE_TITLE_KEYWORDS:
-        if kw in title:
-            return False
+    found = _TITLE_MATCHER.found(title)
+    if found & _EXCLUDE_TITLE_SET:
+        return False
 
-    if CARD_LIST_TITLE_TAG in title:
-        for kw in RD_TITLE_KEYWORDS:
-            if kw in title:
-                return True
-        return False  # [卡表資料] but no RD keyword → probably OCG
+    if CARD_LIST_TITLE_TAG in found:
+        # [卡表資料] but no RD keyword → probably OCG
+        return bool(found & _RD_TITLE_SET)
 
     return None
 
 
 def _is_rd_related_url(url: str) -> bool:
     """Check if a URL contains Rush Duel markers (broad match)."""
-    url_lower = url.lower()
-    return any(marker in url_lower for marker in RD_URL_MARKERS)
+    return _RD_URL_MATCHER.search(url.lower()) is not None
 
 
 def _is_excluded_url(url: str) -> bool:
     """Check if a URL matches known non-card-list patterns."""
-    return any(re.search(p, url) for p in EXCLUDE_URL_PATTERNS)
+    return _EXCLUDE_URL_RE.search(url) is not None
 
 
 # ------------------------------------------------------------------ #
 #  Content-based verification (fallback)
 # ------------------------------------------------------------------ #
 
-def verify_post_is_card_list(url: str, session: requests.Session) -> bool:
+def verify_post_is_card_list(
+    url: str,
+    session: requests.Session,
+    snapshots: SnapshotStore | None = None,
+) -> bool:
     """Fetch a post and verify it contains Rush Duel card data.
 
     A valid card list must have:
     1. RD/ card IDs in standard format (e.g. RD/KP01-JP001)
-    2. Card type keywords (通常怪獸, 效果怪獸, etc.)
+    2. Card type keywords (通常怪獸, 效果怪獸, etc.; see CARD_TYPE_KEYWORDS)
     """
     try:
         resp = session.get(url, timeout=30)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "lxml")
-        post_body = soup.select_one(".post-body")
-        if not post_body:
-            return False
-        text = post_body.get_text()
-        has_rd_ids = bool(re.search(r"RD/\w+-JPS?\d{2,3}", text))
-        has_card_types = any(
-            kw in text
-            for kw in [
-                "通常怪獸", "效果怪獸", "融合怪獸", "儀式怪獸",
-                "儀式/效果怪獸", "融合/效果怪獸", "巨極/效果怪獸",
-                "通常魔法", "儀式魔法", "通常陷阱",
-            ]
-        )
-        # Also accept compact inline format: (中文名)[x數量] 屬性 N星
-        # Used in some SD/GRD posts where full card type keywords don't appear.
-        has_compact_format = bool(re.search(
-            r"[（(][^\)）]+[）)]\s*(?:x\d+)?\s*(?:光|暗|炎|水|風|地)\s*\d+[星☆]",
-            text,
-        ))
-        return has_rd_ids and (has_card_types or has_compact_format)
+        if snapshots is not None:
+            snapshots.put(url, resp.content, "post", resp.encoding)
+        return _is_card_list_document(PostDocument(resp.text))
     except Exception as e:
         logger.warning(f"Could not verify {url}: {e}")
         return False
 
 
+def _is_card_list_document(doc: PostDocument) -> bool:
+    """Content check behind ``verify_post_is_card_list``."""
+    if doc.body is None:
+        return False
+    text = doc.body_text
+    if not CARD_ID_RE.search(text):
+        return False
+    # Also accept compact inline format: (中文名)[x數量] 屬性 N星
+    # Used in some SD/GRD posts where full card type keywords don't appear.
+    return bool(
+        CARD_TYPE_MATCHER.search(text) or _COMPACT_STATS_HINT_RE.search(text)
+    )
+
+
+def _verify_candidate(
+    post: dict,
+    session: requests.Session,
+    limiter: AdaptiveRateLimiter,
+    cached: dict | None,
+    snapshots: SnapshotStore | None = None,
+    metrics: RunMetrics | None = None,
+) -> dict:
+    """Verify a Phase 4 candidate, reusing its cached verdict if unchanged.
+
+    The fetch is conditional on the cached validators; a 304, or a post
+    body with the cached content hash, keeps the cached verdict without
+    re-checking the content. Raises on HTTP / network errors, so failures
+    are never cached.
+
+    Returns the new verdict cache entry: {"accepted", "updated",
+    "content_hash", "etag", "last_modified"}.
+    """
+    url = post["url"]
+    headers = (
+        conditional_headers(cached.get("etag"), cached.get("last_modified"))
+        if cached else {}
+    )
+    resp = limiter.get(session, url, metrics=metrics, timeout=30, headers=headers)
+    if metrics is not None:
+        metrics.count("discovery_bytes", len(resp.content))
+    if cached and is_not_modified(resp):
+        return {**cached, "updated": post.get("updated")}
+    resp.raise_for_status()
+    if snapshots is not None:
+        snapshots.put(url, resp.content, "post", resp.encoding)
+
+    doc = PostDocument(resp.text)
+    content_hash = doc.content_hash
+    if cached and content_hash and content_hash == cached.get("content_hash"):
+        accepted = cached["accepted"]
+    else:
+        accepted = _is_card_list_document(doc)
+    etag, last_modified = response_validators(resp)
+    return {
+        "accepted": accepted,
+        "updated": post.get("updated"),
+        "content_hash": content_hash,
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+
+def _verify_candidates(
+    candidates: list[tuple[dict, dict | None]],
+    session: requests.Session,
+    limiter: AdaptiveRateLimiter,
+    snapshots: SnapshotStore | None,
+    workers: int,
+    metrics: RunMetrics | None = None,
+) -> Iterator[tuple[dict, dict | Exception]]:
+    """Run ``_verify_candidate`` over (post, cached verdict) pairs.
+
+    Yields (post, new verdict or the exception raised) in input order. One
+    worker verifies sequentially; more workers fetch concurrently. Either
+    way requests are paced by ``limiter``.
+    """
+    if workers <= 1:
+        for post, cached in candidates:
+            try:
+                yield post, _verify_candidate(
+                    post, session, limiter, cached, snapshots, metrics
+                )
+            except Exception as e:
+                yield post, e
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _verify_candidate, post, session, limiter, cached, snapshots, metrics
+            )
+            for post, cached in candidates
+        ]
+        for (post, _cached), future in zip(candidates, futures):
+            try:
+                yield post, future.result()
+            except Exception as e:
+                yield post, e
+
+
 # ------------------------------------------------------------------ #
 #  Listing page crawler
 # ------------------------------------------------------------------ #
 
 def _crawl_listing_pages(
     session: requests.Session,
+    limiter: AdaptiveRateLimiter,
     *,
     since_year: int = DEFAULT_SINCE_YEAR,
     known_urls: set[str] | None = None,
+    listing_cache: dict[str, dict] | None = None,
+    snapshots: SnapshotStore | None = None,
+    metrics: RunMetrics | None = None,
 ) -> list[dict]:
     """Crawl blog listing pages to collect posts with titles.
 
@@ -200,15 +334,22 @@ def _crawl_listing_pages(
 
     Args:
         session: HTTP session.
+        limiter: Adaptive per-host rate limiter pacing the page requests.
         since_year: Only crawl pages whose cursor is from this year
             onwards (default 2020).
         known_urls: URLs already known; enables early-stop optimisation.
+        listing_cache: Page URL → {"etag", "last_modified", "posts",
+            "next_url"}; read for conditional requests and updated in place.
+        snapshots: Optional store that keeps every downloaded listing page.
+        metrics: Optional RunMetrics counting the pages' bytes
+            ("discovery_bytes"), retries and rate-limit waits.
 
     Returns:
         List of {"url": str, "title": str} dicts.
     """
     all_posts: list[dict] = []
     seen_urls: set[str] = set()
+    not_modified_pages = 0
 
     next_url: str | None = (
         f"{BLOG_BASE}/search?updated-max=2099-01-01T00:00:00-08:00"
@@ -219,30 +360,27 @@ def _crawl_listing_pages(
 
     while next_url:
         page_num += 1
-        if page_num > 1:
-            time.sleep(LISTING_PAGE_DELAY)
 
         logger.info(f"Fetching listing page {page_num}...")
         try:
-            resp = session.get(next_url, timeout=30)
-            resp.raise_for_status()
+            page_posts, page_next_url, not_modified = _fetch_page(
+                session, limiter, next_url, "listing", _parse_listing_page,
+                listing_cache, snapshots, metrics,
+            )
         except Exception as e:
             logger.error(f"Failed to fetch listing page {page_num}: {e}")
             break
+        not_modified_pages += not_modified
 
-        soup = BeautifulSoup(resp.text, "lxml")
-
-        post_links = soup.select("h3.post-title a[href]")
         new_count = 0
         known_on_page = 0
 
-        for link in post_links:
-            href = link.get("href", "").strip()
-            title = link.get_text(strip=True)
-            if not href or not href.endswith(".html") or href in seen_urls:
+        for post in page_posts:
+            href = post["url"]
+            if href in seen_urls:
                 continue
             seen_urls.add(href)
-            all_posts.append({"url": href, "title": title})
+            all_posts.append(dict(post))
             new_count += 1
             if known_urls and href in known_urls:
                 known_on_page += 1
@@ -259,17 +397,7 @@ def _crawl_listing_pages(
             )
             break
 
-        # Find "next page" link
-        next_url = None
-        older_link = soup.select_one("a.blog-pager-older-link")
-        if older_link:
-            next_url = older_link.get("href")
-        else:
-            for a in soup.select("#blog-pager a[href]"):
-                href_attr = a.get("href", "")
-                if "updated-max=" in href_attr and "max-results=" in href_attr:
-                    next_url = href_attr
-                    break
+        next_url = page_next_url
 
         # Date cutoff: check the NEXT page's cursor year.
         # If the next page starts from before since_year, stop.
@@ -283,11 +411,200 @@ def _crawl_listing_pages(
                 break
 
     logger.info(
-        f"Crawled {page_num} listing pages, found {len(all_posts)} total posts"
+        f"Crawled {page_num} listing pages ({not_modified_pages} not modified), "
+        f"found {len(all_posts)} total posts"
     )
     return all_posts
 
 
+def _fetch_page(
+    session: requests.Session,
+    limiter: AdaptiveRateLimiter,
+    page_url: str,
+    kind: str,
+    parse,
+    listing_cache: dict[str, dict] | None,
+    snapshots: SnapshotStore | None,
+    metrics: RunMetrics | None = None,
+) -> tuple[list[dict], str | None, bool]:
+    """Fetch one listing or feed page, revalidating it against the cache.
+
+    ``parse`` turns the page text into (posts, next page URL). A 304 replays
+    the cached result instead. Raises on HTTP / network errors.
+
+    Returns:
+        (posts, next page URL or None, whether the page was not modified).
+    """
+    cached = listing_cache.get(page_url) if listing_cache is not None else None
+    headers = (
+        conditional_headers(cached.get("etag"), cached.get("last_modified"))
+        if cached else {}
+    )
+    resp = limiter.get(session, page_url, metrics=metrics, timeout=30, headers=headers)
+    if metrics is not None:
+        metrics.count("discovery_bytes", len(resp.content))
+    if cached and is_not_modified(resp):
+        return cached["posts"], cached.get("next_url"), True
+    resp.raise_for_status()
+
+    if snapshots is not None:
+        snapshots.put(page_url, resp.content, kind, resp.encoding)
+    posts, next_url = parse(resp.text)
+    etag, last_modified = response_validators(resp)
+    if listing_cache is not None and (etag or last_modified):
+        listing_cache[page_url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "posts": posts,
+            "next_url": next_url,
+        }
+    return posts, next_url, False
+
+
+def _parse_listing_page(html: str) -> tuple[list[dict], str | None]:
+    """Extract posts and the "next page" URL from a listing page.
+
+    Returns:
+        ({"url", "title"} dicts in page order, next page URL or None).
+    """
+    soup = BeautifulSoup(html, "lxml")
+
+    posts: list[dict] = []
+    for link in soup.select("h3.post-title a[href]"):
+        href = link.get("href", "").strip()
+        title = link.get_text(strip=True)
+        if not href or not href.endswith(".html"):
+            continue
+        posts.append({"url": href, "title": title})
+
+    # Find "next page" link
+    next_url = None
+    older_link = soup.select_one("a.blog-pager-older-link")
+    if older_link:
+        next_url = older_link.get("href")
+    else:
+        for a in soup.select("#blog-pager a[href]"):
+            href_attr = a.get("href", "")
+            if "updated-max=" in href_attr and "max-results=" in href_attr:
+                next_url = href_attr
+                break
+
+    return posts, next_url
+
+
+# ------------------------------------------------------------------ #
+#  Post feed reader
+# ------------------------------------------------------------------ #
+
+def _read_post_feed(
+    session: requests.Session,
+    limiter: AdaptiveRateLimiter,
+    *,
+    since_year: int = DEFAULT_SINCE_YEAR,
+    known_urls: set[str] | None = None,
+    listing_cache: dict[str, dict] | None = None,
+    snapshots: SnapshotStore | None = None,
+    metrics: RunMetrics | None = None,
+) -> list[dict] | None:
+    """Collect posts with titles and last-update times from the Atom feed.
+
+    The feed is requested in last-updated order, so reading stops at the
+    first post updated before ``since_year`` (the same cutoff the listing
+    crawl takes from its ``updated-max`` cursor), when the feed has no
+    next page, or when a whole page is already in ``known_urls``.
+
+    Args are as for ``_crawl_listing_pages``; feed pages share its cache.
+
+    Returns:
+        List of {"url", "title", "updated"} dicts, or None if the feed could
+        not be read at all (the caller then falls back to the listing crawl).
+    """
+    all_posts: list[dict] = []
+    seen_urls: set[str] = set()
+    not_modified_pages = 0
+
+    next_url: str | None = (
+        f"{BLOG_BASE}/feeds/posts/summary?orderby=updated"
+        f"&start-index=1&max-results={FEED_PAGE_SIZE}"
+    )
+    page_num = 0
+
+    while next_url:
+        page_num += 1
+
+        logger.info(f"Fetching feed page {page_num}...")
+        try:
+            page_posts, next_url, not_modified = _fetch_page(
+                session, limiter, next_url, "feed", _parse_feed_page,
+                listing_cache, snapshots, metrics,
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch feed page {page_num}: {e}")
+            if page_num == 1:
+                return None
+            break
+        not_modified_pages += not_modified
+
+        new_count = 0
+        known_on_page = 0
+        reached_cutoff = False
+
+        for post in page_posts:
+            if int(post["updated"][:4]) < since_year:
+                reached_cutoff = True
+                break
+            href = post["url"]
+            if href in seen_urls:
+                continue
+            seen_urls.add(href)
+            all_posts.append(dict(post))
+            new_count += 1
+            if known_urls and href in known_urls:
+                known_on_page += 1
+
+        if reached_cutoff:
+            logger.info(f"Reached posts updated before {since_year}, stopping.")
+            break
+        if new_count == 0:
+            break
+        if known_urls and known_on_page == new_count:
+            logger.info(
+                f"All {new_count} posts on feed page {page_num} already known, "
+                f"stopping early."
+            )
+            break
+
+    logger.info(
+        f"Read {page_num} feed pages ({not_modified_pages} not modified), "
+        f"found {len(all_posts)} total posts"
+    )
+    return all_posts
+
+
+def _parse_feed_page(xml: str) -> tuple[list[dict], str | None]:
+    """Extract posts and the rel="next" URL from an Atom feed page.
+
+    Returns:
+        ({"url", "title", "updated"} dicts in feed order, next page URL or None).
+    """
+    root = etree.fromstring(xml.encode("utf-8"))
+
+    posts: list[dict] = []
+    for entry in root.iterfind("atom:entry", _ATOM_NS):
+        href = entry.xpath("string(atom:link[@rel='alternate']/@href)", namespaces=_ATOM_NS)
+        updated = entry.findtext("atom:updated", "", _ATOM_NS).strip()
+        if not href.endswith(".html") or not updated:
+            continue
+        posts.append({
+            "url": href.strip(),
+            "title": entry.findtext("atom:title", "", _ATOM_NS).strip(),
+            "updated": updated,
+        })
+
+    next_url = root.xpath("string(atom:link[@rel='next']/@href)", namespaces=_ATOM_NS)
+    return posts, next_url or None
+
+
 # ------------------------------------------------------------------ #
 #  Main discovery entry point
 # ------------------------------------------------------------------ #
@@ -296,36 +613,98 @@ def discover_rd_posts(
     verify: bool = True,
     known_urls: set[str] | None = None,
     since_year: int = DEFAULT_SINCE_YEAR,
+    listing_cache: dict[str, dict] | None = None,
+    snapshots: SnapshotStore | None = None,
+    source: str = DEFAULT_DISCOVERY_SOURCE,
+    verdict_cache: dict[str, dict] | None = None,
+    verify_workers: int = 1,
+    limiter: AdaptiveRateLimiter | None = None,
+    base_url: str | None = None,
+    session: requests.Session | None = None,
+    metrics: RunMetrics | None = None,
 ) -> list[dict]:
     """Discover all Rush Duel card list post URLs.
 
     Strategy:
-    Phase 1 — Crawl listing pages for posts since ``since_year``.
+    Phase 1 — Read the post feed (or crawl listing pages) for posts since
+              ``since_year``.
     Phase 2 — Title-based fast classification:
               [卡表資料] + RD keyword → accept; excluded keywords → reject.
     Phase 3 — URL-based fallback for unclassified posts:
               URL has rush-duel/rdgrd marker AND not excluded → verify.
-    Phase 4 — Content verification for Phase 3 candidates.
+    Phase 4 — Content verification for Phase 3 candidates, skipped for
+              posts whose cached verdict is still current.
 
     Args:
         verify: Verify Phase 3 candidates by fetching content (default True).
         known_urls: Previously discovered URLs for incremental early-stop.
         since_year: Only crawl listing pages from this year onwards
             (default 2020). Uses pagination cursor for the cutoff.
+        listing_cache: Optional listing page cache for conditional
+            requests (see ``_crawl_listing_pages``); updated in place.
+        snapshots: Optional store that keeps every fetched listing page
+            and verified post for offline reparsing.
+        source: "feed" (default) or "listing"; see DISCOVERY_SOURCES.
+            If the feed cannot be read, the listing crawl is used instead.
+        verdict_cache: Optional Phase 4 verdicts, URL → {"accepted",
+            "updated", "content_hash", "etag", "last_modified"}; updated
+            in place. A verdict is reused without any request when the
+            feed's ``updated`` time is unchanged, and otherwise after a
+            conditional request or content hash shows the post unchanged.
+        verify_workers: Phase 4 candidates verified concurrently (default
+            1, sequential).
+        limiter: Adaptive rate limiter for the blog's requests, e.g. the
+            scraper's, so discovery and post fetches share one budget.
+            Defaults to one starting at LISTING_PAGE_DELAY between requests
+            (DISCOVERY_MAX_RPS with ``verify_workers`` > 1).
+        base_url: Send the requests for BLOG_BASE to this server instead,
+            e.g. a replay server (see replay.py). URLs are unchanged.
+        session: HTTP session to send the requests with, e.g. the
+            scraper's, so its keep-alive connections are reused. Defaults
+            to a new one (routed to ``base_url`` if given).
+        metrics: Optional RunMetrics of the run: bytes of the feed, listing
+            and verified pages are counted as "discovery_bytes", and
+            retries and rate-limit waits as for post fetches. Requests
+            are counted by the session's response hook, if it has one.
 
     Returns:
-        List of dicts with 'url' and 'title' keys.
+        List of dicts with 'url' and 'title' keys, plus 'updated' (the
+        post's last-update time, ISO 8601) when read from the feed.
     """
-    session = requests.Session()
-    session.headers["User-Agent"] = (
-        "Mozilla/5.0 (compatible; RD-Card-Scraper/0.1)"
-    )
+    if source not in DISCOVERY_SOURCES:
+        raise ValueError(
+            f"Unknown discovery source {source!r} (expected one of {DISCOVERY_SOURCES})"
+        )
+    if session is None:
+        session = RoutedSession(base_url, BLOG_BASE) if base_url else requests.Session()
+        session.headers["User-Agent"] = (
+            "Mozilla/5.0 (compatible; RD-Card-Scraper/0.1)"
+        )
+        if verify_workers > 1:
+            mount_connection_pool(session, verify_workers)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(
+            DISCOVERY_MAX_RPS if verify_workers > 1 else 1.0 / LISTING_PAGE_DELAY,
+            max_rate=DISCOVERY_MAX_RPS,
+        )
 
-    # Phase 1: Crawl listing pages
-    logger.info(f"Phase 1: Crawling blog listing pages (since {since_year})...")
-    all_posts = _crawl_listing_pages(
-        session, since_year=since_year, known_urls=known_urls
+    # Phase 1: Read the post feed, or crawl listing pages
+    crawl_kwargs = dict(
+        since_year=since_year,
+        known_urls=known_urls,
+        listing_cache=listing_cache,
+        snapshots=snapshots,
+        metrics=metrics,
     )
+    all_posts = None
+    if source == "feed":
+        logger.info(f"Phase 1: Reading blog post feed (since {since_year})...")
+        all_posts = _read_post_feed(session, limiter, **crawl_kwargs)
+        if all_posts is None:
+            logger.warning("Post feed unavailable, falling back to listing pages")
+    if all_posts is None:
+        logger.info(f"Phase 1: Crawling blog listing pages (since {since_year})...")
+        all_posts = _crawl_listing_pages(session, limiter, **crawl_kwargs)
 
     # Phase 2 & 3: Classify each post
     accepted: list[dict] = []
@@ -363,19 +742,40 @@ def discover_rd_posts(
     # Phase 4: Verify URL-based candidates
     if needs_verify:
         if verify:
+            cache = verdict_cache if verdict_cache is not None else {}
+            verdicts: dict[str, bool] = {}
+            pending: list[tuple[dict, dict | None]] = []
+            for post in needs_verify:
+                cached = cache.get(post["url"])
+                if cached and post.get("updated") and cached.get("updated") == post["updated"]:
+                    verdicts[post["url"]] = cached["accepted"]
+                else:
+                    pending.append((post, cached))
+
             logger.info(
-                f"Phase 4: Verifying {len(needs_verify)} candidates..."
+                f"Phase 4: Verifying {len(pending)} candidates "
+                f"({len(verdicts)} cached verdicts reused)..."
             )
-            for i, post in enumerate(needs_verify, 1):
-                time.sleep(VERIFY_DELAY)
-                ok = verify_post_is_card_list(post["url"], session)
+            for i, (post, verdict) in enumerate(
+                _verify_candidates(
+                    pending, session, limiter, snapshots, verify_workers, metrics
+                ),
+                1,
+            ):
+                if isinstance(verdict, Exception):
+                    logger.warning(f"Could not verify {post['url']}: {verdict}")
+                    ok = False
+                else:
+                    cache[post["url"]] = verdict
+                    ok = verdict["accepted"]
+                verdicts[post["url"]] = ok
                 symbol = "✓" if ok else "✗"
                 logger.info(
-                    f"  [{i}/{len(needs_verify)}] {symbol} "
+                    f"  [{i}/{len(pending)}] {symbol} "
                     f"{post['title']} — {post['url']}"
                 )
-                if ok:
-                    accepted.append(post)
+
+            accepted.extend(post for post in needs_verify if verdicts[post["url"]])
         else:
             accepted.extend(needs_verify)
 
@@ -1,17 +1,46 @@
-"""Download card images with rate limiting and caching."""
+"""Download card images with rate limiting and caching.
+
+Besides the primary image (``image_url`` at ``parser.IMAGE_SIZE`` px,
+saved as ``<set_id>/images/<file>.jpg`` and recorded as ``image_file``),
+each card can be fetched in extra sizes: the image host resizes on its
+side (``parser.resize_image_url``), so a grid thumbnail is just another
+URL. Size ``name`` is saved as ``<set_id>/images/<name>/<file>.jpg`` and
+recorded in the card's ``image_files`` as ``{name: relative path}``. All
+sizes of all cards are downloaded by the same worker pool.
+"""
 
 from __future__ import annotations
 
 import logging
+import os
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .httpcache import response_validators
+from .imagestore import ImageStore, link_file
+from .inventory import ImageInventory
+from .metrics import RunMetrics
+from .parser import resize_image_url
+from .ratelimit import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_DELAY = 0.3  # seconds between image downloads
+DEFAULT_DELAY = 0.3  # initial seconds between image downloads; adapts (ratelimit.py)
+DEFAULT_IMAGE_RPS = 5.0  # per-host image request ceiling
+CHUNK_SIZE = 64 * 1024  # bytes per streamed write
+PARTIAL_SUFFIX = ".part"  # in-progress downloads, resumed with HTTP Range
+VALIDATOR_SUFFIX = ".validator"  # after PARTIAL_SUFFIX: the If-Range validator
+# Extra sizes fetched for every card: name → long edge in px. None by
+# default; the checklist grid shows cards about 190 css px wide, so
+# --image-sizes thumb=400 covers 2x displays (the backend falls back to
+# the primary image for a missing size).
+DEFAULT_IMAGE_SIZES: dict[str, int] = {}
+_SIZE_NAME_RE = re.compile(r"^[a-z0-9_-]+$")  # also the subdirectory name
 
 
 def sanitize_filename(card_id: str) -> str:
@@ -19,6 +48,70 @@ def sanitize_filename(card_id: str) -> str:
     return card_id.replace("/", "_") + ".jpg"
 
 
+def image_relative_path(set_id: str, card_id: str, size: Optional[str] = None) -> str:
+    """Path of a card image under the data directory; ``size`` None is the primary image."""
+    filename = sanitize_filename(card_id)
+    if size is None:
+        return f"{set_id}/images/{filename}"
+    return f"{set_id}/images/{size}/{filename}"
+
+
+def parse_image_sizes(spec: str) -> dict[str, int]:
+    """Parse ``"thumb=400,large=1600"`` into {name: px}; "" or "none" is no extra size."""
+    sizes: dict[str, int] = {}
+    if spec.strip().lower() in ("", "none"):
+        return sizes
+    for item in spec.split(","):
+        name, sep, px = item.strip().partition("=")
+        if not sep or not _SIZE_NAME_RE.match(name) or not px.isdigit() or int(px) <= 0:
+            raise ValueError(f"invalid image size {item.strip()!r} (expected NAME=PIXELS)")
+        sizes[name] = int(px)
+    return sizes
+
+
+def set_image_file(card, size: Optional[str], relative_path: Optional[str]) -> None:
+    """Record (or with None, clear) where one size of a card image is saved."""
+    if size is None:
+        card.image_file = relative_path
+        return
+    image_files = dict(card.image_files or {})
+    if relative_path is None:
+        image_files.pop(size, None)
+    else:
+        image_files[size] = relative_path
+    card.image_files = dict(sorted(image_files.items())) or None
+
+
+def image_file_of(card, size: Optional[str]) -> Optional[str]:
+    """Where one size of a card image is saved (relative path), if it is."""
+    if size is None:
+        return card.image_file
+    return (card.image_files or {}).get(size)
+
+
+def partial_path(filepath: Path) -> Path:
+    """Temporary path an image is streamed to before the atomic rename."""
+    return filepath.with_name(filepath.name + PARTIAL_SUFFIX)
+
+
+def validator_path(filepath: Path) -> Path:
+    """Where the validator of a partial download is kept, for If-Range."""
+    return filepath.with_name(filepath.name + PARTIAL_SUFFIX + VALIDATOR_SUFFIX)
+
+
+def discard_partial(filepath: Path) -> None:
+    """Delete a partial download of ``filepath`` and its validator."""
+    partial_path(filepath).unlink(missing_ok=True)
+    validator_path(filepath).unlink(missing_ok=True)
+
+
+def mount_connection_pool(session: requests.Session, size: int) -> None:
+    """Let ``size`` concurrent requests per host reuse keep-alive connections."""
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(10, size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
 def download_images(
     cards: list,
     set_id: str,
@@ -26,56 +119,272 @@ def download_images(
     session: requests.Session,
     delay: float = DEFAULT_DELAY,
     force: bool = False,
+    workers: int = 1,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    store: Optional[ImageStore] = None,
+    metrics: Optional[RunMetrics] = None,
+    inventory: Optional[ImageInventory] = None,
+    sizes: Optional[dict[str, int]] = None,
+    only: Optional[set[tuple[str, Optional[str]]]] = None,
 ) -> int:
     """Download card images for a set.
 
+    Each image URL is fetched at most once per call; cards sharing a URL
+    get a hard link to the first download. With a ``store``, URLs it has
+    already seen (in any set, in any run) are linked from the store without
+    a request, and new downloads with identical content are stored once.
+
     Args:
         cards: List of Card objects with image_url populated.
         set_id: The set identifier (used for directory naming).
         base_dir: Base data directory.
         session: HTTP session for requests.
-        delay: Delay between downloads in seconds.
-        force: Re-download even if file exists.
+        delay: Initial delay between downloads in seconds, for the limiter
+            created when none is given.
+        force: Re-download even if file exists (partial downloads are
+            discarded instead of resumed).
+        workers: Number of parallel downloads.
+        limiter: Adaptive per-host rate limiter shared across calls (e.g.
+            by every set in a scrape run), so its learned rate carries
+            over. Created from ``delay`` if not given.
+        store: Content-addressed image store shared across sets.
+        metrics: Run metrics to count image bytes, retries and waits in.
+        inventory: Image inventory to record new and unrecorded files in.
+        sizes: Extra sizes to fetch besides the primary image, as
+            {name: long edge in px}; recorded in ``card.image_files``.
+        only: Only these (card_id, size name or None) images, e.g. the
+            broken ones being repaired; the rest are left untouched.
 
     Returns:
-        Number of images downloaded.
+        Number of images downloaded (all sizes).
     """
-    img_dir = base_dir / set_id / "images"
-    img_dir.mkdir(parents=True, exist_ok=True)
+    metrics = metrics or RunMetrics()
 
-    downloaded = 0
+    pending = []
+    # Files placed by this call (downloaded or linked), for the inventory
+    placed: list[tuple] = []
+    # Jobs whose image URL is already being fetched for another card
+    duplicates: list[tuple[tuple, tuple]] = []
+    first_by_url: dict[str, tuple] = {}
+    linked = 0
     for card in cards:
         if not card.image_url:
             continue
+        for size, url in _image_urls(card, sizes):
+            if only is not None and (card.card_id, size) not in only:
+                continue
+            relative_path = image_relative_path(set_id, card.card_id, size)
+            filepath = base_dir / relative_path
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            job = (card, size, url, filepath, relative_path)
 
-        filename = sanitize_filename(card.card_id)
-        filepath = img_dir / filename
-        relative_path = f"{set_id}/images/{filename}"
-
-        if filepath.exists() and not force:
-            card.image_file = relative_path
-            continue
+            if filepath.exists() and not force:
+                set_image_file(card, size, relative_path)
+                if store is not None:
+                    _adopt(store, filepath, url, card.card_id)
+                if inventory is not None:
+                    inventory.ensure(relative_path, filepath, url)
+                continue
+            if force:
+                discard_partial(filepath)
+            elif store is not None and store.link_into(url, filepath):
+                set_image_file(card, size, relative_path)
+                placed.append(job)
+                linked += 1
+                continue
 
-        try:
-            time.sleep(delay)
-            resp = session.get(card.image_url, timeout=30)
-            resp.raise_for_status()
-
-            # Verify it's actually an image
-            content_type = resp.headers.get("content-type", "")
-            if "image" not in content_type and len(resp.content) < 1000:
-                logger.warning(
-                    f"Skipping non-image response for {card.card_id}: {content_type}"
-                )
+            if url in first_by_url:
+                duplicates.append((job, first_by_url[url]))
                 continue
+            first_by_url[url] = job
+            pending.append(job)
+
+    if limiter is None:
+        rate = 1.0 / delay if delay > 0 else DEFAULT_IMAGE_RPS
+        limiter = AdaptiveRateLimiter(rate, max_rate=max(rate, DEFAULT_IMAGE_RPS), burst=workers)
 
-            filepath.write_bytes(resp.content)
-            card.image_file = relative_path
-            downloaded += 1
-            logger.debug(f"Downloaded image for {card.card_id}")
+    def fetch(job: tuple) -> bool:
+        card, size, url, filepath, _relative_path = job
+        label = card.card_id if size is None else f"{card.card_id} ({size})"
+        return _download_one(session, limiter, url, label, filepath, store, metrics)
 
-        except Exception as e:
-            logger.warning(f"Failed to download image for {card.card_id}: {e}")
+    if workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"images-{set_id}"
+        ) as pool:
+            results = list(pool.map(fetch, pending))
+    else:
+        results = [fetch(job) for job in pending]
+    downloaded = sum(results)
+    for job, ok in zip(pending, results):
+        if ok:
+            card, size, _url, _filepath, relative_path = job
+            set_image_file(card, size, relative_path)
+            placed.append(job)
 
-    logger.info(f"Downloaded {downloaded} images for set {set_id}")
+    for job, first in duplicates:
+        card, size, _url, filepath, relative_path = job
+        first_path = first[3]
+        if not first_path.exists():
+            continue  # the shared download failed
+        link_file(first_path, filepath)
+        set_image_file(card, size, relative_path)
+        placed.append(job)
+        linked += 1
+
+    if inventory is not None:
+        for _card, _size, url, filepath, relative_path in placed:
+            inventory.record(relative_path, filepath, url)
+
+    metrics.count("images_downloaded", downloaded)
+    metrics.count("images_linked", linked)
+    logger.info(
+        f"Downloaded {downloaded} images for set {set_id}"
+        + (f" ({linked} reused from identical URLs)" if linked else "")
+    )
     return downloaded
+
+
+def _image_urls(card, sizes: Optional[dict[str, int]]) -> list[tuple[Optional[str], str]]:
+    """(size name, URL) of every image to fetch for a card, primary first."""
+    urls: list[tuple[Optional[str], str]] = [(None, card.image_url)]
+    for size, px in (sizes or {}).items():
+        url = resize_image_url(card.image_url, px)
+        if url is None:
+            logger.debug(f"Cannot resize {card.image_url}; no {size} image for {card.card_id}")
+            continue
+        urls.append((size, url))
+    return urls
+
+
+def _adopt(store: ImageStore, filepath: Path, url: str, label: str) -> None:
+    """Add a card image to the store; a failure only costs the deduplication."""
+    try:
+        if store.adopt(filepath, url):
+            logger.debug(f"Deduplicated image for {label}")
+    except OSError as e:
+        logger.warning(f"Could not add image for {label} to the store: {e}")
+
+
+def _download_one(
+    session: requests.Session,
+    limiter: AdaptiveRateLimiter,
+    url: str,
+    label: str,
+    filepath: Path,
+    store: Optional[ImageStore] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> bool:
+    """Fetch one card image to ``filepath``. Returns True on success.
+
+    The body is streamed in chunks to ``<name>.jpg.part``, fsynced, and only
+    then renamed over the final path, so a crash never leaves a truncated
+    JPEG behind. The response's ETag (or Last-Modified) is kept next to it
+    in ``<name>.jpg.part.validator``. A leftover .part file is resumed with
+    a Range request guarded by If-Range: if the image changed since, or the
+    server ignores the range, the full image comes back and the download
+    restarts from scratch. A .part file without a validator is not resumed.
+    Requests go through ``limiter``, which paces and retries them.
+    """
+    part = partial_path(filepath)
+    validator_file = validator_path(filepath)
+    metrics = metrics or RunMetrics()
+    try:
+        for attempt in range(2):
+            if attempt:
+                metrics.count("image_retries")
+            offset = part.stat().st_size if part.exists() else 0
+            validator = _read_validator(validator_file) if offset else None
+            if offset and validator is None:
+                logger.debug(f"No validator for the partial image of {label}, restarting")
+                offset = 0
+            headers = (
+                {"Range": f"bytes={offset}-", "If-Range": validator} if offset else {}
+            )
+            with limiter.get(
+                session,
+                url,
+                metrics=metrics,
+                wait_stage="image_rate_wait",
+                timeout=30,
+                stream=True,
+                headers=headers,
+            ) as resp:
+                if offset and resp.status_code == 416:
+                    # Range not satisfiable: the partial file is unusable
+                    discard_partial(filepath)
+                    continue
+                resp.raise_for_status()
+
+                resumed = offset > 0 and resp.status_code == 206
+                if offset and not resumed:
+                    logger.debug(f"Image changed or Range ignored for {label}, restarting")
+                    offset = 0
+                if resumed:
+                    metrics.count("image_resumes")
+                else:
+                    _write_validator(validator_file, resp)
+                expected = resp.headers.get("content-length")
+                content_type = resp.headers.get("content-type", "")
+
+                written = 0
+                with part.open("ab" if resumed else "wb") as f:
+                    for chunk in resp.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                metrics.count("image_bytes", written)
+            break
+        else:
+            return False
+
+        if expected is not None and written < int(expected):
+            logger.warning(
+                f"Incomplete image for {label} "
+                f"({written}/{expected} bytes), will resume next run"
+            )
+            return False
+
+        # Verify it's actually an image
+        if "image" not in content_type and offset + written < 1000:
+            logger.warning(
+                f"Skipping non-image response for {label}: {content_type}"
+            )
+            part.unlink(missing_ok=True)
+            return False
+
+        os.replace(part, filepath)
+        validator_file.unlink(missing_ok=True)
+        if store is not None:
+            _adopt(store, filepath, url, label)
+        logger.debug(
+            f"Downloaded image for {label}"
+            + (f" (resumed at {offset} bytes)" if offset else "")
+        )
+        return True
+
+    except Exception as e:
+        logger.warning(f"Failed to download image for {label}: {e}")
+        metrics.count("image_failures")
+        return False
+
+
+def _read_validator(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(path: Path, resp: requests.Response) -> None:
+    """Keep the validator If-Range can resume this response's body with.
+
+    If-Range needs a strong ETag, so a weak one falls back to Last-Modified.
+    """
+    etag, last_modified = response_validators(resp)
+    validator = etag if etag and not etag.startswith("W/") else last_modified
+    if validator:
+        path.write_text(validator, encoding="utf-8")
+    else:
+        path.unlink(missing_ok=True)
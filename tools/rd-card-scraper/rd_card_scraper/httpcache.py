@@ -0,0 +1,30 @@
+"""HTTP conditional request helpers (ETag / Last-Modified revalidation)."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import requests
+
+
+def conditional_headers(
+    etag: Optional[str], last_modified: Optional[str]
+) -> dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def response_validators(
+    resp: requests.Response,
+) -> tuple[Optional[str], Optional[str]]:
+    """Return the (ETag, Last-Modified) validators sent by the server, if any."""
+    return resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+
+def is_not_modified(resp: requests.Response) -> bool:
+    return resp.status_code == 304
@@ -0,0 +1,187 @@
+"""Content-addressed store of downloaded card images.
+
+Reprints across structure decks, GRD, SD and Legend packs often reuse the
+same artwork. Each distinct image is kept once and hard-linked into every
+``{set_id}/images/`` directory that uses it, so a shared image costs one
+download and one copy on disk.
+
+Layout under ``{data_dir}/image_store/``::
+
+    objects/ab/abcdef….jpg   # one file per distinct SHA256
+    index.jsonl              # {"url", "hash"}; the last line per URL wins,
+                             # "hash": null forgets the URL
+
+The set directories keep ordinary paths (``KP01/images/RD_KP01-JP000.jpg``),
+so readers of ``image_file`` are unaffected. Images are only ever replaced
+by rename, never rewritten in place, so hard links cannot leak a change
+from one set into another. Where hard links are not supported the object
+is copied instead.
+
+A set file is the same inode as its object, so corrupting one corrupts
+the other. Objects are therefore checked against their hash name (once
+per process) before being linked anywhere, and ``discard()`` drops a
+broken file's object before it is downloaded again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .models import iter_jsonl
+
+logger = logging.getLogger(__name__)
+
+IMAGE_STORE_DIR = "image_store"
+INDEX_FILE = "index.jsonl"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def link_file(src: Path, dest: Path) -> None:
+    """Atomically make ``dest`` a hard link to ``src`` (a copy if linking fails)."""
+    tmp = dest.with_name(dest.name + ".link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.index_path = root / INDEX_FILE
+        self._lock = threading.Lock()
+        self._by_url: dict[str, str] = {}
+        # Objects whose content was checked against their name in this process
+        self._verified: set[str] = set()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        for entry in iter_jsonl(self.index_path, "image index"):
+            if entry["hash"] is None:
+                self._by_url.pop(entry["url"], None)
+            else:
+                self._by_url[entry["url"]] = entry["hash"]
+
+    def object_path(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash[:2] / f"{content_hash}.jpg"
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """Stored image previously downloaded from ``url``, if any."""
+        content_hash = self._by_url.get(url)
+        if content_hash is None:
+            return None
+        path = self.object_path(content_hash)
+        return path if path.exists() else None
+
+    def link_into(self, url: str, dest: Path) -> bool:
+        """Place the stored image for ``url`` at ``dest``. False if not stored
+        (or the stored object turned out to be corrupt)."""
+        src = self.lookup(url)
+        if src is None:
+            return False
+        with self._lock:
+            if not self._intact(self._by_url[url]):
+                return False
+        link_file(src, dest)
+        return True
+
+    def discard(self, url: Optional[str], path: Optional[Path] = None) -> bool:
+        """Drop ``url``'s object if it is ``path`` (a broken image) or corrupt.
+
+        Call before deleting and re-downloading a broken set file, so the new
+        download does not get linked back to the damaged object. Returns True
+        if an object was removed.
+        """
+        with self._lock:
+            content_hash = self._by_url.get(url) if url else None
+            if content_hash is None:
+                return False
+            obj = self.object_path(content_hash)
+            try:
+                same = path is not None and os.path.samefile(obj, path)
+            except OSError:
+                same = False
+            if same:
+                self._remove_object(content_hash)
+                return True
+            return not self._intact(content_hash)
+
+    def _intact(self, content_hash: str) -> bool:
+        """Whether an object still matches its name; removes it if not. Lock held."""
+        if content_hash in self._verified:
+            return True
+        obj = self.object_path(content_hash)
+        try:
+            intact = file_sha256(obj) == content_hash
+        except FileNotFoundError:
+            intact = False
+        if intact:
+            self._verified.add(content_hash)
+        else:
+            logger.warning(f"Stored image {content_hash[:12]}… is corrupt; dropping it")
+            self._remove_object(content_hash)
+        return intact
+
+    def _remove_object(self, content_hash: str) -> None:
+        """Delete an object and forget every URL pointing at it. Lock held."""
+        self.object_path(content_hash).unlink(missing_ok=True)
+        self._verified.discard(content_hash)
+        urls = [u for u, h in self._by_url.items() if h == content_hash]
+        if not urls:
+            return
+        with self.index_path.open("a", encoding="utf-8") as f:
+            for url in urls:
+                f.write(json.dumps({"url": url, "hash": None}) + "\n")
+                del self._by_url[url]
+
+    def adopt(self, path: Path, url: str) -> bool:
+        """Add a downloaded image at ``path`` to the store.
+
+        If identical content is already stored, ``path`` is replaced by a
+        link to it; otherwise the file becomes the stored object. Files that
+        are already linked to ``url``'s object are left alone without being
+        hashed, so adopting every existing image on each run is cheap.
+
+        Returns True if ``path`` was deduplicated against an existing object.
+        """
+        known = self.lookup(url)
+        if known is not None and os.path.samefile(known, path):
+            return False
+
+        content_hash = file_sha256(path)
+        obj = self.object_path(content_hash)
+        with self._lock:
+            if obj.exists() and not os.path.samefile(obj, path):
+                self._intact(content_hash)  # removes a damaged object, so path replaces it
+            if obj.exists():
+                deduplicated = not os.path.samefile(obj, path)
+                if deduplicated:
+                    link_file(obj, path)
+            else:
+                deduplicated = False
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                link_file(path, obj)
+            if self._by_url.get(url) != content_hash:
+                self.root.mkdir(parents=True, exist_ok=True)
+                with self.index_path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps({"url": url, "hash": content_hash}) + "\n")
+                self._by_url[url] = content_hash
+        return deduplicated
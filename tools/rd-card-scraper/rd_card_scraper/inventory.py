@@ -0,0 +1,238 @@
+"""Inventory of every card image in the data directory.
+
+``{data_dir}/image_inventory.jsonl`` records, per image file, what it should
+be::
+
+    {"path": "KP01/images/RD_KP01-JP000.jpg", "size": 48213, "sha256": "…",
+     "format": "jpeg", "width": 400, "height": 584,
+     "url": "https://…", "fetched_at": "2025-…"}
+
+It is append-only like the scrape state journal: a download or link appends
+the file's entry, a deleted image appends ``{"path": …, "removed": true}``,
+and the last line per path wins. ``compact()`` atomically rewrites it with
+one line per live image.
+
+``verify_file()`` checks an image against its entry and against its own
+format (a JPEG must end with its EOI marker, a PNG with IEND, ...), which
+catches truncated and corrupt files that ``Path.exists()`` does not.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .models import iter_jsonl, write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+IMAGE_INVENTORY_FILE = "image_inventory.jsonl"
+DEFAULT_VERIFY_WORKERS = 4
+
+# JPEG start-of-frame markers (SOF0-SOF15 without DHT, JPG and DAC)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def image_info(data: bytes) -> tuple[Optional[str], Optional[int], Optional[int], bool]:
+    """Sniff (format, width, height, complete) from image bytes.
+
+    ``complete`` is False when the file is cut short or malformed. Unknown
+    formats return (None, None, None, False).
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        width, height = _jpeg_size(data)
+        # Encoders may pad after EOI; a truncated file never ends with it
+        complete = width is not None and data.rstrip(b"\x00").endswith(b"\xff\xd9")
+        return "jpeg", width, height, complete
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return "png", width, height, data.endswith(b"IEND\xaeB`\x82")
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return "gif", width, height, data.rstrip(b"\x00").endswith(b";")
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        declared = struct.unpack("<I", data[4:8])[0] + 8
+        return "webp", None, None, len(data) >= declared
+    return None, None, None, False
+
+
+def _jpeg_size(data: bytes) -> tuple[Optional[int], Optional[int]]:
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            return None, None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # no length field
+            i += 2
+            continue
+        length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        if marker in _SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    return None, None
+
+
+def describe_file(path: Path) -> dict:
+    """Size, SHA256 and sniffed format/dimensions of an image file."""
+    data = path.read_bytes()
+    fmt, width, height, _complete = image_info(data)
+    return {
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "format": fmt,
+        "width": width,
+        "height": height,
+    }
+
+
+def verify_file(path: Path, entry: Optional[dict] = None) -> Optional[str]:
+    """Why the image at ``path`` is broken, or None if it is intact.
+
+    Checks that it exists and is a complete image and, with an inventory
+    ``entry``, that its size and SHA256 still match.
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return "missing"
+    except OSError as e:
+        return f"unreadable ({e})"
+    fmt, _width, _height, complete = image_info(data)
+    if fmt is None:
+        return "not an image"
+    if not complete:
+        return f"truncated or corrupt {fmt}"
+    if entry is not None:
+        if entry.get("size") is not None and entry["size"] != len(data):
+            return f"size {len(data)} != {entry['size']}"
+        if entry.get("sha256") and entry["sha256"] != hashlib.sha256(data).hexdigest():
+            return "checksum mismatch"
+    return None
+
+
+class ImageInventory:
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._journal_lines = 0
+        self._load()
+
+    def _load(self) -> None:
+        for entry in iter_jsonl(self.path, "image inventory"):
+            try:
+                rel_path = entry["path"]
+            except KeyError:
+                logger.warning(f"Ignoring invalid image inventory entry: {str(entry)[:80]}")
+                continue
+            self._journal_lines += 1
+            if entry.get("removed"):
+                self.entries.pop(rel_path, None)
+            else:
+                self.entries[rel_path] = entry
+
+    def get(self, rel_path: str) -> Optional[dict]:
+        return self.entries.get(rel_path)
+
+    def _append(self, entry: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._journal_lines += 1
+
+    def record(
+        self,
+        rel_path: str,
+        path: Path,
+        url: Optional[str],
+        fetched_at: Optional[str] = None,
+    ) -> dict:
+        """Describe the file at ``path`` and store it as ``rel_path``'s entry."""
+        entry = {
+            "path": rel_path,
+            **describe_file(path),
+            "url": url,
+            "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self.entries[rel_path] = entry
+            self._append(entry)
+        return entry
+
+    def ensure(self, rel_path: str, path: Path, url: Optional[str]) -> None:
+        """Record a file that is not inventoried yet, or was replaced since.
+
+        Only stats the file for an existing entry, so calling it for every
+        image on every run is cheap.
+        """
+        entry = self.entries.get(rel_path)
+        if entry is not None and entry.get("url") == url:
+            try:
+                if path.stat().st_size == entry["size"]:
+                    return
+            except FileNotFoundError:
+                self.forget(rel_path)
+                return
+        if path.exists():
+            mtime = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat()
+            self.record(rel_path, path, url, fetched_at=mtime)
+
+    def forget(self, rel_path: str) -> None:
+        with self._lock:
+            if self.entries.pop(rel_path, None) is not None:
+                self._append({"path": rel_path, "removed": True})
+
+    def compact(self) -> bool:
+        """Rewrite the file with one line per image if it has grown. Returns True if rewritten."""
+        with self._lock:
+            if self._journal_lines <= len(self.entries):
+                return False
+            lines = [
+                json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+                for _path, entry in sorted(self.entries.items())
+            ]
+            write_text_atomic(self.path, "".join(line + "\n" for line in lines))
+            self._journal_lines = len(lines)
+            return True
+
+    def verify(
+        self,
+        data_dir: Path,
+        rel_paths: Optional[Iterable[str]] = None,
+        workers: int = DEFAULT_VERIFY_WORKERS,
+    ) -> dict[str, str]:
+        """Check images in parallel. Returns {rel_path: reason} of the broken ones."""
+        rel_paths = sorted(self.entries) if rel_paths is None else list(rel_paths)
+
+        def check(rel_path: str) -> Optional[str]:
+            return verify_file(data_dir / rel_path, self.entries.get(rel_path))
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            reasons = pool.map(check, rel_paths)
+            return {
+                rel_path: reason
+                for rel_path, reason in zip(rel_paths, reasons)
+                if reason is not None
+            }
+
+
+def image_files(data_dir: Path) -> list[str]:
+    """Relative paths of every card image under ``data_dir``, in every size
+    (``<set_id>/images/*.jpg`` and ``<set_id>/images/<size>/*.jpg``)."""
+    return sorted(
+        os.path.relpath(p, data_dir).replace(os.sep, "/")
+        for pattern in ("*/images/*.jpg", "*/images/*/*.jpg")
+        for p in data_dir.glob(pattern)
+    )
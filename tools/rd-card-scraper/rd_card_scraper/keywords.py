@@ -0,0 +1,66 @@
+"""Shared card keywords and a precompiled multi-keyword matcher.
+
+The parser (detail-entry detection, stats regexes) and discovery (post
+verification, title / URL classification) look for the same families of
+keywords. They are defined once here, and each keyword set is compiled into
+a single regex alternation at import, so a text is scanned once rather than
+once per keyword.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+# Card type keywords as written in stats lines.
+# Compound types (X/Y怪獸) MUST come before simple types so an alternation
+# matches the longer form first; e.g. 儀式/效果怪獸 before 效果怪獸.
+CARD_TYPE_KEYWORDS: tuple[str, ...] = (
+    "儀式/效果怪獸", "融合/效果怪獸", "巨極/效果怪獸",
+    "通常怪獸", "效果怪獸", "融合怪獸", "儀式怪獸",
+    "儀式魔法", "通常魔法", "速攻魔法", "永續魔法", "裝備魔法", "場地魔法",
+    "通常陷阱", "永續陷阱", "反擊陷阱",
+)
+
+# Abbreviated card type in the compact stats format → full type keyword
+COMPACT_TYPE_MAP: dict[str, str] = {
+    "通常": "通常怪獸",
+    "效果": "效果怪獸",
+    "融合": "融合怪獸",
+    "儀式": "儀式怪獸",
+    "巨極": "巨極/效果怪獸",
+}
+
+# Monster attributes
+ATTRIBUTES: tuple[str, ...] = ("光", "暗", "炎", "水", "風", "地")
+
+
+class KeywordMatcher:
+    """Find any of a fixed set of literal keywords with one regex scan.
+
+    Keywords are tried longest first, so where several start at the same
+    position the longest one is reported.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: tuple[str, ...] = tuple(dict.fromkeys(keywords))
+        if not self.keywords:
+            raise ValueError("KeywordMatcher needs at least one keyword")
+        alternation = "|".join(
+            re.escape(kw) for kw in sorted(self.keywords, key=len, reverse=True)
+        )
+        self.pattern = re.compile(alternation)
+        # Zero-width lookahead so overlapping keywords are all reported
+        self._overlapping = re.compile(f"(?=({alternation}))")
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the first keyword occurring in ``text``, or None."""
+        m = self.pattern.search(text)
+        return m.group(0) if m else None
+
+    def found(self, text: str) -> set[str]:
+        """Return every keyword occurring in ``text``."""
+        return {m.group(1) for m in self._overlapping.finditer(text)}
+
+
+CARD_TYPE_MATCHER = KeywordMatcher(CARD_TYPE_KEYWORDS)
@@ -0,0 +1,222 @@
+"""Per-stage timers and counters for scraper runs.
+
+A ``RunMetrics`` collects, for one command run, how long each stage took
+(network, rate-limit waits, HTML parsing, card extraction, image I/O,
+saving, ...) and counters such as bytes fetched or retries. At the end of
+the run it becomes a JSON report::
+
+    {"command": "update", "started_at": ..., "elapsed_s": 12.3,
+     "stages": {"fetch": {"calls": 40, "total_s": 6.1, "mean_ms": 152.5,
+                          "max_ms": 410.2}, ...},
+     "counters": {"post_bytes": 2310000, "images_downloaded": 80, ...},
+     "rates": {"parse_ms_per_post": 35.2, "images_per_s": 3.9, ...},
+     "request_rates": {"posts": {"ntucgm.blogspot.com": {"requests": 41,
+                       "retries": 0, "backoffs": 0, "rate": 2.0,
+                       "achieved_rps": 1.6}}, "images": {...}},
+     "stats": {...}}
+
+written to ``{data_dir}/run_report.json`` and appended to
+``run_history.jsonl``, so runs can be compared. Stage times are summed over
+threads, so with concurrent workers they can add up to more than the
+elapsed wall time.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TypeVar
+
+from .models import iter_jsonl, write_text_atomic
+
+RUN_REPORT_FILE = "run_report.json"
+RUN_HISTORY_FILE = "run_history.jsonl"
+
+T = TypeVar("T")
+
+
+class RunMetrics:
+    """Thread-safe stage timers and counters for one run."""
+
+    def __init__(self, command: str = ""):
+        self.command = command
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        # stage → [calls, total seconds, max seconds]
+        self._stages: dict[str, list] = {}
+        self.counters: dict[str, float] = {}
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def timed(self, iterable: Iterable[T], stage: str) -> Iterator[T]:
+        """Iterate ``iterable``, timing each step under ``stage``."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add_time(stage, time.perf_counter() - start)
+            yield item
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe_response(self, resp) -> None:
+        """Count an HTTP response (installed as a ``requests`` response hook)."""
+        self.count("http_requests")
+        if resp.status_code == 304:
+            self.count("http_not_modified")
+        elif resp.status_code >= 400:
+            self.count("http_errors")
+
+    def report(self, stats: dict, request_rates: Optional[dict] = None) -> dict:
+        """The run report, with ``stats`` (the command's summary) attached.
+
+        ``request_rates`` maps a request kind ("posts", "images") to the
+        ``AdaptiveRateLimiter.summary()`` of its limiter.
+        """
+        elapsed = time.perf_counter() - self._start
+        with self._lock:
+            stages = {
+                stage: {
+                    "calls": calls,
+                    "total_s": round(total, 3),
+                    "mean_ms": round(total / calls * 1000, 1) if calls else 0.0,
+                    "max_ms": round(peak * 1000, 1),
+                }
+                for stage, (calls, total, peak) in sorted(
+                    self._stages.items(), key=lambda item: -item[1][1]
+                )
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {
+            "command": self.command,
+            "started_at": self.started_at,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "elapsed_s": round(elapsed, 3),
+            "stages": stages,
+            "counters": counters,
+            "rates": _rates(stages, counters, elapsed),
+            "request_rates": {
+                kind: hosts for kind, hosts in (request_rates or {}).items() if hosts
+            },
+            "stats": {k: v for k, v in stats.items() if _is_plain(v)},
+        }
+
+
+def _rates(stages: dict, counters: dict, elapsed: float) -> dict:
+    rates = {}
+    parsed = counters.get("posts_parsed", 0)
+    parse_s = sum(
+        stages.get(stage, {}).get("total_s", 0.0)
+        for stage in ("html_parse", "extract", "parse")
+    )
+    if parsed:
+        rates["parse_ms_per_post"] = round(parse_s / parsed * 1000, 1)
+    fetched_bytes = sum(
+        counters.get(key, 0) for key in ("discovery_bytes", "post_bytes", "image_bytes")
+    )
+    if fetched_bytes and elapsed > 0:
+        rates["bytes_per_s"] = round(fetched_bytes / elapsed)
+    image_s = stages.get("images", {}).get("total_s", 0.0)
+    if counters.get("images_downloaded") and image_s > 0:
+        rates["images_per_s"] = round(counters["images_downloaded"] / image_s, 2)
+    return rates
+
+
+def _is_plain(value) -> bool:
+    return isinstance(value, (str, int, float, bool, type(None)))
+
+
+def write_run_report(data_dir: Path, report: dict) -> None:
+    """Write ``run_report.json`` and append the report to ``run_history.jsonl``."""
+    write_text_atomic(
+        data_dir / RUN_REPORT_FILE,
+        json.dumps(report, ensure_ascii=False, indent=2) + "\n",
+    )
+    line = json.dumps(report, ensure_ascii=False, separators=(",", ":"))
+    with (data_dir / RUN_HISTORY_FILE).open("a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def read_run_history(data_dir: Path) -> list[dict]:
+    """Every report in ``run_history.jsonl``, oldest first."""
+    return list(iter_jsonl(data_dir / RUN_HISTORY_FILE, "run history"))
+
+
+def format_report(report: dict) -> list[str]:
+    """Human-readable summary of a run report."""
+    lines = [f"Timing ({report['elapsed_s']:.2f}s elapsed):"]
+    for stage, timing in report["stages"].items():
+        lines.append(
+            f"  {stage:<18} {timing['total_s']:>8.2f}s  "
+            f"{timing['calls']:>5} calls  mean {timing['mean_ms']:.1f} ms"
+        )
+    if report["counters"]:
+        lines.append("Counters:")
+        lines += [f"  {name:<18} {value:g}" for name, value in report["counters"].items()]
+    rates = report["rates"]
+    if rates:
+        lines.append("Rates:")
+        if "parse_ms_per_post" in rates:
+            lines.append(f"  parse              {rates['parse_ms_per_post']:.1f} ms/post")
+        if "images_per_s" in rates:
+            lines.append(f"  images             {rates['images_per_s']:.2f} /s")
+        if "bytes_per_s" in rates:
+            lines.append(f"  fetched            {rates['bytes_per_s'] / 1024:.1f} KiB/s")
+    request_rates = report.get("request_rates")
+    if request_rates:
+        lines.append("Request rates:")
+        for kind, hosts in request_rates.items():
+            for host, host_stats in hosts.items():
+                achieved = host_stats["achieved_rps"]
+                lines.append(
+                    f"  {kind:<7} {host:<28} "
+                    f"{f'{achieved:.2f}' if achieved is not None else '-':>6} req/s "
+                    f"(limit now {host_stats['rate']:.2f}/s, "
+                    f"{host_stats['requests']} requests, {host_stats['retries']} retries, "
+                    f"{host_stats['backoffs']} backoffs)"
+                )
+    return lines
+
+
+def format_history(reports: list[dict]) -> list[str]:
+    """One line per run, for comparing runs at a glance."""
+    lines = [
+        f"{'started':<20} {'command':<11} {'elapsed':>8} {'fetch':>7} {'wait':>7} "
+        f"{'parse/post':>10} {'images':>6} {'KiB/s':>7}"
+    ]
+    for report in reports:
+        stages, rates = report["stages"], report["rates"]
+        parse = rates.get("parse_ms_per_post")
+        lines.append(
+            f"{report['started_at'][:19]:<20} {report['command']:<11} "
+            f"{report['elapsed_s']:>7.1f}s "
+            f"{stages.get('fetch', {}).get('total_s', 0.0):>6.1f}s "
+            f"{stages.get('rate_limit_wait', {}).get('total_s', 0.0):>6.1f}s "
+            f"{f'{parse:.1f} ms' if parse is not None else '-':>10} "
+            f"{report['counters'].get('images_downloaded', 0):>6g} "
+            f"{rates.get('bytes_per_s', 0) / 1024:>7.1f}"
+        )
+    return lines
@@ -2,13 +2,57 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass, field, asdict
+import logging
+import os
+import sys
+from dataclasses import dataclass, field, asdict, astuple, fields
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+from .catalog import CATALOG_FILE, catalog_is_current, iter_catalog_rows, set_files
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write ``text`` to a temp file, fsync it and rename it over ``path``."""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def iter_jsonl(path: Path, what: str = "line") -> Iterator:
+    """Decoded lines of an append-only JSON Lines file; nothing if it is missing.
+
+    A crash mid-append can leave a partial last line: lines that do not
+    decode are skipped with a warning naming ``what`` the file holds.
+    """
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring corrupt {what} line: {line[:80]}")
+
+
+def canonical_hash(data: dict) -> str:
+    """SHA256 of the canonical (sorted-key, compact) JSON of ``data``."""
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
 class Card:
     card_id: str  # e.g. "RD/KP01-JP000"
     rarity: str  # e.g. "RR", "UR", "SR", "R", "N", "UR/SER"
@@ -26,13 +70,45 @@ class Card:
     continuous_effect: Optional[str] = None  # 永續效果
     image_url: Optional[str] = None
     image_file: Optional[str] = None  # relative path to downloaded image
+    image_files: Optional[dict] = None  # extra size name → relative path (downloader.py)
     is_legend: bool = False
 
+    def __post_init__(self) -> None:
+        self.intern_fields()
+
+    def intern_fields(self) -> None:
+        """Intern the categorical fields (rarity, type, attribute, race, stats).
+
+        They take a few hundred distinct values across tens of thousands of
+        cards, so the whole catalog shares one string object per value
+        instead of holding one per card.
+        """
+        self.rarity = sys.intern(self.rarity)
+        self.card_type = sys.intern(self.card_type)
+        if self.attribute:
+            self.attribute = sys.intern(self.attribute)
+        if self.monster_type:
+            self.monster_type = sys.intern(self.monster_type)
+        if self.atk:
+            self.atk = sys.intern(self.atk)
+        if self.defense:
+            self.defense = sys.intern(self.defense)
+
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        # Not dataclasses.asdict(), which deep-copies every value
+        return {k: v for k, v in zip(CARD_FIELDS, _card_values(self)) if v is not None}
 
+    def content_hash(self) -> str:
+        """SHA256 of the card's canonical JSON; equal cards hash equally."""
+        return canonical_hash(self.to_dict())
 
-@dataclass
+
+# Card field order, used for the rows of catalog.jsonl.gz
+CARD_FIELDS: list[str] = [f.name for f in fields(Card)]
+_card_values = attrgetter(*CARD_FIELDS)
+
+
+@dataclass(slots=True)
 class CardSet:
     set_id: str  # e.g. "KP01", "ST01", "LGP1"
     set_name_jp: str
@@ -44,49 +120,253 @@ class CardSet:
     rarity_distribution: dict = field(default_factory=dict)
     cards: list[Card] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self.product_type = sys.intern(self.product_type)
+
     def to_dict(self) -> dict:
-        d = asdict(self)
+        d = dict(zip(_SET_FIELDS, _set_values(self)))
+        d["rarity_distribution"] = dict(self.rarity_distribution)
         d["cards"] = [c.to_dict() for c in self.cards]
         return d
 
-    def save(self, base_dir: Path) -> None:
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def content_hash(self) -> str:
+        """SHA256 of the canonical (sorted-key, compact) JSON of the set."""
+        return canonical_hash(self.to_dict())
+
+    def save(self, base_dir: Path) -> bool:
+        """Write ``<set_id>/cards.json``. Returns False if it was already identical."""
         set_dir = base_dir / self.set_id
         set_dir.mkdir(parents=True, exist_ok=True)
         data_file = set_dir / "cards.json"
-        data_file.write_text(
-            json.dumps(self.to_dict(), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        text = self.to_json()
+        try:
+            if data_file.read_text(encoding="utf-8") == text:
+                return False
+        except FileNotFoundError:
+            pass
+        data_file.write_text(text, encoding="utf-8")
+        return True
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CardSet:
+        cards = [Card(**c) for c in data.get("cards", [])]
+        cs = cls(**{k: v for k, v in data.items() if k != "cards"})
+        cs.cards = cards
+        return cs
 
     @classmethod
     def load(cls, base_dir: Path, set_id: str) -> Optional[CardSet]:
         data_file = base_dir / set_id / "cards.json"
         if not data_file.exists():
             return None
-        data = json.loads(data_file.read_text(encoding="utf-8"))
-        cards = [Card(**c) for c in data.pop("cards", [])]
-        cs = cls(**{k: v for k, v in data.items() if k != "cards"})
-        cs.cards = cards
-        return cs
+        return cls.from_dict(json.loads(data_file.read_text(encoding="utf-8")))
+
+    @classmethod
+    def load_all(cls, base_dir: Path) -> dict[str, CardSet]:
+        """Load every saved set, keyed by set_id.
+
+        Reads the single ``catalog.jsonl.gz`` when it is current, falling
+        back to the individual ``cards.json`` files otherwise.
+        """
+        if not catalog_is_current(base_dir):
+            sets = (
+                cls.from_dict(json.loads(p.read_text(encoding="utf-8")))
+                for p in set_files(base_dir)
+            )
+            return {cs.set_id: cs for cs in sets}
+
+        loaded: dict[str, CardSet] = {}
+        for set_data, card_fields, rows in iter_catalog_rows(base_dir / CATALOG_FILE):
+            cs = cls(**set_data)
+            if card_fields == CARD_FIELDS:
+                cs.cards = [Card(*row) for row in rows]
+            else:  # written by a version with different Card fields
+                cs.cards = [Card(**dict(zip(card_fields, row))) for row in rows]
+            loaded[cs.set_id] = cs
+        return loaded
+
+
+# CardSet fields other than cards, in to_dict() order
+_SET_FIELDS: list[str] = [f.name for f in fields(CardSet) if f.name != "cards"]
+_set_values = attrgetter(*_SET_FIELDS)
+
+
+@dataclass
+class SetManifest:
+    """What each saved set currently contains, in one small file.
+
+    ``sets`` maps set_id → {"content_hash", "card_count", "image_count",
+    "changed_at"}. ``content_hash`` is ``CardSet.content_hash()`` of the
+    saved ``cards.json`` and ``changed_at`` the time it last changed, so
+    consumers can tell which sets to process without opening them.
+    """
+
+    sets: dict[str, dict] = field(default_factory=dict)
+
+    def is_current(self, set_id: str, content_hash: str) -> bool:
+        entry = self.sets.get(set_id)
+        return entry is not None and entry["content_hash"] == content_hash
+
+    def record(self, card_set: CardSet, content_hash: str, changed_at: str) -> None:
+        self.sets[card_set.set_id] = {
+            "content_hash": content_hash,
+            "card_count": len(card_set.cards),
+            "image_count": sum(1 for c in card_set.cards if c.image_file),
+            "changed_at": changed_at,
+        }
+
+    def save(self, path: Path) -> None:
+        data = {"sets": dict(sorted(self.sets.items()))}
+        write_text_atomic(path, json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> SetManifest:
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(sets=data.get("sets", {}))
 
 
 @dataclass
 class ScrapeState:
-    """Tracks which posts have been scraped and their last-modified info."""
+    """Tracks which posts have been scraped and their last-modified info.
+
+    Stored as a snapshot (``scrape_state.json``) plus an append-only journal
+    next to it (``scrape_state.journal.jsonl``, one PostState per line).
+    ``record()`` appends a single line per post, so a crash can at most tear
+    the last journal line, which ``load()`` skips. ``save()`` compacts: it
+    atomically rewrites the snapshot and clears the journal.
+
+    The snapshot is columnar (``{"fields": [...], "rows": [[...], ...]}``),
+    which parses much faster than one object per post; the older
+    url → PostState object layout is still read.
+    """
 
     posts: dict[str, PostState] = field(default_factory=dict)
 
+    @staticmethod
+    def journal_path(path: Path) -> Path:
+        return path.with_name(path.stem + ".journal.jsonl")
+
+    def record(self, path: Path, post_state: PostState) -> None:
+        """Set ``posts[post_state.url]`` and append it to the journal."""
+        self.posts[post_state.url] = post_state
+        line = json.dumps(asdict(post_state), ensure_ascii=False, separators=(",", ":"))
+        with self.journal_path(path).open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
     def save(self, path: Path) -> None:
-        data = {url: asdict(ps) for url, ps in self.posts.items()}
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        """Compact: write the full snapshot atomically, then drop the journal."""
+        data = {
+            "fields": _POST_STATE_FIELDS,
+            "rows": [astuple(ps) for ps in self.posts.values()],
+        }
+        write_text_atomic(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        # Replaying a leftover journal over the new snapshot is harmless, so
+        # a crash between these two steps loses nothing
+        self.journal_path(path).unlink(missing_ok=True)
 
     @classmethod
     def load(cls, path: Path) -> ScrapeState:
+        posts: dict[str, PostState] = {}
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if "rows" in data and "fields" in data:
+                posts = _post_states_from_rows(data["fields"], data["rows"])
+            else:
+                posts = {url: PostState(**ps) for url, ps in data.items()}
+
+        for entry in iter_jsonl(cls.journal_path(path), "state journal"):
+            try:
+                post_state = PostState(**entry)
+            except TypeError:
+                logger.warning(f"Ignoring invalid state journal entry: {str(entry)[:80]}")
+                continue
+            posts[post_state.url] = post_state
+        return cls(posts=posts)
+
+    def journal_size(self, path: Path) -> int:
+        """Number of records waiting in the journal."""
+        journal = self.journal_path(path)
+        if not journal.exists():
+            return 0
+        with journal.open(encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+
+
+@dataclass
+class RunCheckpoint:
+    """Progress of a scrape-all / update run, so an interrupted run can resume.
+
+    Stored as ``run_checkpoint.json`` (the command, its options and the
+    discovered posts, written once after discovery) plus an append-only
+    journal next to it with one line per post progress: ``{"url", "stage":
+    "fetched", "snapshot_hash", "encoding", "etag", "last_modified"}`` once
+    the post's HTML is in the snapshot store, and ``{"url", "stage": "done"}``
+    once it is saved. Both files are removed when the run completes.
+    """
+
+    command: str
+    started_at: str
+    options: dict = field(default_factory=dict)
+    posts: list[dict] = field(default_factory=list)
+    fetched: dict[str, dict] = field(default_factory=dict)
+    done: set[str] = field(default_factory=set)
+
+    @staticmethod
+    def journal_path(path: Path) -> Path:
+        return path.with_name(path.stem + ".journal.jsonl")
+
+    def save(self, path: Path) -> None:
+        """Write the checkpoint and start an empty progress journal."""
+        data = {
+            "command": self.command,
+            "started_at": self.started_at,
+            "options": self.options,
+            "posts": self.posts,
+        }
+        write_text_atomic(path, json.dumps(data, ensure_ascii=False))
+        self.journal_path(path).unlink(missing_ok=True)
+
+    def record(self, path: Path, entry: dict) -> None:
+        """Append one post's progress to the journal."""
+        self._apply(entry)
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self.journal_path(path).open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def _apply(self, entry: dict) -> None:
+        if entry["stage"] == "fetched":
+            self.fetched[entry["url"]] = entry
+        elif entry["stage"] == "done":
+            self.done.add(entry["url"])
+            self.fetched.pop(entry["url"], None)
+
+    @staticmethod
+    def clear(path: Path) -> None:
+        path.unlink(missing_ok=True)
+        RunCheckpoint.journal_path(path).unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional[RunCheckpoint]:
         if not path.exists():
-            return cls()
+            return None
         data = json.loads(path.read_text(encoding="utf-8"))
-        posts = {url: PostState(**ps) for url, ps in data.items()}
-        return cls(posts=posts)
+        checkpoint = cls(
+            command=data["command"],
+            started_at=data["started_at"],
+            options=data.get("options", {}),
+            posts=data.get("posts", []),
+        )
+        for entry in iter_jsonl(cls.journal_path(path), "checkpoint"):
+            try:
+                checkpoint._apply(entry)
+            except KeyError:
+                logger.warning(f"Ignoring invalid checkpoint entry: {str(entry)[:80]}")
+        return checkpoint
 
 
 @dataclass
@@ -97,3 +377,58 @@ class PostState:
     last_scraped: str  # ISO timestamp
     content_hash: str  # hash of post HTML to detect changes
     card_count: int = 0
+    etag: Optional[str] = None  # server validators for conditional requests
+    last_modified: Optional[str] = None
+
+
+_POST_STATE_FIELDS = [f.name for f in fields(PostState)]
+
+
+def _post_states_from_rows(
+    field_names: list[str], rows: list[list]
+) -> dict[str, PostState]:
+    if field_names == _POST_STATE_FIELDS:
+        states = [PostState(*row) for row in rows]
+    else:
+        # Written by a version with other fields: match them by name
+        known = set(_POST_STATE_FIELDS)
+        states = [
+            PostState(**{k: v for k, v in zip(field_names, row) if k in known})
+            for row in rows
+        ]
+    return {ps.url: ps for ps in states}
+
+
+@dataclass
+class DiscoveryCache:
+    """Cached discovery results, revalidated with conditional requests.
+
+    ``listing`` maps a listing or feed page URL to its validators and the
+    posts / next-page cursor parsed from it, so a 304 response can be replayed
+    without the page body. ``verdicts`` maps a post URL to its content
+    verification result and the post version it was made for.
+
+    It is rewritten after every discovery, so it is saved atomically and
+    compact (it holds every feed page's posts). Being only a cache, an
+    unreadable file is discarded rather than failing the run.
+    """
+
+    listing: dict[str, dict] = field(default_factory=dict)
+    verdicts: dict[str, dict] = field(default_factory=dict)
+
+    def save(self, path: Path) -> None:
+        data = {"listing": self.listing, "verdicts": self.verdicts}
+        write_text_atomic(
+            path, json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> DiscoveryCache:
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.warning(f"Ignoring corrupt discovery cache {path}: {e}")
+            return cls()
+        return cls(listing=data.get("listing", {}), verdicts=data.get("verdicts", {}))
@@ -30,6 +30,14 @@ KP23 era (2025):
 
 Key insight: card IDs appear TWICE (summary + detail). We parse the DETAIL section
 by finding each card ID and gathering subsequent text/images until the next card ID.
+
+=== Backends ===
+
+PostDocument builds its tree with lxml directly by default ("lxml"); the
+BeautifulSoup tree ("bs4") is kept as a fallback. Both produce the same chunk
+stream and body text: the lxml helpers below reproduce how BeautifulSoup
+exposes lxml's parse (comments as strings, script/style/template/ruby text
+left out of get_text(), whitespace-only strings collapsed).
 """
 
 from __future__ import annotations
@@ -37,10 +45,13 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from typing import Optional
+from functools import cached_property
+from typing import Iterator, Optional, Union
 
 from bs4 import BeautifulSoup, NavigableString, Tag
+from lxml import etree
 
+from .keywords import ATTRIBUTES, CARD_TYPE_KEYWORDS, CARD_TYPE_MATCHER, COMPACT_TYPE_MAP
 from .models import Card, CardSet
 
 logger = logging.getLogger(__name__)
@@ -55,19 +66,15 @@ SET_ID_RE = re.compile(r"RD/(\w+)-JP")
 RARITY_RE = re.compile(r"\(([A-Z/]+)\)")
 
 # Stats line: (Chinese name) CardType [Level Attribute Race ATK/DEF]
-# Compound types (X/Y怪獸) MUST appear before simple types so regex matches
-# the longer form first; e.g. 儀式/效果怪獸 before 效果怪獸.
-CARD_TYPES = (
-    "儀式/效果怪獸|融合/效果怪獸|巨極/效果怪獸|"
-    "通常怪獸|效果怪獸|融合怪獸|儀式怪獸|"
-    "儀式魔法|通常魔法|速攻魔法|永續魔法|裝備魔法|場地魔法|"
-    "通常陷阱|永續陷阱|反擊陷阱"
-)
+# CARD_TYPE_KEYWORDS lists compound types (X/Y怪獸) first so the regex
+# matches the longer form first; e.g. 儀式/效果怪獸 before 效果怪獸.
+CARD_TYPES = "|".join(CARD_TYPE_KEYWORDS)
+_ATTRIBUTES = "|".join(ATTRIBUTES)
 STATS_RE = re.compile(
     r"[（(]([^)）]+?)[）)]\s*"  # Chinese name
     r"(" + CARD_TYPES + r")"
     r"(?:\s+(\d+))?"       # Level
-    r"(?:\s+(光|暗|炎|水|風|地))?"  # Attribute
+    r"(?:\s+(" + _ATTRIBUTES + r"))?"  # Attribute
     r"(?:\s+(\S+族))?"     # Race
     r"(?:\s+(\d+|\?)/(\d+|\?))?"  # ATK/DEF
 )
@@ -83,21 +90,12 @@ STATS_RE = re.compile(
 COMPACT_STATS_RE = re.compile(
     r"[（(]([^)）]+?)[）)]\s*"              # group 1: Chinese name
     r"(?:x\d+)?\s*"                         # optional quantity marker (e.g. x2, x3)
-    r"(光|暗|炎|水|風|地)\s*"               # group 2: Attribute (0+ spaces — may be adjacent)
+    r"(" + _ATTRIBUTES + r")\s*"            # group 2: Attribute (0+ spaces — may be adjacent)
     r"(\d+)[星☆]\s*"                       # group 3: Level
     r"([^\d/\s(（]+)(?:/\s*([^\s(（]+))?\s*"  # group 4: type abbrev, group 5: race (opt)
     r"(\d+|\?)\s+(\d+|\?)"                  # group 6: ATK, group 7: DEF
 )
 
-# Abbreviated card type → full type keyword
-_COMPACT_TYPE_MAP = {
-    "通常": "通常怪獸",
-    "效果": "效果怪獸",
-    "融合": "融合怪獸",
-    "儀式": "儀式怪獸",
-    "巨極": "巨極/效果怪獸",
-}
-
 CONDITION_RE = re.compile(r"條件[:：]\s*(.+)")
 EFFECT_RE = re.compile(r"^效果[:：]\s*(.+)", re.DOTALL)
 CONTINUOUS_EFFECT_RE = re.compile(r"永續效果[:：]\s*(.+)", re.DOTALL)
@@ -108,6 +106,13 @@ CONTINUOUS_EFFECT_RE = re.compile(r"永續效果[:：]\s*(.+)", re.DOTALL)
 # "永續效果:" — "永續效果" is matched as a whole unit instead.
 _LABEL_SPLIT_RE = re.compile(r"(?=(?:條件|永續效果|(?<!永續)效果)[:：])")
 
+# Long edge in px of the card image recorded as image_url / image_file
+IMAGE_SIZE = 800
+# googleusercontent size suffix ("=s800", "=s1600-rw") and the older
+# Blogger path segment (".../s1600/KP01-001.jpg")
+_IMAGE_SIZE_SUFFIX_RE = re.compile(r"=s\d+(-[a-z]+)?$")
+_IMAGE_SIZE_SEGMENT_RE = re.compile(r"/s\d+(-[a-z]+)?(/[^/]+)$")
+
 # Product type mapping from set ID prefix
 PRODUCT_TYPE_MAP = {
     "KP": "booster",
@@ -147,22 +152,149 @@ MULTI_DECK_URLS: frozenset[str] = frozenset({
 })
 
 
+PARSER_BACKENDS = ("lxml", "bs4")
+DEFAULT_BACKEND = "lxml"
+
+# A post body as produced by either backend
+PostBody = Union[Tag, etree._Element]
+
+# Elements whose contents never become chunks
+_SKIP_TAGS = frozenset({"script", "style", "noscript"})
+# Elements whose text BeautifulSoup stores as special string types that
+# get_text() leaves out, unless called on the element itself
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+# Elements inside which BeautifulSoup keeps whitespace-only strings verbatim
+_PRESERVE_WS_TAGS = frozenset({"pre", "textarea"})
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def _class_xpath(tag: str, class_name: str) -> etree.XPath:
+    return etree.XPath(
+        f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+    )
+
+
+_POST_BODY_XPATH = _class_xpath("*", "post-body")
+_POST_TITLE_XPATH = _class_xpath("h3", "post-title")
+_TITLE_XPATH = etree.XPath("//title")
+
+# Opening tag of the post-body div in raw page HTML, and any div tag after it
+# The opening tag of a div whose class list has the whole token "post-body"
+# (not e.g. "post-body-container" or "x-post-body")
+_POST_BODY_OPEN_RE = re.compile(
+    r"""<div\b[^>]*?(?<![\w-])class\s*=\s*"""
+    r"""(?:"(?:[^"]*\s)?post-body(?=[\s"])|'(?:[^']*\s)?post-body(?=[\s']))[^>]*>""",
+    re.IGNORECASE,
+)
+_DIV_TAG_RE = re.compile(r"<(/?)div\b[^>]*?(/?)>", re.IGNORECASE)
+
+
 def compute_content_hash(html: str) -> str:
     """Compute a hash of the post body HTML for change detection."""
     return hashlib.sha256(html.encode("utf-8")).hexdigest()[:16]
 
 
-def extract_post_body(html: str) -> Optional[Tag]:
+def _raw_post_body(html: str) -> Optional[str]:
+    """Slice the post-body div out of the raw page HTML without parsing it.
+
+    Balances <div>/</div> tags from the post-body opening tag. Returns None
+    if the opening tag is not found or the divs never balance.
+    """
+    m = _POST_BODY_OPEN_RE.search(html)
+    if not m:
+        return None
+    depth = 1
+    for tag in _DIV_TAG_RE.finditer(html, m.end()):
+        if tag.group(2):  # self-closing <div/>
+            continue
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[m.start():tag.end()]
+    return None
+
+
+class PostDocument:
+    """A blog post page, parsed at most once and shared by every step.
+
+    Hashing, title extraction, metadata parsing and card extraction all read
+    from the same instance. ``content_hash`` works on the raw post-body
+    bytes, so an unchanged post is detected without building the tree.
+
+    ``backend`` selects the tree: "lxml" (default, fast) or "bs4"
+    (BeautifulSoup, the original implementation). ``body`` is an lxml
+    element or a bs4 Tag accordingly.
+    """
+
+    def __init__(self, html: str, backend: Optional[str] = None):
+        backend = backend or DEFAULT_BACKEND
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend {backend!r} (choose from {', '.join(PARSER_BACKENDS)})"
+            )
+        self.html = html
+        self.backend = backend
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "lxml")
+
+    @cached_property
+    def tree(self) -> Optional[etree._Element]:
+        # Feed the text like BeautifulSoup's lxml builder does, so both
+        # backends see the same libxml2 parse
+        html_parser = etree.HTMLParser()
+        html_parser.feed(self.html)
+        return html_parser.close()
+
+    @cached_property
+    def body(self) -> Optional[PostBody]:
+        if self.backend == "bs4":
+            return self.soup.select_one(".post-body")
+        if self.tree is None:
+            return None
+        found = _POST_BODY_XPATH(self.tree)
+        return found[0] if found else None
+
+    @cached_property
+    def body_text(self) -> str:
+        if self.body is None:
+            return ""
+        if self.backend == "bs4":
+            return self.body.get_text()
+        return "".join(_lxml_strings(self.body))
+
+    @cached_property
+    def title(self) -> str:
+        if self.backend == "bs4":
+            title_el = self.soup.select_one("h3.post-title") or self.soup.select_one("title")
+            return title_el.get_text(strip=True) if title_el else ""
+        if self.tree is None:
+            return ""
+        found = _POST_TITLE_XPATH(self.tree) or _TITLE_XPATH(self.tree)
+        return "".join(_lxml_strings(found[0], strip=True)) if found else ""
+
+    @cached_property
+    def content_hash(self) -> Optional[str]:
+        """Hash of the raw post-body HTML, or None if the page has no post body."""
+        raw_body = _raw_post_body(self.html)
+        if raw_body is None:
+            # Unusual markup: fall back to the serialized bs4 tree, whatever
+            # the backend, so hashes don't change when switching backends
+            body = self.soup.select_one(".post-body")
+            if body is None:
+                return None
+            raw_body = str(body)
+        return compute_content_hash(raw_body)
+
+
+def extract_post_body(html: str) -> Optional[PostBody]:
     """Extract the post-body div from full page HTML."""
-    soup = BeautifulSoup(html, "lxml")
-    return soup.select_one(".post-body")
+    return PostDocument(html).body
 
 
 def extract_post_title(html: str) -> str:
     """Extract the post title."""
-    soup = BeautifulSoup(html, "lxml")
-    title_el = soup.select_one("h3.post-title") or soup.select_one("title")
-    return title_el.get_text(strip=True) if title_el else ""
+    return PostDocument(html).title
 
 
 def guess_product_type(set_id: str) -> str:
@@ -172,21 +304,24 @@ def guess_product_type(set_id: str) -> str:
     return "unknown"
 
 
-def parse_post_multi(html: str, url: str = "") -> list[CardSet]:
+def parse_post_multi(html: Union[str, PostDocument], url: str = "") -> list[CardSet]:
     """Parse a blog post HTML into one or more CardSets.
 
     Most posts contain a single card set and return a one-element list.
     Posts listed in MULTI_DECK_URLS contain multiple card sets: cards are
     grouped by set ID (inferred from each card's card_id) and a separate
     CardSet is returned for each group.
+
+    ``html`` may be an already-built PostDocument to avoid parsing twice.
     """
-    post_body = extract_post_body(html)
-    if not post_body:
+    doc = html if isinstance(html, PostDocument) else PostDocument(html)
+    post_body = doc.body
+    if post_body is None:
         logger.warning(f"No post-body found in {url}")
         return []
 
-    title = extract_post_title(html)
-    body_text = post_body.get_text()
+    title = doc.title
+    body_text = doc.body_text
 
     all_card_ids = CARD_ID_RE.findall(body_text)
     if not all_card_ids:
@@ -199,7 +334,7 @@ def parse_post_multi(html: str, url: str = "") -> list[CardSet]:
         return []
 
     set_name_jp, set_name_zh, release_date, rarity_dist = _parse_set_metadata(
-        post_body, title
+        body_text, title
     )
 
     # Exception: multi-deck posts — split cards by set ID
@@ -252,7 +387,7 @@ def parse_post_multi(html: str, url: str = "") -> list[CardSet]:
     return [card_set]
 
 
-def parse_post(html: str, url: str = "") -> Optional[CardSet]:
+def parse_post(html: Union[str, PostDocument], url: str = "") -> Optional[CardSet]:
     """Parse a blog post HTML into a CardSet with cards.
 
     For multi-deck posts (see MULTI_DECK_URLS) only the first CardSet is
@@ -263,9 +398,8 @@ def parse_post(html: str, url: str = "") -> Optional[CardSet]:
 
 
 def _parse_set_metadata(
-    post_body: Tag, title: str
+    text: str, title: str
 ) -> tuple[str, str, Optional[str], dict]:
-    text = post_body.get_text()
     set_name_jp = ""
     set_name_zh = title
     release_date = None
@@ -289,7 +423,7 @@ def _parse_set_metadata(
     return set_name_jp, set_name_zh, release_date, rarity_dist
 
 
-def _extract_cards_from_body(post_body: Tag) -> list[Card]:
+def _extract_cards_from_body(post_body: PostBody) -> list[Card]:
     """Extract cards using a text-based approach.
 
     Strategy:
@@ -386,13 +520,22 @@ def _extract_cards_from_body(post_body: Tag) -> list[Card]:
     return cards
 
 
-def _flatten_to_chunks(post_body: Tag) -> list[dict]:
+def _flatten_to_chunks(post_body: PostBody) -> list[dict]:
     """Flatten the post body into a flat list of text lines and images.
 
     Returns list of dicts:
       {"type": "text", "text": "..."} or
       {"type": "image", "url": "..."}
+
+    Accepts a bs4 Tag or an lxml element; both yield the same chunks.
     """
+    if isinstance(post_body, Tag):
+        return _flatten_bs4(post_body)
+    return _flatten_lxml(post_body)
+
+
+def _flatten_bs4(post_body: Tag) -> list[dict]:
+    """Recursive walker over the BeautifulSoup tree (fallback backend)."""
     chunks: list[dict] = []
 
     def walk(el):
@@ -443,6 +586,125 @@ def _flatten_to_chunks(post_body: Tag) -> list[dict]:
     return chunks
 
 
+def _flatten_lxml(post_body: etree._Element) -> list[dict]:
+    """Single-pass iterative equivalent of _flatten_bs4 over an lxml tree.
+
+    lxml keeps text in ``.text`` / ``.tail`` instead of string nodes, so each
+    element's children are expanded to the sequence BeautifulSoup would show
+    (text, child, child tail, ...). Leaf detection only looks at direct
+    children, which keeps the walk linear instead of re-reading every
+    subtree with get_text() and find_all().
+    """
+    chunks: list[dict] = []
+    # (node, inside an element whose strings bs4's get_text() skips)
+    stack: list[tuple[Union[str, etree._Element], bool]] = [(post_body, False)]
+
+    while stack:
+        node, hidden = stack.pop()
+
+        if isinstance(node, str):
+            text = node.strip()
+            if text:
+                chunks.append({"type": "text", "text": text})
+            continue
+
+        tag = node.tag
+        if not isinstance(tag, str):
+            # bs4 keeps comments as strings, so they are emitted like text
+            if tag is etree.Comment:
+                text = (node.text or "").strip()
+                if text:
+                    chunks.append({"type": "text", "text": text})
+            continue
+
+        if tag in _SKIP_TAGS:
+            continue
+
+        if tag == "img":
+            src = node.get("src", "") or node.get("data-src", "")
+            if src and "googleusercontent" in src:
+                chunks.append({"type": "image", "url": src})
+            continue
+
+        if tag == "br":
+            continue
+
+        if node.text is None and len(node) == 0:
+            continue
+
+        # Leaf: only strings, comments and <br> inside -> one chunk
+        if not any(isinstance(c.tag, str) and c.tag != "br" for c in node):
+            # bs4's get_text() only counts the leaf's strings if they are
+            # ordinary text or of the leaf's own special type
+            if tag in _NON_TEXT_TAGS or not hidden:
+                all_text = "".join(
+                    t.strip() for t in _leaf_strings(node) if t and t.strip()
+                )
+                if all_text:
+                    chunks.append({"type": "text", "text": all_text})
+                    continue
+
+        inner_hidden = hidden or tag in _NON_TEXT_TAGS
+        items: list[tuple[Union[str, etree._Element], bool]] = []
+        if node.text:
+            items.append((node.text, inner_hidden))
+        for child in node:
+            items.append((child, inner_hidden))
+            if child.tail:
+                items.append((child.tail, inner_hidden))
+        stack.extend(reversed(items))
+
+    return chunks
+
+
+def _leaf_strings(node: etree._Element) -> Iterator[Optional[str]]:
+    """Direct strings of an element whose only children are <br>/comments."""
+    yield node.text
+    for child in node:
+        yield child.tail
+
+
+def _lxml_strings(root: etree._Element, strip: bool = False) -> Iterator[str]:
+    """Yield the strings BeautifulSoup's ``get_text()`` would join for ``root``.
+
+    Comments and text inside script/style/template/rt/rp are skipped, and
+    whitespace-only strings outside pre/textarea are collapsed to a single
+    newline or space, matching bs4's lxml tree builder.
+    """
+    hidden = any(a.tag in _NON_TEXT_TAGS for a in root.iterancestors())
+    preserve = any(a.tag in _PRESERVE_WS_TAGS for a in root.iterancestors())
+    stack: list[tuple[Union[str, etree._Element], bool, bool]] = [(root, hidden, preserve)]
+
+    while stack:
+        node, hidden, preserve = stack.pop()
+
+        if isinstance(node, str):
+            if hidden:
+                continue
+            if strip:
+                node = node.strip()
+                if node:
+                    yield node
+            elif not preserve and not node.strip(_ASCII_SPACES):
+                yield "\n" if "\n" in node else " "
+            else:
+                yield node
+            continue
+
+        tag = node.tag
+        if not isinstance(tag, str):  # comment / processing instruction
+            continue
+        inner = (hidden or tag in _NON_TEXT_TAGS, preserve or tag in _PRESERVE_WS_TAGS)
+        items: list[tuple[Union[str, etree._Element], bool, bool]] = []
+        if node.text:
+            items.append((node.text, *inner))
+        for child in node:
+            items.append((child, *inner))
+            if child.tail:
+                items.append((child.tail, *inner))
+        stack.extend(reversed(items))
+
+
 def _is_detail_entry(chunks: list[dict], idx: int) -> bool:
     """Check if a card ID at chunks[idx] is a detail entry (not summary).
 
@@ -453,16 +715,8 @@ def _is_detail_entry(chunks: list[dict], idx: int) -> bool:
     header_text = chunks[idx]["text"]
 
     # Check inline stats (same line as card ID)
-    # Compound types listed first so they match before simple types
-    card_type_keywords = [
-        "儀式/效果怪獸", "融合/效果怪獸", "巨極/效果怪獸",
-        "通常怪獸", "效果怪獸", "融合怪獸", "儀式怪獸",
-        "儀式魔法", "通常魔法", "速攻魔法", "永續魔法", "裝備魔法", "場地魔法",
-        "通常陷阱", "永續陷阱", "反擊陷阱",
-    ]
-    for kw in card_type_keywords:
-        if kw in header_text:
-            return True
+    if CARD_TYPE_MATCHER.search(header_text):
+        return True
 
     # Check compact inline stats format (e.g. SD reprints):
     # "(ChName) Attr N星 TypeAbbrev/RaceAbbrev ATK DEF"
@@ -489,9 +743,8 @@ def _is_detail_entry(chunks: list[dict], idx: int) -> bool:
         # If we hit another card ID, this is summary
         if CARD_ID_RE.search(text):
             return False
-        for kw in card_type_keywords:
-            if kw in text:
-                return True
+        if CARD_TYPE_MATCHER.search(text):
+            return True
         checked += 1
         if checked >= 3:
             break
@@ -501,13 +754,27 @@ def _is_detail_entry(chunks: list[dict], idx: int) -> bool:
 
 def _normalize_image_url(url: str) -> str:
     """Normalize blogger/googleusercontent image URLs for high resolution."""
-    url = re.sub(r"=w\d+-h\d+", "=s800", url)
-    url = re.sub(r"=s\d+(-[a-z]+)?$", "=s800", url)
+    url = re.sub(r"=w\d+-h\d+", f"=s{IMAGE_SIZE}", url)
+    url = _IMAGE_SIZE_SUFFIX_RE.sub(f"=s{IMAGE_SIZE}", url)
     if "googleusercontent.com" in url and "=s" not in url and "=w" not in url:
-        url = url.rstrip("/") + "=s800"
+        url = url.rstrip("/") + f"=s{IMAGE_SIZE}"
     return url
 
 
+def resize_image_url(url: str, size: int) -> Optional[str]:
+    """The same image scaled by the image host to ``size`` px on its long edge.
+
+    googleusercontent (and the older Blogger image hosts) resize on their
+    side, so every size is just a different URL. Returns None for URLs
+    without a size parameter to rewrite.
+    """
+    if _IMAGE_SIZE_SUFFIX_RE.search(url):
+        return _IMAGE_SIZE_SUFFIX_RE.sub(f"=s{size}", url)
+    if _IMAGE_SIZE_SEGMENT_RE.search(url):
+        return _IMAGE_SIZE_SEGMENT_RE.sub(rf"/s{size}\2", url)
+    return None
+
+
 def _parse_card_header(header_text: str, card_id: str) -> Card:
     """Parse card ID, rarity, and JP name from header text."""
     rarity = "N"
@@ -603,9 +870,9 @@ def _parse_card_details(
             card.level = int(m.group(3))
             type_abbrev = m.group(4)
             race_abbrev = m.group(5)
-            if type_abbrev in _COMPACT_TYPE_MAP:
+            if type_abbrev in COMPACT_TYPE_MAP:
                 # e.g. "儀式/魔法使" → 儀式怪獸 + 魔法使族
-                card.card_type = _COMPACT_TYPE_MAP[type_abbrev]
+                card.card_type = COMPACT_TYPE_MAP[type_abbrev]
                 if race_abbrev:
                     card.monster_type = (
                         race_abbrev if race_abbrev.endswith("族") else race_abbrev + "族"
@@ -635,6 +902,9 @@ def _parse_card_details(
                         if jp_name:
                             card.name_jp = jp_name
 
+    # Stats were assigned after construction, so intern them now
+    card.intern_fields()
+
     # Parse condition, effect, continuous effect, and summon condition.
     #
     # Context lines after the stats line may contain:
@@ -0,0 +1,270 @@
+"""Per-host request rate limiting shared by concurrent fetchers.
+
+``AdaptiveRateLimiter`` adjusts each host's rate to how the host responds
+(additive increase, multiplicative decrease): every fast, successful
+response raises the rate a little, up to a ceiling; a 429, a 5xx, a
+timeout or a connection error cuts it, and a ``Retry-After`` header also
+holds back every request to that host for as long as it asks.
+``AdaptiveRateLimiter.get()`` wraps a request in this feedback loop and
+retries transient failures with jittered exponential backoff.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: the host is overloaded or briefly unavailable
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 1.0  # seconds; retry n waits 0.5-1x BACKOFF_BASE * 2**n
+BACKOFF_CAP = 60.0
+MAX_RETRY_AFTER = 300.0
+SLOW_RESPONSE = 2.0  # seconds; slower responses stop the rate from rising
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    ``acquire()`` reserves one token and sleeps until it becomes available.
+    Tokens may be reserved ahead of time (the balance goes negative), so
+    concurrent callers are queued fairly instead of busy-waiting.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until available. Returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def set_rate(self, rate: float) -> None:
+        """Change the rate; tokens accrued so far are kept."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def pause(self, seconds: float) -> None:
+        """Make the next token available no sooner than ``seconds`` from now."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, so a single budget applies to each site."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Wait for the request budget of ``url``'s host. Returns seconds waited."""
+        return self.bucket(url).acquire()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    """Per-host token buckets whose rates follow each host's health (AIMD).
+
+    Hosts start at ``rate`` requests/s. A successful response faster than
+    SLOW_RESPONSE adds ``increase`` to the host's rate, up to ``max_rate``;
+    a failure multiplies it by ``decrease``, down to ``min_rate``. Client
+    errors such as 404 leave the rate alone.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_rate: Optional[float] = None,
+        min_rate: float = 0.1,
+        burst: float = 1.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        retries: int = DEFAULT_RETRIES,
+    ):
+        self.max_rate = max(max_rate or rate, min_rate)
+        super().__init__(min(max(rate, min_rate), self.max_rate), burst)
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.retries = retries
+        # host → {"requests", "retries", "backoffs", "first", "last"}
+        self._stats: dict[str, dict] = {}
+
+    def _host_stats(self, url: str) -> dict:
+        host = urlsplit(url).netloc
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = {"requests": 0, "retries": 0, "backoffs": 0, "first": None, "last": None}
+            self._stats[host] = stats
+        return stats
+
+    def record(
+        self,
+        url: str,
+        ok: Optional[bool],
+        elapsed: float,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Feed back one response: ok=True success, False failure, None neutral."""
+        bucket = self.bucket(url)
+        now = time.monotonic()
+        with self._lock:
+            stats = self._host_stats(url)
+            stats["requests"] += 1
+            stats["first"] = stats["first"] or now
+            stats["last"] = now
+            if ok is False:
+                stats["backoffs"] += 1
+                bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease))
+            elif ok and elapsed <= SLOW_RESPONSE and bucket.rate < self.max_rate:
+                bucket.set_rate(min(self.max_rate, bucket.rate + self.increase))
+            if retry_after:
+                bucket.pause(retry_after)
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        metrics=None,
+        wait_stage: str = "rate_limit_wait",
+        request_stage: Optional[str] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """``session.get(url, **kwargs)`` within the host's budget, with retries.
+
+        Retries RETRY_STATUSES responses, timeouts and connection errors up
+        to ``retries`` times; after the last attempt the failing response is
+        returned (for the caller's ``raise_for_status()``) or the error
+        re-raised. With ``metrics`` (a RunMetrics), time spent waiting is
+        added to ``wait_stage``, the requests themselves to
+        ``request_stage``, and retries are counted as "http_retries".
+        """
+        attempt = 0
+        while True:
+            waited = self.acquire(url)
+            if metrics is not None:
+                metrics.add_time(wait_stage, waited)
+            start = time.monotonic()
+            try:
+                resp = session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.record(url, False, time.monotonic() - start)
+                if attempt == self.retries:
+                    raise
+                reason, retry_after = str(e), None
+            else:
+                elapsed = time.monotonic() - start
+                if metrics is not None and request_stage:
+                    metrics.add_time(request_stage, elapsed)
+                if resp.status_code not in RETRY_STATUSES:
+                    self.record(url, resp.status_code < 400, elapsed)
+                    return resp
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                self.record(url, False, elapsed, retry_after)
+                if attempt == self.retries:
+                    return resp
+                resp.close()
+                reason = f"HTTP {resp.status_code}"
+
+            with self._lock:
+                self._host_stats(url)["retries"] += 1
+            if metrics is not None:
+                metrics.count("http_retries")
+            # With Retry-After the bucket is paused; the next acquire() waits
+            delay = 0.0 if retry_after else _backoff(attempt)
+            logger.info(
+                f"Retrying {url} ({reason}) in {retry_after or delay:.1f}s "
+                f"[{attempt + 1}/{self.retries}]"
+            )
+            if delay:
+                time.sleep(delay)
+                if metrics is not None:
+                    metrics.add_time(wait_stage, delay)
+            attempt += 1
+
+    def summary(self) -> dict[str, dict]:
+        """Per-host requests, retries, backoffs, current and achieved rate."""
+        with self._lock:
+            out = {}
+            for host, stats in sorted(self._stats.items()):
+                span = stats["last"] - stats["first"] if stats["first"] else 0.0
+                bucket = self._buckets.get(host)
+                out[host] = {
+                    "requests": stats["requests"],
+                    "retries": stats["retries"],
+                    "backoffs": stats["backoffs"],
+                    "rate": round(bucket.rate, 2) if bucket else None,
+                    "achieved_rps": (
+                        round((stats["requests"] - 1) / span, 2)
+                        if stats["requests"] > 1 and span > 0 else None
+                    ),
+                }
+            return out
+
+    def reset_stats(self) -> None:
+        """Start counting a new run; learned rates are kept."""
+        with self._lock:
+            self._stats = {}
+
+
+def _backoff(attempt: int) -> float:
+    """Jittered exponential backoff before retry ``attempt + 1``."""
+    return random.uniform(0.5, 1.0) * min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
@@ -0,0 +1,218 @@
+"""Offline replay of the blog and its card images, for end-to-end benchmarks.
+
+``ReplayServer`` serves what earlier runs recorded in a data directory (the
+feed / listing pages and posts in ``snapshots/``, the images in
+``image_store/``) over local HTTP, so ``scrape-all``, ``update`` and
+``check`` can run against it without touching the live sites::
+
+    rd-scrape --data-dir data replay --port 8800 --latency-ms 80 --error-rate 0.02
+    rd-scrape --data-dir /tmp/bench --base-url http://127.0.0.1:8800 scrape-all
+
+With ``--base-url`` the scraper keeps the real URLs everywhere (scrape
+state, MULTI_DECK_URLS, ``image_url``); ``RoutedSession`` only changes
+where each request is sent. Blog URLs go to ``<base-url><path>`` and other
+hosts (card images) to ``<base-url>/_host/<host><path>``, which the server
+maps back to the recorded URL.
+
+Responses carry the content hash as ETag and answer a matching
+If-None-Match with 304, like the blog does, so warm ``update`` runs
+exercise conditional requests. Every response is delayed by ``latency``
+plus up to ``jitter`` seconds, and a fraction ``error_rate`` of requests
+gets a 503 or a 429 with Retry-After, to load-test the adaptive limiter.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .imagestore import IMAGE_STORE_DIR, ImageStore
+from .snapshots import SNAPSHOT_DIR, SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLAY_PORT = 8800
+REPLAY_HOST_PREFIX = "/_host/"  # /_host/<host>/<path> replays https://<host>/<path>
+
+_CONTENT_TYPES = {"feed": "application/atom+xml"}
+
+
+def route_url(url: str, base_url: str, origin: str) -> str:
+    """Where to send a request for ``url`` when ``origin`` is served at ``base_url``."""
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    base_url = base_url.rstrip("/")
+    if parts.netloc == urlsplit(origin).netloc:
+        return base_url + path
+    return f"{base_url}{REPLAY_HOST_PREFIX}{parts.netloc}{path}"
+
+
+def recorded_urls(path: str, origin: str) -> list[str]:
+    """The recorded URLs a replay request path may stand for (inverse of route_url)."""
+    if path.startswith(REPLAY_HOST_PREFIX):
+        rest = path[len(REPLAY_HOST_PREFIX):]
+        return [f"https://{rest}", f"http://{rest}"]
+    netloc = urlsplit(origin).netloc
+    return [f"https://{netloc}{path}", f"http://{netloc}{path}"]
+
+
+class RoutedSession(requests.Session):
+    """A session that sends every request to ``base_url`` (see route_url)."""
+
+    def __init__(self, base_url: str, origin: str):
+        super().__init__()
+        self.base_url = base_url
+        self.origin = origin
+
+    def request(self, method, url, *args, **kwargs):
+        return super().request(
+            method, route_url(url, self.base_url, self.origin), *args, **kwargs
+        )
+
+
+class ReplayServer:
+    """Serve a data directory's recorded pages and images over HTTP.
+
+    Use as a context manager (serving from a background thread) or call
+    ``serve_forever()``. ``stats`` counts requests, 200s, 304s, 404s and
+    injected errors.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        origin: str,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_REPLAY_PORT,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.origin = origin
+        self.snapshots = SnapshotStore(data_dir / SNAPSHOT_DIR)
+        self.images = ImageStore(data_dir / IMAGE_STORE_DIR)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # recorded URL → (body, content type, etag); pages are decompressed once
+        self._cache: dict[str, tuple[bytes, str, str]] = {}
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "not_found": 0, "errors": 0}
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lookup(self, path: str) -> Optional[tuple[bytes, str, str]]:
+        """(body, content type, etag) recorded for a request path, or None."""
+        for url in recorded_urls(path, self.origin):
+            with self._lock:
+                cached = self._cache.get(url)
+            if cached is not None:
+                return cached
+            entry = self.snapshots.latest(url)
+            if entry is not None:
+                body = self.snapshots.get(entry["hash"])
+                if body is None:
+                    continue
+                content_type = _CONTENT_TYPES.get(entry["kind"], "text/html")
+                found = (
+                    body,
+                    f"{content_type}; charset={entry.get('encoding') or 'utf-8'}",
+                    entry["hash"],
+                )
+                with self._lock:
+                    self._cache[url] = found
+                return found
+            image = self.images.lookup(url)
+            if image is not None:
+                # Images are not cached in memory; the object name is the hash
+                return image.read_bytes(), "image/jpeg", image.stem
+        return None
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _delay_and_fault(self) -> Optional[int]:
+        """Sleep the configured latency; returns an injected error status, if any."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+            status = self._random.choice((429, 503))
+        if delay > 0:
+            time.sleep(delay)
+        return status if roll < self.error_rate else None
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real hosts
+
+            def log_message(self, format, *args):
+                logger.debug(f"replay: {format % args}")
+
+            def _reply(self, status: int, body: bytes = b"", headers: Optional[dict] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body and self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                error = server._delay_and_fault()
+                if error is not None:
+                    server._count("errors")
+                    self._reply(error, headers={"Retry-After": "1"} if error == 429 else None)
+                    return
+                found = server.lookup(self.path)
+                if found is None:
+                    server._count("not_found")
+                    self._reply(404)
+                    return
+                body, content_type, etag = found
+                etag = f'"{etag}"'
+                if self.headers.get("If-None-Match") == etag:
+                    server._count("not_modified")
+                    self._reply(304, headers={"ETag": etag})
+                    return
+                server._count("ok")
+                self._reply(200, body, {"Content-Type": content_type, "ETag": etag})
+
+            do_HEAD = do_GET
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def __enter__(self) -> ReplayServer:
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="replay-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
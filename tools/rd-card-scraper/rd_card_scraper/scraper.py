@@ -2,23 +2,119 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import queue
+import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
 
 import requests
 
-from .discovery import discover_rd_posts
-from .downloader import download_images, sanitize_filename
-from .models import CardSet, PostState, ScrapeState
-from .parser import compute_content_hash, extract_post_body, parse_post, parse_post_multi
+from .catalog import build_catalog, catalog_is_current
+from .diff import diff_card_sets, set_delta, write_delta
+from .discovery import BLOG_BASE, discover_rd_posts
+from .downloader import (
+    DEFAULT_DELAY as IMAGE_DELAY,
+    DEFAULT_IMAGE_RPS,
+    DEFAULT_IMAGE_SIZES,
+    PARTIAL_SUFFIX,
+    VALIDATOR_SUFFIX,
+    discard_partial,
+    download_images,
+    image_file_of,
+    image_relative_path,
+    mount_connection_pool,
+    sanitize_filename,
+    set_image_file,
+)
+from .httpcache import conditional_headers, is_not_modified, response_validators
+from .imagestore import IMAGE_STORE_DIR, ImageStore
+from .inventory import (
+    DEFAULT_VERIFY_WORKERS,
+    IMAGE_INVENTORY_FILE,
+    ImageInventory,
+    image_files,
+)
+from .metrics import RunMetrics, write_run_report
+from .models import (
+    CARD_FIELDS,
+    CardSet,
+    DiscoveryCache,
+    PostState,
+    RunCheckpoint,
+    ScrapeState,
+    SetManifest,
+    write_text_atomic,
+)
+from .parser import DEFAULT_BACKEND, PostDocument, parse_post_multi, resize_image_url
+from .ratelimit import AdaptiveRateLimiter
+from .replay import RoutedSession
+from .snapshots import SNAPSHOT_DIR, SnapshotStore
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_DATA_DIR = Path("data")
 STATE_FILE = "scrape_state.json"
-FETCH_DELAY = 1.5  # seconds between page fetches
+DISCOVERY_CACHE_FILE = "discovery_cache.json"
+MANIFEST_FILE = "manifest.json"
+CHECKPOINT_FILE = "run_checkpoint.json"
+LAST_CHANGED_FILE = "last_changed.json"
+DEFAULT_WATCH_INTERVAL = 900.0  # seconds between watch runs
+FETCH_DELAY = 1.5  # initial seconds between page fetches; adapts (ratelimit.py)
+DEFAULT_MAX_RPS = 2.0  # per-host request ceiling for the blog
+
+# Sentinel closing each pipeline queue
+_DONE = object()
+
+
+@dataclass
+class _ParsedPost:
+    """A fetched post on its way through the pipeline.
+
+    ``outcome`` is None while the post still has card sets to save, or the
+    final result ("skipped" / "not_modified") when change detection
+    short-circuited it.
+    """
+
+    url: str
+    content_hash: str = ""
+    card_sets: list[CardSet] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    outcome: Optional[str] = None
+    fetched_at: Optional[str] = None  # when the request went out, ISO (UTC)
+
+
+def _parse_snapshot(
+    snapshots: SnapshotStore, url: str, backend: str
+) -> Optional[list[CardSet]]:
+    """Parse the latest snapshot of ``url``. Returns None if there is none."""
+    html = snapshots.latest_text(url)
+    if html is None:
+        return None
+    return parse_post_multi(PostDocument(html, backend=backend), url)
+
+
+# Per-process state of reparse workers (set by _init_reparse_worker)
+_worker_snapshots: Optional[SnapshotStore] = None
+_worker_backend: str = DEFAULT_BACKEND
+
+
+def _init_reparse_worker(snapshot_root: Path, backend: str) -> None:
+    global _worker_snapshots, _worker_backend
+    _worker_snapshots = SnapshotStore(snapshot_root)
+    _worker_backend = backend
+
+
+def _reparse_worker(url: str) -> Optional[list[CardSet]]:
+    return _parse_snapshot(_worker_snapshots, url, _worker_backend)
 
 
 class RushDuelScraper:
@@ -27,45 +123,339 @@ class RushDuelScraper:
         data_dir: Path = DEFAULT_DATA_DIR,
         download_images_flag: bool = True,
         force: bool = False,
+        workers: int = 1,
+        max_rps: float = DEFAULT_MAX_RPS,
+        image_workers: int = 1,
+        image_rps: float = DEFAULT_IMAGE_RPS,
+        image_sizes: Optional[dict[str, int]] = None,
+        parser_backend: str = DEFAULT_BACKEND,
+        base_url: Optional[str] = None,
     ):
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.download_images_flag = download_images_flag
         self.force = force
+        self.workers = max(1, workers)
+        # Sequential runs start at the polite FETCH_DELAY pace, concurrent
+        # ones at the requested budget; both adapt to the host from there.
+        self.rate_limiter = AdaptiveRateLimiter(
+            1.0 / FETCH_DELAY if self.workers == 1 else max_rps, max_rate=max_rps
+        )
+        self.image_workers = max(1, image_workers)
+        self.image_limiter = AdaptiveRateLimiter(
+            1.0 / IMAGE_DELAY if self.image_workers == 1 else image_rps,
+            max_rate=image_rps,
+            burst=self.image_workers,
+        )
+        # Extra image sizes fetched besides the primary one (downloader.py)
+        self.image_sizes = DEFAULT_IMAGE_SIZES if image_sizes is None else image_sizes
+        self.parser_backend = parser_backend
         self.state = ScrapeState.load(data_dir / STATE_FILE)
-        self.session = requests.Session()
+        self.discovery_cache = DiscoveryCache.load(data_dir / DISCOVERY_CACHE_FILE)
+        self.snapshots = SnapshotStore(data_dir / SNAPSHOT_DIR)
+        self.image_store = ImageStore(data_dir / IMAGE_STORE_DIR)
+        self.image_inventory = ImageInventory(data_dir / IMAGE_INVENTORY_FILE)
+        self.manifest = SetManifest.load(data_dir / MANIFEST_FILE)
+        self._sets_written = 0
+        # set_id → (cards.json before this run's first write, latest saved version)
+        self._run_changes: dict[str, tuple[Optional[CardSet], CardSet]] = {}
+        self.last_delta: Optional[Path] = None
+        self.last_changed: Optional[dict] = None
+        self.checkpoint: Optional[RunCheckpoint] = None
+        self._checkpoint_lock = threading.Lock()  # posts are fetched in pipeline threads
+        self.check_stats: dict = {}
+        self.metrics = RunMetrics()
+        self.last_report: Optional[dict] = None
+        # Offline runs send every request to e.g. a replay server (replay.py)
+        self.base_url = base_url
+        self.session = RoutedSession(base_url, BLOG_BASE) if base_url else requests.Session()
         self.session.headers["User-Agent"] = (
             "Mozilla/5.0 (compatible; RD-Card-Scraper/0.1)"
         )
+        self.session.hooks["response"].append(
+            lambda resp, *args, **kwargs: self.metrics.observe_response(resp)
+        )
+        if self.workers > 1 or self.image_workers > 1:
+            # Keep one pooled keep-alive connection per concurrent fetcher
+            mount_connection_pool(self.session, max(self.workers, self.image_workers))
 
     def save_state(self) -> None:
+        """Compact the state: rewrite scrape_state.json and clear the journal."""
         self.state.save(self.data_dir / STATE_FILE)
 
-    def scrape_all(self, **discover_kwargs) -> dict:
+    def compact_state(self) -> int:
+        """Compact the state on demand. Returns the number of journal records folded in."""
+        journal_records = self.state.journal_size(self.data_dir / STATE_FILE)
+        self.save_state()
+        return journal_records
+
+    def save_set(self, card_set: CardSet) -> bool:
+        """Write a set's cards.json unless its content hash is unchanged.
+
+        The manifest decides without reading the file back. Returns True if
+        the set changed and was written. The version it replaced is kept for
+        the run's delta file. A file that already matches (the manifest was
+        behind) is only recorded in the manifest, with its mtime.
+        """
+        content_hash = card_set.content_hash()
+        data_file = self.data_dir / card_set.set_id / "cards.json"
+        if self.manifest.is_current(card_set.set_id, content_hash) and data_file.exists():
+            logger.debug(f"Set {card_set.set_id} unchanged, not rewriting cards.json")
+            return False
+        if card_set.set_id in self._run_changes:
+            previous = self._run_changes[card_set.set_id][0]
+        else:
+            previous = CardSet.load(self.data_dir, card_set.set_id)
+        if not card_set.save(self.data_dir):
+            logger.debug(f"Set {card_set.set_id} already up to date in cards.json")
+            self.manifest.record(
+                card_set,
+                content_hash,
+                datetime.fromtimestamp(data_file.stat().st_mtime, timezone.utc).isoformat(),
+            )
+            return False
+        # Copy: callers keep mutating their CardSet (e.g. image_file after downloads)
+        self._run_changes[card_set.set_id] = (
+            previous, CardSet.from_dict(card_set.to_dict())
+        )
+        self.manifest.record(
+            card_set, content_hash, datetime.now(timezone.utc).isoformat()
+        )
+        self._sets_written += 1
+        return True
+
+    def sync_manifest(self) -> list[str]:
+        """Bring manifest.json in line with the sets on disk and save it.
+
+        Sets missing from the manifest (e.g. saved before it existed) are
+        hashed once, with their file's mtime as ``changed_at``; entries of
+        deleted set directories are dropped. Returns the dropped set IDs.
+        """
+        on_disk = {p.parent.name for p in self.data_dir.glob("*/cards.json")}
+        removed = sorted(set(self.manifest.sets) - on_disk)
+        for set_id in removed:
+            del self.manifest.sets[set_id]
+        if on_disk - set(self.manifest.sets):
+            for set_id, card_set in CardSet.load_all(self.data_dir).items():
+                if set_id in self.manifest.sets:
+                    continue
+                mtime = (self.data_dir / set_id / "cards.json").stat().st_mtime
+                self.manifest.record(
+                    card_set,
+                    card_set.content_hash(),
+                    datetime.fromtimestamp(mtime, timezone.utc).isoformat(),
+                )
+        self.manifest.save(self.data_dir / MANIFEST_FILE)
+        return removed
+
+    def _finish_run(self) -> None:
+        """Persist what a run updated: state, manifest, catalog and delta file."""
+        self.last_changed = None
+        with self.metrics.timer("finish"):
+            self.save_state()
+            self.image_inventory.compact()
+            removed_sets = self.sync_manifest()
+            self.refresh_catalog(changed=self._sets_written > 0)
+            self.last_delta = self._write_delta(removed_sets)
+        self._sets_written = 0
+
+    def _write_delta(self, removed_sets: list[str]) -> Optional[Path]:
+        """Write the card-level changes of this run to deltas/, if there are any.
+
+        Each set is compared once, first version against last, so a set
+        saved several times in a run (cards, then image files) yields a
+        single entry, and one changed back to what it was yields none.
+        """
+        sets = {}
+        for set_id, (previous, latest) in self._run_changes.items():
+            entry = set_delta(previous, latest)
+            if entry is not None:
+                sets[set_id] = entry
+        self._run_changes = {}
+        if not sets and not removed_sets:
+            return None
+        path = write_delta(
+            self.data_dir,
+            self.metrics.command,
+            self.metrics.started_at,
+            datetime.now(timezone.utc).isoformat(),
+            sets,
+            removed_sets,
+        )
+        changed_cards = sum(
+            len(entry["added"]) + len(entry["removed"]) + len(entry["modified"])
+            for entry in sets.values()
+        )
+        logger.info(f"Wrote {path} ({len(sets)} sets, {changed_cards} cards changed)")
+        self.last_changed = {
+            "changed_at": datetime.now(timezone.utc).isoformat(),
+            "command": self.metrics.command,
+            "sets": sorted(sets),
+            "removed_sets": sorted(removed_sets),
+            "cards_changed": changed_cards,
+            "delta": path.relative_to(self.data_dir).as_posix(),
+        }
+        write_text_atomic(
+            self.data_dir / LAST_CHANGED_FILE,
+            json.dumps(self.last_changed, ensure_ascii=False, indent=2) + "\n",
+        )
+        return path
+
+    def _start_metrics(self, command: str) -> None:
+        """Begin collecting stage timings for a new run."""
+        self.metrics = RunMetrics(command)
+        self.rate_limiter.reset_stats()
+        self.image_limiter.reset_stats()
+
+    def _write_run_report(self, stats: dict) -> None:
+        """Write run_report.json (and its run_history.jsonl line) for this run."""
+        self.last_report = self.metrics.report(
+            stats,
+            request_rates={
+                "posts": self.rate_limiter.summary(),
+                "images": self.image_limiter.summary(),
+            },
+        )
+        try:
+            write_run_report(self.data_dir, self.last_report)
+        except OSError as e:
+            logger.warning(f"Could not write run report: {e}")
+
+    def refresh_catalog(self, changed: bool = False) -> bool:
+        """Rebuild catalog.jsonl.gz if sets changed or it is out of date.
+
+        Returns True if the catalog was rewritten.
+        """
+        if not changed and catalog_is_current(self.data_dir):
+            return False
+        build_catalog(self.data_dir, CARD_FIELDS)
+        return True
+
+    def record_post(self, post_state: PostState) -> None:
+        """Persist one post's state by appending it to the journal."""
+        self.state.record(self.data_dir / STATE_FILE, post_state)
+
+    def _discover(self, **discover_kwargs) -> list[dict]:
+        """Run discovery with the persisted listing cache and this scraper's session."""
+        with self.metrics.timer("discovery"):
+            posts = discover_rd_posts(
+                listing_cache=self.discovery_cache.listing,
+                verdict_cache=self.discovery_cache.verdicts,
+                snapshots=self.snapshots,
+                limiter=self.rate_limiter,
+                session=self.session,
+                metrics=self.metrics,
+                **discover_kwargs,
+            )
+            self.discovery_cache.save(self.data_dir / DISCOVERY_CACHE_FILE)
+        self.metrics.count("posts_discovered", len(posts))
+        return posts
+
+    def _start_posts(self, command: str, resume: bool, **discover_kwargs) -> list[dict]:
+        """Discover the run's posts, or take them from the checkpoint.
+
+        With ``resume``, a checkpoint left by an interrupted run of the same
+        command supplies the post list, so discovery is skipped. Otherwise
+        posts are discovered and a new checkpoint is started.
+        """
+        path = self.data_dir / CHECKPOINT_FILE
+        if resume:
+            checkpoint = RunCheckpoint.load(path)
+            if checkpoint is not None and checkpoint.command == command:
+                logger.info(
+                    f"Resuming {command} from {checkpoint.started_at}: "
+                    f"{len(checkpoint.done)}/{len(checkpoint.posts)} posts done, "
+                    f"{len(checkpoint.fetched)} fetched but not saved"
+                )
+                self.checkpoint = checkpoint
+                return checkpoint.posts
+            logger.warning(f"No checkpoint of an interrupted {command} run, starting over")
+        elif path.exists():
+            logger.info("Discarding the checkpoint of an interrupted run (use --resume)")
+
+        posts = self._discover(**discover_kwargs)
+        self.checkpoint = RunCheckpoint(
+            command=command,
+            started_at=datetime.now(timezone.utc).isoformat(),
+            options={k: v for k, v in discover_kwargs.items() if k != "known_urls"},
+            posts=posts,
+        )
+        self.checkpoint.save(path)
+        return posts
+
+    def _end_posts(self) -> None:
+        """The run completed: drop its checkpoint."""
+        RunCheckpoint.clear(self.data_dir / CHECKPOINT_FILE)
+        self.checkpoint = None
+
+    def _checkpoint_post(self, url: str, stage: str, **progress) -> None:
+        if self.checkpoint is None:
+            return
+        with self._checkpoint_lock:
+            self.checkpoint.record(
+                self.data_dir / CHECKPOINT_FILE, {"url": url, "stage": stage, **progress}
+            )
+
+    def _changed_since_scraped(self, post_info: dict) -> bool:
+        """Whether a discovered post may have changed since it was scraped.
+
+        Only posts discovered from the feed carry an ``updated`` time; a
+        known post updated no later than its ``last_scraped`` (the time the
+        stored content was requested) is unchanged and needs no request. Anything else (new posts, listing-crawl
+        results, --force, unparsable times) counts as possibly changed.
+        """
+        post_state = self.state.posts.get(post_info["url"])
+        updated = post_info.get("updated")
+        if self.force or post_state is None or not updated or not post_state.last_scraped:
+            return True
+        try:
+            return datetime.fromisoformat(updated) > datetime.fromisoformat(
+                post_state.last_scraped
+            )
+        except ValueError:
+            return True
+
+    def scrape_all(self, resume: bool = False, **discover_kwargs) -> dict:
         """Scrape all discovered Rush Duel card list posts.
 
         Args:
+            resume: Continue an interrupted scrape-all from its checkpoint
+                (no discovery; posts it completed are not repeated).
             **discover_kwargs: Forwarded to discover_rd_posts()
                 (e.g. since_year=2024).
 
-        Returns summary stats.
+        Returns summary stats. "not_modified" counts the skipped posts that
+        were resolved by a 304 response, "resumed" the posts an interrupted
+        run had already completed. Stage timings are written to
+        run_report.json (see metrics.py).
         """
-        posts = discover_rd_posts(**discover_kwargs)
-        stats = {"discovered": len(posts), "scraped": 0, "skipped": 0, "errors": 0}
+        self._start_metrics("scrape-all")
+        posts = self._start_posts("scrape-all", resume, **discover_kwargs)
+        done = self.checkpoint.done
+        stats = {
+            "discovered": len(posts),
+            "scraped": 0,
+            "skipped": 0,
+            "not_modified": 0,
+            "resumed": sum(1 for p in posts if p["url"] in done),
+            "errors": 0,
+        }
 
-        for post_info in posts:
-            url = post_info["url"]
-            try:
-                result = self.scrape_post(url)
-                if result == "scraped":
-                    stats["scraped"] += 1
-                elif result == "skipped":
-                    stats["skipped"] += 1
-            except Exception as e:
-                logger.error(f"Error scraping {url}: {e}")
+        urls = [p["url"] for p in posts if p["url"] not in done]
+        for url, result in self._scrape_run_posts(urls):
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping {url}: {result}")
                 stats["errors"] += 1
+            elif result == "scraped":
+                stats["scraped"] += 1
+            elif result in ("skipped", "not_modified"):
+                stats["skipped"] += 1
+                if result == "not_modified":
+                    stats["not_modified"] += 1
 
-        self.save_state()
+        self._finish_run()
+        self._end_posts()
+        self._write_run_report(stats)
         return stats
 
     def scrape_post(self, url: str) -> str:
@@ -74,76 +464,528 @@ class RushDuelScraper:
         Returns:
             "scraped" if new data was saved
             "skipped" if content hasn't changed
+            "not_modified" if the server answered 304 to a conditional request
+        """
+        parsed = self._parse_fetched(url, *self._fetch_post(url))
+        if parsed.outcome is None:
+            self._fetch_images(parsed)
+        return self._store_post(parsed)
+
+    # ------------------------------------------------------------------ #
+    #  Pipeline stages: fetch → parse → images → save
+    # ------------------------------------------------------------------ #
+
+    def _fetch_post(self, url: str) -> tuple[requests.Response, str]:
+        """Fetch a post within the adaptive request rate (retrying transient errors).
+
+        Sends the stored validators as a conditional request (unless
+        --force), so the response may be a bodiless 304. Returns the
+        response and the time the fetch started: an edit the feed dates
+        after it may be missing from the response, so that (not the later
+        save) is what ``last_scraped`` records.
         """
-        time.sleep(FETCH_DELAY)
         logger.info(f"Fetching {url}")
-        resp = self.session.get(url, timeout=60)
-        resp.raise_for_status()
-        html = resp.text
+        existing_state = self.state.posts.get(url)
+        headers = (
+            conditional_headers(existing_state.etag, existing_state.last_modified)
+            if existing_state and not self.force
+            else {}
+        )
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        resp = self.rate_limiter.get(
+            self.session, url, metrics=self.metrics, request_stage="fetch",
+            timeout=60, headers=headers,
+        )
+        self.metrics.count("post_bytes", len(resp.content))
+        if not (headers and is_not_modified(resp)):
+            resp.raise_for_status()
+        return resp, fetched_at
 
-        # Check if content changed
-        post_body = extract_post_body(html)
-        if not post_body:
-            logger.warning(f"No post body found: {url}")
-            return "skipped"
+    def _parse_fetched(
+        self, url: str, resp: requests.Response, fetched_at: str
+    ) -> _ParsedPost:
+        """Detect changes and parse a fetched post."""
+        if is_not_modified(resp):
+            logger.info(f"Not modified (304), skipping: {url}")
+            return _ParsedPost(url=url, outcome="not_modified", fetched_at=fetched_at)
+
+        etag, last_modified = response_validators(resp)
+        with self.metrics.timer("snapshot"):
+            snapshot_hash = self.snapshots.put(url, resp.content, "post", resp.encoding)
+        self._checkpoint_post(
+            url,
+            "fetched",
+            snapshot_hash=snapshot_hash,
+            encoding=resp.encoding,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
+        )
+        return self._parse_html(url, resp.text, etag, last_modified, fetched_at)
 
-        content_hash = compute_content_hash(str(post_body))
+    def _parse_html(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        fetched_at: Optional[str] = None,
+    ) -> _ParsedPost:
+        """Detect changes and parse a post's HTML."""
+        doc = PostDocument(html, backend=self.parser_backend)
+
+        # Check if content changed (hashes the raw post body, no parse yet)
+        with self.metrics.timer("hash"):
+            content_hash = doc.content_hash
+        if content_hash is None:
+            logger.warning(f"No post body found: {url}")
+            return _ParsedPost(url=url, outcome="skipped")
 
         existing_state = self.state.posts.get(url)
         if existing_state and existing_state.content_hash == content_hash and not self.force:
             logger.info(f"No changes detected, skipping: {url}")
-            return "skipped"
+            return _ParsedPost(
+                url=url,
+                content_hash=content_hash,
+                etag=etag,
+                last_modified=last_modified,
+                outcome="skipped",
+                fetched_at=fetched_at,
+            )
 
-        # Parse the post (may return multiple CardSets for multi-deck posts)
-        card_sets = parse_post_multi(html, url)
+        # Parse the post (may return multiple CardSets for multi-deck posts).
+        # The tree is built first so parsing and extraction are timed apart.
+        with self.metrics.timer("html_parse"):
+            doc.body
+        with self.metrics.timer("extract"):
+            card_sets = parse_post_multi(doc, url)
+        self.metrics.count("posts_parsed")
         if not card_sets:
             logger.warning(f"No cards parsed from {url}")
-            return "skipped"
-
-        for card_set in card_sets:
-            # Download images (or detect existing ones when --no-images)
-            if self.download_images_flag:
-                download_images(
-                    card_set.cards,
-                    card_set.set_id,
-                    self.data_dir,
-                    self.session,
-                    force=self.force,
-                )
-            else:
-                # Even without downloading, link existing image files so
-                # cards.json retains the image_file paths.
-                self._link_existing_images(card_set.cards, card_set.set_id)
-
-            # Save card data
-            card_set.save(self.data_dir)
-
-            # Remove images that no longer belong to this set
-            # (e.g. after a multi-deck split, SD0C/ may still contain SD0D images)
-            self._cleanup_orphaned_images(card_set)
-
-        # Update state: for multi-deck posts store comma-separated set IDs
-        state_set_id = (
-            card_sets[0].set_id
-            if len(card_sets) == 1
-            else ",".join(cs.set_id for cs in card_sets)
-        )
-        total_cards = sum(len(cs.cards) for cs in card_sets)
-        self.state.posts[url] = PostState(
+            return _ParsedPost(url=url, outcome="skipped")
+
+        return _ParsedPost(
             url=url,
-            title=card_sets[0].set_name_zh,
-            set_id=state_set_id,
-            last_scraped=datetime.now(timezone.utc).isoformat(),
             content_hash=content_hash,
-            card_count=total_cards,
+            card_sets=card_sets,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
         )
-        self.save_state()
+
+    def _fetch_images(self, parsed: _ParsedPost) -> None:
+        """Download images (or detect existing ones when --no-images)."""
+        with self.metrics.timer("images"):
+            for card_set in parsed.card_sets:
+                if self.download_images_flag:
+                    self._download_set_images(card_set)
+                else:
+                    # Even without downloading, link existing image files so
+                    # cards.json retains the image_file paths.
+                    self._link_existing_images(card_set.cards, card_set.set_id)
+
+    def _store_post(self, parsed: _ParsedPost) -> str:
+        """Save card data and record the post in the scrape state."""
+        if parsed.outcome is not None:
+            self._refresh_validators(parsed)
+            return parsed.outcome
+
+        card_sets = parsed.card_sets
+        with self.metrics.timer("save"):
+            for card_set in card_sets:
+                # Save card data
+                self.save_set(card_set)
+
+                # Remove images that no longer belong to this set
+                # (e.g. after a multi-deck split, SD0C/ may still contain SD0D images)
+                self._cleanup_orphaned_images(card_set)
+
+            # Update state: for multi-deck posts store comma-separated set IDs
+            state_set_id = (
+                card_sets[0].set_id
+                if len(card_sets) == 1
+                else ",".join(cs.set_id for cs in card_sets)
+            )
+            total_cards = sum(len(cs.cards) for cs in card_sets)
+            self.record_post(PostState(
+                url=parsed.url,
+                title=card_sets[0].set_name_zh,
+                set_id=state_set_id,
+                last_scraped=parsed.fetched_at or datetime.now(timezone.utc).isoformat(),
+                content_hash=parsed.content_hash,
+                card_count=total_cards,
+                etag=parsed.etag,
+                last_modified=parsed.last_modified,
+            ))
 
         logger.info(f"Scraped {total_cards} cards from {state_set_id}")
         return "scraped"
 
+    def _refresh_validators(self, parsed: _ParsedPost) -> None:
+        """Record that a post's content is confirmed unchanged.
+
+        Stores any new validators and moves ``last_scraped`` forward, so a
+        feed lastmod that changed without the content changing does not
+        make every later update request the post again.
+        """
+        existing_state = self.state.posts.get(parsed.url)
+        if existing_state is None:
+            return
+        if parsed.outcome != "not_modified":
+            if parsed.content_hash != existing_state.content_hash:
+                return
+            if parsed.etag or parsed.last_modified:
+                existing_state.etag = parsed.etag
+                existing_state.last_modified = parsed.last_modified
+        existing_state.last_scraped = (
+            parsed.fetched_at or datetime.now(timezone.utc).isoformat()
+        )
+        self.record_post(existing_state)
+
+    def _resume_post(self, url: str, progress: dict) -> str:
+        """Finish a post an interrupted run fetched but did not save.
+
+        Parses the snapshot taken when it was fetched instead of fetching it
+        again; images are downloaded as usual, so a partial batch continues
+        (finished files are kept, ``.part`` files resumed). ``last_scraped``
+        is the snapshot's fetch time, not the time of the resume.
+        """
+        content = self.snapshots.get(progress["snapshot_hash"])
+        if content is None:
+            return self.scrape_post(url)
+        logger.info(f"Resuming from snapshot: {url}")
+        fetched_at = progress.get("fetched_at")
+        if fetched_at is None:
+            # Checkpoints from before fetched_at was recorded: the index entry
+            # of the same content is at least as old as the fetch
+            entry = self.snapshots.latest(url)
+            if entry is not None and entry["hash"] == progress["snapshot_hash"]:
+                fetched_at = entry.get("fetched_at")
+        html = content.decode(progress.get("encoding") or "utf-8", errors="replace")
+        parsed = self._parse_html(
+            url, html, progress.get("etag"), progress.get("last_modified"), fetched_at
+        )
+        if parsed.outcome is None:
+            self._fetch_images(parsed)
+        return self._store_post(parsed)
+
+    def _scrape_run_posts(
+        self, urls: list[str]
+    ) -> Iterator[tuple[str, Union[str, Exception]]]:
+        """Scrape a run's posts, checkpointing each one that completes.
+
+        Posts the checkpoint shows as fetched are finished from their
+        snapshots first; the rest go through _scrape_posts().
+        """
+        fetched = dict(self.checkpoint.fetched) if self.checkpoint else {}
+        rest = [url for url in urls if url not in fetched]
+
+        def results() -> Iterator[tuple[str, Union[str, Exception]]]:
+            for url in urls:
+                if url in fetched:
+                    try:
+                        yield url, self._resume_post(url, fetched[url])
+                    except Exception as e:
+                        yield url, e
+            yield from self._scrape_posts(rest)
+
+        for url, result in results():
+            if not isinstance(result, Exception):
+                self._checkpoint_post(url, "done")
+            yield url, result
+
+    def _scrape_posts(
+        self, urls: list[str]
+    ) -> Iterator[tuple[str, Union[str, Exception]]]:
+        """Scrape posts in order, yielding (url, result or exception).
+
+        With a single worker posts are scraped one after another exactly
+        like scrape_post(). With more workers, up to ``workers`` fetches run
+        concurrently under the per-host rate limit, while parsing, image
+        download and saving each run in their own stage. Results are still
+        yielded (and the state updated) in discovery order.
+        """
+        if self.workers <= 1:
+            for url in urls:
+                try:
+                    yield url, self.scrape_post(url)
+                except Exception as e:
+                    yield url, e
+            return
+
+        stop = threading.Event()
+        parse_q: queue.Queue = queue.Queue(maxsize=self.workers * 2)
+        image_q: queue.Queue = queue.Queue(maxsize=self.workers * 2)
+        save_q: queue.Queue = queue.Queue(maxsize=self.workers * 2)
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fetch")
+
+        def put(q: queue.Queue, item: object) -> None:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def get(q: queue.Queue) -> object:
+            # _DONE once the consumer stopped, so no stage blocks for ever
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def fetch_stage() -> None:
+            # Submit lazily with at most ``window`` fetches in flight, so a
+            # stalled later stage also stops new requests from going out
+            window = self.workers * 2
+            in_flight: deque = deque()
+
+            def hand_over() -> None:
+                url, future = in_flight.popleft()
+                while not wait([future], timeout=0.5).done:
+                    if stop.is_set():
+                        return
+                try:
+                    put(parse_q, (url, future.result()))  # (response, fetched_at)
+                except Exception as e:
+                    put(parse_q, (url, e))
+
+            for url in urls:
+                if stop.is_set():
+                    return
+                in_flight.append((url, pool.submit(self._fetch_post, url)))
+                if len(in_flight) >= window:
+                    hand_over()
+            while in_flight and not stop.is_set():
+                hand_over()
+            put(parse_q, _DONE)
+
+        def parse_stage() -> None:
+            while (item := get(parse_q)) is not _DONE:
+                url, fetched = item
+                if not isinstance(fetched, Exception):
+                    try:
+                        item = (url, self._parse_fetched(url, *fetched))
+                    except Exception as e:
+                        item = (url, e)
+                put(image_q, item)
+            put(image_q, _DONE)
+
+        def image_stage() -> None:
+            while (item := get(image_q)) is not _DONE:
+                url, parsed = item
+                if isinstance(parsed, _ParsedPost) and parsed.outcome is None:
+                    try:
+                        self._fetch_images(parsed)
+                    except Exception as e:
+                        item = (url, e)
+                put(save_q, item)
+            put(save_q, _DONE)
+
+        stages = [
+            threading.Thread(target=target, name=name, daemon=True)
+            for name, target in (
+                ("fetch-stage", fetch_stage),
+                ("parse-stage", parse_stage),
+                ("image-stage", image_stage),
+            )
+        ]
+        for t in stages:
+            t.start()
+
+        # Save stage runs in the caller's thread, so the state is only
+        # ever mutated from one place.
+        try:
+            while (item := save_q.get()) is not _DONE:
+                url, parsed = item
+                if isinstance(parsed, _ParsedPost):
+                    try:
+                        yield url, self._store_post(parsed)
+                    except Exception as e:
+                        yield url, e
+                else:
+                    yield url, parsed
+        finally:
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _download_set_images(
+        self,
+        card_set: CardSet,
+        cards: Optional[list] = None,
+        force: Optional[bool] = None,
+        only: Optional[set[tuple[str, Optional[str]]]] = None,
+    ) -> int:
+        """Download a set's images (or only ``cards``, or only the ``only``
+        (card_id, size) images) with the configured parallelism."""
+        return download_images(
+            card_set.cards if cards is None else cards,
+            card_set.set_id,
+            self.data_dir,
+            self.session,
+            force=self.force if force is None else force,
+            workers=self.image_workers,
+            limiter=self.image_limiter,
+            store=self.image_store,
+            metrics=self.metrics,
+            inventory=self.image_inventory,
+            sizes=self.image_sizes,
+            only=only,
+        )
+
+    def download_all_images(self, set_ids: Optional[list[str]] = None) -> dict:
+        """Download missing images for sets already saved on disk.
+
+        Args:
+            set_ids: Only these sets (default: every set with a cards.json).
+
+        Returns summary stats.
+        """
+        self._start_metrics("images")
+        with self.metrics.timer("load"):
+            saved_sets = CardSet.load_all(self.data_dir)
+        if set_ids is None:
+            set_ids = sorted(saved_sets)
+        stats = {"sets": 0, "downloaded": 0, "missing_sets": 0, "errors": 0}
+
+        for set_id in set_ids:
+            card_set = saved_sets.get(set_id)
+            if card_set is None:
+                logger.warning(f"No cards.json for set {set_id}")
+                stats["missing_sets"] += 1
+                continue
+            try:
+                with self.metrics.timer("images"):
+                    stats["downloaded"] += self._download_set_images(card_set)
+                with self.metrics.timer("save"):
+                    self.save_set(card_set)
+                stats["sets"] += 1
+            except Exception as e:
+                logger.error(f"Error downloading images for {set_id}: {e}")
+                stats["errors"] += 1
+
+        self._finish_run()
+        self._write_run_report(stats)
+        return stats
+
+    def verify_images(
+        self,
+        set_ids: Optional[list[str]] = None,
+        workers: int = DEFAULT_VERIFY_WORKERS,
+        repair: bool = True,
+    ) -> dict:
+        """Check card images for missing, truncated or corrupt files.
+
+        Every image (in any size) referenced by a cards.json or listed in
+        the image inventory is checked (in parallel) against its inventory entry and
+        its own format. Images on disk that the inventory does not know yet
+        are added first. With ``repair``, broken images are deleted and
+        downloaded again; nothing else is fetched.
+
+        Returns summary stats; ``stats["broken"]`` maps each broken image's
+        relative path to the reason.
+        """
+        self._start_metrics("verify-images")
+        with self.metrics.timer("load"):
+            saved_sets = CardSet.load_all(self.data_dir)
+        if set_ids is not None:
+            saved_sets = {k: v for k, v in saved_sets.items() if k in set(set_ids)}
+        # relative path → (set, card, size name or None for the primary image)
+        referenced = {
+            rel_path: (card_set, card, size)
+            for card_set in saved_sets.values()
+            for card in card_set.cards
+            for size, rel_path in [(None, card.image_file), *(card.image_files or {}).items()]
+            if rel_path
+        }
+        inventory = self.image_inventory
+        # Relative image paths start with their set_id
+        in_scope = [p for p in image_files(self.data_dir) if p.split("/", 1)[0] in saved_sets]
+        with self.metrics.timer("inventory"):
+            for rel_path in in_scope:
+                if rel_path not in inventory.entries:
+                    owner = referenced.get(rel_path)
+                    inventory.ensure(
+                        rel_path,
+                        self.data_dir / rel_path,
+                        self._image_url(owner[1], owner[2]) if owner else None,
+                    )
+        to_check = sorted(
+            set(referenced)
+            | set(in_scope)
+            | {p for p in inventory.entries if p.split("/", 1)[0] in saved_sets}
+        )
+        with self.metrics.timer("verify"):
+            broken = inventory.verify(self.data_dir, to_check, workers)
+        stats = {
+            "checked": len(to_check),
+            "broken": broken,
+            "repaired": 0,
+            "removed": 0,
+            "failed": 0,
+        }
+        if not repair or not broken:
+            inventory.compact()
+            self._write_run_report(stats)
+            return stats
+
+        # Delete broken files; re-download those a card still points to,
+        # only in the broken sizes.
+        to_fetch: dict[str, tuple[CardSet, list[tuple]]] = {}
+        for rel_path in broken:
+            path = self.data_dir / rel_path
+            owner = referenced.get(rel_path)
+            url = (inventory.entries.get(rel_path) or {}).get("url") or (
+                self._image_url(owner[1], owner[2]) if owner else None
+            )
+            # The file may be a hard link to its store object, which is then
+            # just as broken: drop the object so the download cannot relink it
+            self.image_store.discard(url, path)
+            path.unlink(missing_ok=True)
+            discard_partial(path)
+            inventory.forget(rel_path)
+            if owner is None or not owner[1].image_url:
+                logger.warning(f"Removed broken image no card refers to: {rel_path}")
+                stats["removed"] += 1
+                continue
+            card_set, card, size = owner
+            if size is not None and size not in self.image_sizes:
+                logger.warning(f"Cannot re-download {rel_path}: {size!r} is not in --image-sizes")
+            set_image_file(card, size, None)
+            to_fetch.setdefault(card_set.set_id, (card_set, []))[1].append((card, size))
+
+        for card_set, images in to_fetch.values():
+            cards = list({id(card): card for card, _size in images}.values())
+            only = {(card.card_id, size) for card, size in images}
+            try:
+                with self.metrics.timer("images"):
+                    self._download_set_images(card_set, cards, force=True, only=only)
+            except Exception as e:
+                logger.error(f"Error re-downloading images for {card_set.set_id}: {e}")
+            fixed = [p for p in (image_file_of(card, size) for card, size in images) if p]
+            still_broken = inventory.verify(self.data_dir, fixed, workers)
+            stats["repaired"] += len(fixed) - len(still_broken)
+            stats["failed"] += len(images) - len(fixed) + len(still_broken)
+            with self.metrics.timer("save"):
+                self.save_set(card_set)
+
+        self._finish_run()
+        self._write_run_report(stats)
+        return stats
+
+    def _image_url(self, card, size: Optional[str]) -> Optional[str]:
+        """URL one size of a card image is fetched from."""
+        if size is None:
+            return card.image_url
+        if card.image_url and size in self.image_sizes:
+            return resize_image_url(card.image_url, self.image_sizes[size])
+        return None
+
     def _cleanup_orphaned_images(self, card_set: CardSet) -> None:
-        """Delete image files in set_id/images/ that no longer belong to any card.
+        """Delete image files in set_id/images/ (and its size subdirectories)
+        that no longer belong to any card.
 
         Handles cases like multi-deck splits where one set directory previously
         contained images for another set (e.g. SD0C/images/ had RD_SD0D-*.jpg).
@@ -153,31 +995,157 @@ class RushDuelScraper:
             return
 
         valid_filenames = {sanitize_filename(c.card_id) for c in card_set.cards}
+        # Keep partial downloads of current cards so they can be resumed
+        valid_filenames |= {
+            name + suffix
+            for name in valid_filenames
+            for suffix in (PARTIAL_SUFFIX, PARTIAL_SUFFIX + VALIDATOR_SUFFIX)
+        }
         removed = 0
-        for img_file in img_dir.iterdir():
+        size_dirs = [d for d in img_dir.iterdir() if d.is_dir()]
+        for img_file in [p for d in (img_dir, *size_dirs) for p in d.iterdir()]:
             if img_file.is_file() and img_file.name not in valid_filenames:
+                rel_path = img_file.relative_to(self.data_dir).as_posix()
                 img_file.unlink()
+                self.image_inventory.forget(rel_path)
                 removed += 1
-                logger.info(
-                    f"Removed orphaned image: {card_set.set_id}/images/{img_file.name}"
-                )
+                logger.info(f"Removed orphaned image: {rel_path}")
         if removed:
             logger.info(
                 f"Cleaned up {removed} orphaned image(s) from {card_set.set_id}/images/"
             )
 
     def _link_existing_images(self, cards: list, set_id: str) -> None:
-        """Set image_file on cards that already have downloaded images on disk."""
-        img_dir = self.data_dir / set_id / "images"
+        """Set image_file / image_files on cards whose images are already on disk.
+
+        The image inventory answers without touching the disk; only images
+        it does not know are looked up.
+        """
         for card in cards:
-            filename = sanitize_filename(card.card_id)
-            filepath = img_dir / filename
-            if filepath.exists():
-                card.image_file = f"{set_id}/images/{filename}"
+            for size in (None, *self.image_sizes):
+                relative_path = image_relative_path(set_id, card.card_id, size)
+                if (
+                    relative_path in self.image_inventory.entries
+                    or (self.data_dir / relative_path).exists()
+                ):
+                    set_image_file(card, size, relative_path)
+
+    def reparse(self, jobs: int = 1, dry_run: bool = False) -> dict:
+        """Rebuild cards.json for every scraped post from local snapshots.
+
+        No network I/O: each post in the scrape state is re-parsed from its
+        latest HTML snapshot. Existing images are linked but never deleted,
+        so a parser regression cannot destroy downloaded files.
+
+        Args:
+            jobs: Worker processes to parse in (0 = one per CPU). Parsing is
+                CPU-bound, so processes rather than threads; linking images,
+                diffing and saving stay in this process, in state order.
+            dry_run: Only report what would change; write nothing.
+
+        cards.json is only rewritten when its content changes. Returns
+        summary stats; ``stats["diffs"]`` holds a SetDiff for every set that
+        was added or changed.
+        """
+        stats = {
+            "posts": len(self.state.posts),
+            "reparsed": 0,
+            "cards": 0,
+            "changed": 0,
+            "unchanged": 0,
+            "missing": 0,
+            "errors": 0,
+            "diffs": [],
+        }
+
+        self._start_metrics("reparse")
+        with self.metrics.timer("load"):
+            saved_sets = CardSet.load_all(self.data_dir)
+        results = self._reparse_results(list(self.state.posts), jobs)
+        # "parse" is the time spent waiting on each (possibly parallel) parse
+        for url, card_sets in self.metrics.timed(results, "parse"):
+            if isinstance(card_sets, Exception):
+                logger.error(f"Error reparsing {url}: {card_sets}")
+                stats["errors"] += 1
+                continue
+            if card_sets is None:
+                logger.warning(f"No snapshot for {url}, skipping")
+                stats["missing"] += 1
+                continue
+            if not card_sets:
+                logger.warning(f"No cards parsed from snapshot of {url}")
+                stats["errors"] += 1
+                continue
+
+            try:
+                for card_set in card_sets:
+                    self._link_existing_images(card_set.cards, card_set.set_id)
+                    with self.metrics.timer("diff"):
+                        set_diff = diff_card_sets(saved_sets.get(card_set.set_id), card_set)
+                    if set_diff.is_empty:
+                        stats["unchanged"] += 1
+                        continue
+                    stats["changed"] += 1
+                    stats["diffs"].append(set_diff)
+                    if not dry_run:
+                        with self.metrics.timer("save"):
+                            self.save_set(card_set)
+            except Exception as e:
+                logger.error(f"Error reparsing {url}: {e}")
+                stats["errors"] += 1
+                continue
+
+            card_count = sum(len(cs.cards) for cs in card_sets)
+            self.metrics.count("posts_parsed")
+            stats["reparsed"] += 1
+            stats["cards"] += card_count
+            if dry_run:
+                continue
+            post_state = self.state.posts[url]
+            post_state.set_id = ",".join(cs.set_id for cs in card_sets)
+            post_state.title = card_sets[0].set_name_zh
+            post_state.card_count = card_count
+
+        if not dry_run:
+            self._finish_run()
+            self._write_run_report(stats)
+        return stats
+
+    def _reparse_results(
+        self, urls: list[str], jobs: int
+    ) -> Iterator[tuple[str, Union[list[CardSet], None, Exception]]]:
+        """Yield (url, parsed card sets) in ``urls`` order.
+
+        The result is None when the post has no snapshot, or the exception
+        raised while parsing it.
+        """
+        jobs = jobs or os.cpu_count() or 1
+        if jobs <= 1 or len(urls) <= 1:
+            for url in urls:
+                try:
+                    yield url, _parse_snapshot(self.snapshots, url, self.parser_backend)
+                except Exception as e:
+                    yield url, e
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(urls)),
+            initializer=_init_reparse_worker,
+            initargs=(self.snapshots.root, self.parser_backend),
+        ) as pool:
+            futures = [pool.submit(_reparse_worker, url) for url in urls]
+            for url, future in zip(urls, futures):
+                try:
+                    yield url, future.result()
+                except Exception as e:
+                    yield url, e
 
     def scrape_url(self, url: str) -> str:
         """Scrape a specific URL (for manual/targeted scraping)."""
-        return self.scrape_post(url)
+        self._start_metrics("scrape-url")
+        result = self.scrape_post(url)
+        self._finish_run()
+        return result
 
     def check_updates(self, **discover_kwargs) -> list[str]:
         """Check for new or updated posts without scraping.
@@ -186,66 +1154,159 @@ class RushDuelScraper:
             **discover_kwargs: Forwarded to discover_rd_posts()
                 (e.g. since_year=2024).
 
-        Returns list of URLs that need updating.
+        Returns list of URLs that need updating. Counts of checked posts, of
+        posts resolved by a 304 and of posts whose feed lastmod shows no
+        change are left in ``self.check_stats``.
         """
+        self._start_metrics("check")
         known = set(self.state.posts.keys())
-        posts = discover_rd_posts(known_urls=known, **discover_kwargs)
+        posts = self._discover(known_urls=known, **discover_kwargs)
         needs_update = []
+        self.check_stats = {"checked": 0, "not_modified": 0, "lastmod_skipped": 0}
 
         for post_info in posts:
             url = post_info["url"]
             if url not in self.state.posts:
                 needs_update.append(url)
                 continue
+            if not self._changed_since_scraped(post_info):
+                self.check_stats["lastmod_skipped"] += 1
+                continue
 
-            # Optionally fetch and check content hash
+            # Optionally fetch and check content hash. Validators are only
+            # sent, never stored, here: storing them without scraping would
+            # hide the change from the next update.
+            post_state = self.state.posts[url]
+            headers = conditional_headers(post_state.etag, post_state.last_modified)
             try:
-                time.sleep(FETCH_DELAY)
-                resp = self.session.get(url, timeout=60)
+                resp = self.rate_limiter.get(
+                    self.session, url, metrics=self.metrics, request_stage="fetch",
+                    timeout=60, headers=headers,
+                )
+                self.metrics.count("post_bytes", len(resp.content))
+                self.check_stats["checked"] += 1
+                if headers and is_not_modified(resp):
+                    self.check_stats["not_modified"] += 1
+                    continue
                 resp.raise_for_status()
-                post_body = extract_post_body(resp.text)
-                if post_body:
-                    current_hash = compute_content_hash(str(post_body))
-                    if current_hash != self.state.posts[url].content_hash:
-                        needs_update.append(url)
+                with self.metrics.timer("snapshot"):
+                    self.snapshots.put(url, resp.content, "post", resp.encoding)
+                with self.metrics.timer("hash"):
+                    current_hash = PostDocument(resp.text).content_hash
+                if current_hash and current_hash != post_state.content_hash:
+                    needs_update.append(url)
             except Exception as e:
                 logger.warning(f"Could not check {url}: {e}")
 
+        self._write_run_report({**self.check_stats, "needs_update": len(needs_update)})
         return needs_update
 
-    def update(self, **discover_kwargs) -> dict:
+    def update(self, resume: bool = False, **discover_kwargs) -> dict:
         """Only scrape new or changed posts (incremental update).
 
         Args:
+            resume: Continue an interrupted update from its checkpoint.
             **discover_kwargs: Forwarded to discover_rd_posts()
                 (e.g. since_year=2024).
 
-        Returns summary stats.
+        Returns summary stats. "not_modified" counts the unchanged posts
+        that were resolved by a 304 response, "lastmod_skipped" those not
+        fetched at all because the feed shows no update since last_scraped,
+        "resumed" those an interrupted run had already completed.
+        Stage timings are written to run_report.json (see metrics.py).
         """
+        self._start_metrics("update")
         known = set(self.state.posts.keys())
-        posts = discover_rd_posts(known_urls=known, **discover_kwargs)
-        stats = {"discovered": len(posts), "new": 0, "updated": 0, "unchanged": 0, "errors": 0}
-
-        for post_info in posts:
-            url = post_info["url"]
-            is_new = url not in self.state.posts
+        posts = self._start_posts("update", resume, known_urls=known, **discover_kwargs)
+        done = self.checkpoint.done
+        pending = [p for p in posts if p["url"] not in done]
+        stats = {
+            "discovered": len(posts),
+            "new": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "not_modified": 0,
+            "lastmod_skipped": 0,
+            "resumed": len(posts) - len(pending),
+            "errors": 0,
+        }
 
-            try:
-                result = self.scrape_post(url)
-                if result == "scraped":
-                    if is_new:
-                        stats["new"] += 1
-                    else:
-                        stats["updated"] += 1
-                else:
-                    stats["unchanged"] += 1
-            except Exception as e:
-                logger.error(f"Error updating {url}: {e}")
+        urls = [p["url"] for p in pending if self._changed_since_scraped(p)]
+        stats["lastmod_skipped"] = len(pending) - len(urls)
+        stats["unchanged"] += stats["lastmod_skipped"]
+        known_before = set(self.state.posts)
+        for url, result in self._scrape_run_posts(urls):
+            if isinstance(result, Exception):
+                logger.error(f"Error updating {url}: {result}")
                 stats["errors"] += 1
+            elif result == "scraped":
+                if url not in known_before:
+                    stats["new"] += 1
+                else:
+                    stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                if result == "not_modified":
+                    stats["not_modified"] += 1
 
-        self.save_state()
+        self._finish_run()
+        self._end_posts()
+        self._write_run_report(stats)
         return stats
 
+    def watch(
+        self,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        runs: Optional[int] = None,
+        on_change: Optional[Callable[[dict], None]] = None,
+        resume: bool = False,
+        **discover_kwargs,
+    ) -> int:
+        """Run ``update()`` every ``interval`` seconds in this process.
+
+        The HTTP session (keep-alive connections), scrape state, discovery
+        cache, manifest, image store and learned request rates stay in
+        memory between runs, so each run only pays for the conditional
+        requests that find what changed. A run that fails is logged and the
+        next one starts on schedule. After a run that changed sets,
+        ``on_change`` gets the new last_changed.json contents.
+
+        Args:
+            interval: Seconds from the start of one run to the next; a run
+                that takes longer is followed immediately by the next.
+            runs: Stop after this many runs (default: until interrupted).
+            on_change: Called after each run that changed sets.
+            resume: Resume an interrupted update in the first run.
+            **discover_kwargs: Forwarded to discover_rd_posts().
+
+        Returns the number of runs.
+        """
+        completed = 0
+        while runs is None or completed < runs:
+            started = time.monotonic()
+            try:
+                stats = self.update(resume=resume and completed == 0, **discover_kwargs)
+            except Exception as e:
+                logger.error(f"Watch run {completed + 1} failed: {e}")
+            else:
+                changed = self.last_changed
+                logger.info(
+                    f"Watch run {completed + 1}: {stats['new']} new, "
+                    f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
+                    f"{stats['errors']} errors"
+                    + (f"; changed sets: {', '.join(changed['sets'])}" if changed else "")
+                )
+                if changed is not None and on_change is not None:
+                    on_change(changed)
+            completed += 1
+            if runs is not None and completed >= runs:
+                break
+            delay = interval - (time.monotonic() - started)
+            if delay > 0:
+                logger.info(f"Next run in {delay:.0f}s")
+                time.sleep(delay)
+        return completed
+
     def summary(self) -> dict:
         """Get a summary of currently scraped data."""
         sets = {}
@@ -0,0 +1,134 @@
+"""Compressed, content-addressed store of fetched HTML.
+
+Every post and listing page the scraper downloads is kept so the parser can
+be re-run over the whole corpus offline (``rd-scrape reparse``).
+
+Layout under ``{data_dir}/snapshots/``::
+
+    objects/ab/abcdef….zst   # one compressed blob per distinct SHA256
+    index.jsonl              # {"url", "kind", "hash", "encoding", "fetched_at"}
+
+Blobs are deduplicated by hash, and an index line is only appended when a
+URL's content differs from its previous snapshot, so unchanged refetches
+cost nothing on disk. Blobs are zstd-compressed when the optional
+``zstandard`` package is installed, gzip otherwise; both can be read back.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from .models import iter_jsonl
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = "snapshots"
+INDEX_FILE = "index.jsonl"
+
+
+class SnapshotStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.index_path = root / INDEX_FILE
+        self._lock = threading.Lock()
+        self._latest: dict[str, dict] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        for entry in iter_jsonl(self.index_path, "snapshot index"):
+            self._latest[entry["url"]] = entry
+
+    def put(
+        self, url: str, content: bytes, kind: str, encoding: Optional[str] = "utf-8"
+    ) -> str:
+        """Store a fetched page. Returns its content hash."""
+        content_hash = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            if self._find_object(content_hash) is None:
+                self._write_object(content_hash, content)
+            previous = self._latest.get(url)
+            if previous and previous["hash"] == content_hash:
+                return content_hash
+            entry = {
+                "url": url,
+                "kind": kind,
+                "hash": content_hash,
+                "encoding": encoding or "utf-8",
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._latest[url] = entry
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        """Read a blob by hash, or None if it is not stored."""
+        path = self._find_object(content_hash)
+        if path is None:
+            return None
+        data = path.read_bytes()
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError(
+                    f"{path} is zstd-compressed; install the 'zstandard' package"
+                )
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def latest(self, url: str) -> Optional[dict]:
+        """Index entry of the most recent snapshot of ``url``, if any."""
+        return self._latest.get(url)
+
+    def latest_text(self, url: str) -> Optional[str]:
+        """Decoded HTML of the most recent snapshot of ``url``."""
+        entry = self._latest.get(url)
+        if entry is None:
+            return None
+        content = self.get(entry["hash"])
+        if content is None:
+            return None
+        return content.decode(entry.get("encoding") or "utf-8", errors="replace")
+
+    def urls(self, kind: Optional[str] = None) -> list[str]:
+        """URLs with at least one snapshot, optionally filtered by kind."""
+        return [
+            url for url, entry in self._latest.items()
+            if kind is None or entry["kind"] == kind
+        ]
+
+    def _object_stem(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash[:2] / content_hash
+
+    def _find_object(self, content_hash: str) -> Optional[Path]:
+        stem = self._object_stem(content_hash)
+        for suffix in (".zst", ".gz"):
+            path = stem.with_suffix(suffix)
+            if path.exists():
+                return path
+        return None
+
+    def _write_object(self, content_hash: str, content: bytes) -> None:
+        if zstandard is not None:
+            suffix, data = ".zst", zstandard.ZstdCompressor(level=10).compress(content)
+        else:
+            suffix, data = ".gz", gzip.compress(content, compresslevel=9)
+        path = self._object_stem(content_hash).with_suffix(suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)